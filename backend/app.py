@@ -9,18 +9,58 @@ import time
 from pathlib import Path
 from uuid import uuid4
 
-import eventlet
 from dotenv import load_dotenv
-from flask import Flask, jsonify, redirect, request, session
-from flask_socketio import SocketIO, emit, join_room, leave_room
+from flask import Flask, abort, jsonify, redirect, request, send_from_directory, session
+from flask_socketio import SocketIO, emit
+from werkzeug.security import safe_join
 
 from auth_routes import auth_bp
+from bot_pool import DEFAULT_TIMEOUT as BOT_DECISION_TIMEOUT, BotDecisionPool
+from bots import (
+    DecisionRequest,
+    decide,
+    normalize_bot_difficulty,
+    preset_for,
+    refine_candidates,
+    roll_persona,
+    tier_for,
+)
 from database import db
+from emit_batcher import EmitBatcher
+from expiry import ExpiryQueue
+from game_store import DEFAULT_MAX_GAMES, DEFAULT_TTL, GameExpired, GameRecord, GameStore
+from game_tokens import GameTokenCodec, GameTokenError, GameTokenReused, new_token_game_id, token_ledger_from_url
+from lexicon import get_lexicon
 from models import GameMode
+from opening_book import get_opening_book
+from room_actor import RoomActors
+from room_registry import registry_from_url
+from rooms import BotMeta, Player, Room
+from scheduler import Scheduler
+from scoring import (
+    ALL_GREEN,
+    feedback_code,
+    feedback_items,
+    score_batch,
+)
 from stats_routes import stats_bp
 from stats_service import record_multiplayer_match, record_singleplayer_result
-from termo import Termo
-from words import get_random_word, get_word_list
+from word_lists import ENCODINGS, is_hashed_name
+from wire import (
+    PROTOCOL_COMPACT,
+    PROTOCOL_DELTA,
+    PROTOCOL_HEADER,
+    PROTOCOL_LEGACY,
+    compact_api_guess,
+    compact_guess_result,
+    compact_peer_guess,
+    compact_room,
+    compact_room_payload,
+    compact_word_checks,
+    delta_room,
+    negotiate_protocol,
+    room_delta,
+)
 
 
 # === 🧩 Caminhos corrigidos ===
@@ -36,9 +76,10 @@ STATIC_DIR = ROOT_DIR / "static"
 
 # Caminho da pasta "data" (fica dentro de Backend)
 DATA_DIR = BASE_DIR / "data"
-PT_DICTIONARY_FILE = DATA_DIR / "palavras_5letras.txt"
 
-_PT_DICTIONARY_CACHE: list[str] | None = None
+# Listas de palavras do cliente (geradas por scripts/build_word_lists.py)
+WORD_LIST_DIR = STATIC_DIR / "data"
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
 
 
 
@@ -54,8 +95,10 @@ if not database_url:
         "DATABASE_URL não está definido. Configure db.env ou exporte a variável."
     )
 
+DEFAULT_SECRET_KEY = "change-me-in-production"
+
 app.config.update(
-    SECRET_KEY=os.environ.get("SECRET_KEY", "change-me-in-production"),
+    SECRET_KEY=os.environ.get("SECRET_KEY") or DEFAULT_SECRET_KEY,
     SQLALCHEMY_DATABASE_URI=database_url,
     SQLALCHEMY_TRACK_MODIFICATIONS=False,
     SESSION_COOKIE_HTTPONLY=True,
@@ -64,7 +107,10 @@ app.config.update(
 
 db.init_app(app)
 
-socketio = SocketIO(app, cors_allowed_origins="*")
+# Com vários processos: SOCKETIO_MESSAGE_QUEUE=redis://... entrega os emits de
+# qualquer nó e ROOM_REGISTRY_URL=redis://... diz qual nó é dono de cada sala
+SOCKETIO_MESSAGE_QUEUE = os.environ.get("SOCKETIO_MESSAGE_QUEUE") or None
+socketio = SocketIO(app, cors_allowed_origins="*", message_queue=SOCKETIO_MESSAGE_QUEUE)
 
 app.register_blueprint(auth_bp)
 app.register_blueprint(stats_bp)
@@ -72,59 +118,67 @@ app.register_blueprint(stats_bp)
 with app.app_context():
     db.create_all()
 
-games = {}
-multiplayer_rooms = {}
-player_room_index = {}
+games = GameStore(
+    max_games=int(os.environ.get("GAME_STORE_MAX_GAMES", DEFAULT_MAX_GAMES)),
+    ttl=float(os.environ.get("GAME_STORE_TTL", DEFAULT_TTL)),
+)
+# Jogos sem estado no servidor: o estado viaja num token cifrado e assinado.
+# STATELESS_GAMES só habilita o recurso; cada cliente pede com "stateless": true
+# (o frontend atual não envia gameToken, então o padrão continua sendo o GameStore)
+STATELESS_GAMES = os.environ.get("STATELESS_GAMES", "").lower() in {"1", "true", "yes"}
+# Com a chave padrão qualquer um forjaria tokens e leria as respostas
+if STATELESS_GAMES and app.config["SECRET_KEY"] == DEFAULT_SECRET_KEY:
+    raise RuntimeError("STATELESS_GAMES requer uma SECRET_KEY própria.")
+game_tokens = GameTokenCodec(app.config["SECRET_KEY"], ttl=games.ttl) if STATELESS_GAMES else None
+multiplayer_rooms = {}  # salas deste processo (ver room_registry.py)
+ROOM_REGISTRY_URL = os.environ.get("ROOM_REGISTRY_URL") or None
+room_registry = registry_from_url(ROOM_REGISTRY_URL, os.environ.get("NODE_ID"))
+# Estados de token já jogados e jogos encerrados: cada token vale uma vez em
+# qualquer worker (com vários processos o registro precisa ser compartilhado)
+token_ledger = token_ledger_from_url(
+    os.environ.get("TOKEN_LEDGER_URL") or ROOM_REGISTRY_URL, games.max_games, games.ttl
+)
+if room_registry.shared and not SOCKETIO_MESSAGE_QUEUE:
+    raise RuntimeError("ROOM_REGISTRY_URL compartilhado requer SOCKETIO_MESSAGE_QUEUE.")
+player_room_index = room_registry.player_rooms
+client_protocols = {}
+# Um único loop de timers para os bots de todas as salas (ver scheduler.py)
+scheduler = Scheduler(socketio.start_background_task, socketio.sleep)
+# Processos opcionais para as decisões dos bots (ver bot_pool.py)
+_bot_workers = int(os.environ.get("BOT_PROCESS_WORKERS", "0") or 0)
+bot_pool = (
+    BotDecisionPool(
+        _bot_workers,
+        socketio.start_background_task,
+        timeout=float(os.environ.get("BOT_DECISION_TIMEOUT", BOT_DECISION_TIMEOUT)),
+    )
+    if _bot_workers > 0
+    else None
+)
+if bot_pool is not None:
+    bot_pool.start()
+# Clientes com auth={"batch": true} recebem os eventos agrupados (ver emit_batcher.py)
+emit_batcher = EmitBatcher(socketio.emit, socketio.start_background_task)
+# Cada sala executa seus comandos em ordem, numa única tarefa (ver room_actor.py)
+room_actors = RoomActors(socketio.start_background_task, app.app_context)
+# Próximo prazo de cada sala; a varredura só visita as vencidas (ver expiry.py)
+room_expiry = ExpiryQueue()
+room_evictions = {"empty": 0, "botOnly": 0, "finished": 0, "disconnected": 0, "claimLost": 0}
 _room_gc_started = False
 
 MAX_PLAYERS_PER_ROOM = 6
 MIN_PLAYERS_PER_ROOM = 2
 ROUND_ATTEMPTS = 6
+ROUND_TIME_LIMIT_OPTIONS = {0, 60, 90, 120, 180, 300}  # segundos; 0 = sem limite
+ROUND_TRANSITION_DELAY = 3.0  # seconds
 ROOM_IDLE_TIMEOUT = 600  # seconds
+ROOM_FINISHED_IDLE_TIMEOUT = 1800  # seconds; partida encerrada sem ninguém jogar de novo
 ROOM_SWEEP_INTERVAL = 30  # seconds
+MAX_CHECK_WORDS = 100  # por requisição em /api/check-words
 
 BOT_SID_PREFIX = "bot:"
 BOT_GUESS_DELAY_RANGE = (2.0, 4.0)
 BOT_ROUND_START_GRACE_SECONDS = 3.2
-DEFAULT_BOT_DIFFICULTY = "medium"
-BOT_DIFFICULTY_PRESETS = {
-    "easy": {
-        "delay_range": (3.8, 7.2),
-        "smart_pick_chance": 0.55,
-        "wild_guess_chance": 0.22,
-        "late_focus_step": 0.12,
-        "min_win_attempts_range": (4, 6),
-        "base_confidence": 0.35,
-        "confidence_growth": 0.12,
-        "confidence_jitter": 0.18,
-        "hesitation_bias": 0.7,
-        "mistake_chance": 0.28,
-    },
-    "medium": {
-        "delay_range": (3.4, 5.4),
-        "smart_pick_chance": 0.7,
-        "wild_guess_chance": 0.12,
-        "late_focus_step": 0.18,
-        "min_win_attempts_range": (3, 5),
-        "base_confidence": 0.45,
-        "confidence_growth": 0.15,
-        "confidence_jitter": 0.12,
-        "hesitation_bias": 0.5,
-        "mistake_chance": 0.18,
-    },
-    "hard": {
-        "delay_range": (3.0, 4.4),
-        "smart_pick_chance": 0.9,
-        "wild_guess_chance": 0.05,
-        "late_focus_step": 0.20,
-        "min_win_attempts_range": (2, 4),
-        "base_confidence": 0.55,
-        "confidence_growth": 0.18,
-        "confidence_jitter": 0.08,
-        "hesitation_bias": 0.35,
-        "mistake_chance": 0.10,
-    },
-}
 BOT_NAME_POOL = [
     "BOT Muski",
     "BOT Tetra",
@@ -157,81 +211,21 @@ BOT_NAME_POOL = [
 ]
 
 
-import os
-
-# Caminho base do projeto (mesmo diretório deste arquivo app.py)
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-
-# Pasta onde ficam os arquivos de dados
-DATA_DIR = os.path.join(BASE_DIR, "data")
-
-# Carregar palavras portuguesas
-portuguese_words = set()
-try:
-    file_path_pt = os.path.join(DATA_DIR, 'palavras_5letras.txt')
-    with open(file_path_pt, 'r', encoding='utf-8') as f:
-        for line in f:
-            word = line.strip().lower()
-            if len(word) == 5:
-                portuguese_words.add(word)
-    print(f"Carregadas {len(portuguese_words)} portuguesas")
-except FileNotFoundError:
-    print(f"Arquivo {file_path_pt} não encontrado")
-except Exception as e:
-    print(f"Erro ao carregar palavras portuguesas: {e}")
-
-# Carregar palavras inglesas
-english_words = set()
-try:
-    file_path_en = os.path.join(DATA_DIR, 'words_5letters.txt')
-    with open(file_path_en, 'r', encoding='utf-8') as f:
-        for line in f:
-            word = line.strip().lower()
-            if len(word) == 5:
-                english_words.add(word)
-    print(f"Carregadas {len(english_words)} inglesas")
-except FileNotFoundError:
-    print(f"Arquivo {file_path_en} não encontrado")
-except Exception as e:
-    print(f"Erro ao carregar palavras inglesas: {e}")
+# Léxicos compartilhados (validação, sorteio, pontuação e bots)
+for _lang in ("pt", "en"):
+    _lexicon = get_lexicon(_lang)
+    print(f"Carregadas {len(_lexicon)} palavras ({_lang}), {_lexicon.answer_count} respostas")
 
 def _word_exists_in_lang(word: str, lang: str) -> bool:
-    if lang == "pt":
-        return word in portuguese_words
-    if lang == "en":
-        return word in english_words
-    return word in portuguese_words or word in english_words
-
-def _check_guess_statuses_for_word(word: str, guess: str):
-    """Return list of {letter, status} for a single word vs guess, Wordle rules."""
-    letters = [c.upper() for c in guess]
-    statuses = [None] * 5
-    word_chars = list(word)
-    guess_chars = list(guess)
-    word_used = [False] * 5
-    # Greens first
-    for i in range(5):
-        if guess_chars[i] == word_chars[i]:
-            statuses[i] = 'green'
-            word_used[i] = True
-    # Yellows/Grays
-    for i in range(5):
-        if statuses[i] is None:
-            found = False
-            for j in range(5):
-                if not word_used[j] and guess_chars[i] == word_chars[j]:
-                    found = True
-                    word_used[j] = True
-                    break
-            statuses[i] = 'yellow' if found else 'gray'
-    return [{"letter": letters[i], "status": statuses[i]} for i in range(5)]
-
+    if lang in {"pt", "en"}:
+        return word in get_lexicon(lang)
+    return word in get_lexicon("pt") or word in get_lexicon("en")
 
 def _generate_room_code(length: int = 5) -> str:
     alphabet = string.ascii_uppercase + string.digits
     while True:
         code = ''.join(random.choice(alphabet) for _ in range(length))
-        if code not in multiplayer_rooms:
+        if code not in multiplayer_rooms and room_registry.claim(code):
             return code
 
 
@@ -244,31 +238,16 @@ def _resolve_stats_mode(mode: str, word_count: int) -> GameMode:
     return GameMode.CLASSIC
 
 
-def _game_meta(game):
-    if isinstance(game, Termo):
-        meta = getattr(game, "meta", None)
-        if meta is None:
-            meta = {}
-            setattr(game, "meta", meta)
-        return meta
-    if isinstance(game, dict):
-        meta = game.get("meta")
-        if meta is None:
-            meta = {}
-            game["meta"] = meta
-        return meta
-    return {}
-
-
-def _record_singleplayer_stats_if_needed(game, won: bool):
-    meta = _game_meta(game)
-    if not meta or meta.get("stats_recorded"):
-        return
-    user_id = meta.get("user_id")
-    mode = meta.get("mode")
-    if user_id and isinstance(mode, GameMode):
-        record_singleplayer_result(user_id, mode, bool(won))
-    meta["stats_recorded"] = True
+def _record_singleplayer_stats_if_needed(game: GameRecord, *, stateless: bool = False):
+    if game.stats_recorded:
+        return
+    # Tokens podem ser reenviados por qualquer um: só conta para o próprio usuário logado
+    if stateless and game.user_id != session.get("user_id"):
+        game.stats_recorded = True
+        return
+    if game.user_id and isinstance(game.mode, GameMode):
+        record_singleplayer_result(game.user_id, game.mode, game.won)
+    game.stats_recorded = True
 
 
 def _sanitize_player_name(name: str) -> str:
@@ -282,7 +261,7 @@ def _require_multiplayer_login(sid: str | None = None) -> bool:
     if session.get("user_id"):
         return True
     target = sid or request.sid
-    emit(
+    _emit(
         "room_error",
         {"error": "Faça login para jogar o multiplayer."},
         to=target,
@@ -290,15 +269,34 @@ def _require_multiplayer_login(sid: str | None = None) -> bool:
     return False
 
 
-def _scoreboard_snapshot(room: dict) -> list:
+def _room_call(code: str, command, *args):
+    """Run ``command(*args)`` on the room's actor and wait for its result."""
+    if code in multiplayer_rooms:
+        return room_actors.get(code).call(command, *args)
+    owner = room_registry.owner(code) if code else None
+    if owner and owner != room_registry.node_id and command.__name__ in _ROUTED_COMMANDS:
+        # Sala de outro processo: o dono executa e responde pela fila do Socket.IO
+        _forward_room_command(owner, code, command, args)
+        return None
+    # Sem sala não há estado a proteger: o comando só relata o erro
+    return command(*args)
+
+
+def _room_post(code: str, command, *args):
+    """Queue ``command(*args)`` on the room's actor (timers, transitions)."""
+    if code in multiplayer_rooms:
+        room_actors.get(code).post(command, *args)
+
+
+def _scoreboard_snapshot(room: Room) -> list:
     players = []
-    for sid, player in room["players"].items():
+    for sid, player in room.players.items():
         players.append({
-            "playerId": player["id"],
-            "name": player["name"],
-            "score": player["score"],
-            "isHost": sid == room.get("host_sid"),
-            "isBot": bool(player.get("is_bot")),
+            "playerId": player.id,
+            "name": player.name,
+            "score": player.score,
+            "isHost": sid == room.host_sid,
+            "isBot": player.is_bot,
         })
     players.sort(key=lambda item: (-item["score"], item["name"].lower()))
     return players
@@ -308,448 +306,438 @@ def _is_bot_sid(sid: str | None) -> bool:
     return isinstance(sid, str) and sid.startswith(BOT_SID_PREFIX)
 
 
-def _generate_bot_name(room: dict) -> str:
-    counter = room.setdefault("bot_counter", 0) + 1
-    room["bot_counter"] = counter
+def _generate_bot_name(room: Room) -> str:
+    counter = room.bot_counter + 1
+    room.bot_counter = counter
     base = random.choice(BOT_NAME_POOL)
     if counter <= len(BOT_NAME_POOL):
         return base
     return f"{base} #{counter}"
 
 
-def _load_pt_dictionary() -> list[str]:
-    """Load the shared Portuguese dictionary from disk, cached in memory."""
-    global _PT_DICTIONARY_CACHE
-    if _PT_DICTIONARY_CACHE:
-        return _PT_DICTIONARY_CACHE
-    words: list[str] = []
-    try:
-        with PT_DICTIONARY_FILE.open("r", encoding="utf-8") as handle:
-            for raw in handle:
-                word = raw.strip().lower()
-                if len(word) == 5 and word.isalpha():
-                    words.append(word)
-    except FileNotFoundError:
-        words = []
-    if not words:
-        words = list(get_word_list("pt"))
-    _PT_DICTIONARY_CACHE = words
-    return words
-
-
-def _bot_word_pool(lang: str) -> list:
-    if (lang or "").lower() == "pt":
-        return list(_load_pt_dictionary())
-    return list(get_word_list(lang))
+def _bot_preset_for(meta: BotMeta) -> dict:
+    return preset_for(meta.difficulty)
 
 
-def _ensure_bot_knowledge(meta: dict) -> dict:
-    knowledge = meta.setdefault("knowledge", {})
-    knowledge.setdefault("banned", set())
-    knowledge.setdefault("present", set())
-    return knowledge
+def _stop_bot_task(room: Room, bot_sid: str):
+    meta = room.bots.get(bot_sid)
+    if meta:
+        meta.cancel_task()
 
 
-def _apply_knowledge_filter(words: list[str], knowledge: dict) -> list[str]:
-    if not words:
-        return []
-    banned = knowledge.get("banned")
-    if not banned:
-        return list(words)
-    banned = set(banned)
-    return [word for word in words if all(letter not in banned for letter in word)]
+def _clear_all_bots(room: Room):
+    for bot_sid, meta in room.bots.items():
+        meta.cancel_task()
+        room.players.pop(bot_sid, None)
+    room.bots.clear()
 
 
-def _update_bot_knowledge(knowledge: dict, feedback: list[dict]):
-    if not feedback:
-        return
-    letter_statuses: dict[str, list[str]] = {}
-    for item in feedback:
-        letter = item["letter"].lower()
-        status = item["status"]
-        letter_statuses.setdefault(letter, []).append(status)
-        if status in {"green", "yellow"}:
-            knowledge["present"].add(letter)
-    for letter, statuses in letter_statuses.items():
-        if letter in knowledge["present"]:
-            continue
-        if all(status == "gray" for status in statuses):
-            knowledge["banned"].add(letter)
+def _add_bot_player(room: Room) -> tuple[str, Player]:
+    bot_sid = f"{BOT_SID_PREFIX}{uuid4().hex}"
+    bot_name = _generate_bot_name(room)
+    player = Player(uuid4().hex, bot_name, is_bot=True)
+    room.players[bot_sid] = player
+    room.bots[bot_sid] = BotMeta(bot_sid, bot_name, room.lang, room.bot_difficulty)
+    return bot_sid, player
 
 
-def _normalize_bot_difficulty(value: str | None) -> str:
-    if not value:
-        return DEFAULT_BOT_DIFFICULTY
-    normalized = value.lower()
-    if normalized in BOT_DIFFICULTY_PRESETS:
-        return normalized
-    return DEFAULT_BOT_DIFFICULTY
+def _refresh_bot_persona(meta: BotMeta) -> None:
+    """Assign per-round constraints so bots feel less robotic."""
+    (
+        meta.min_confident_attempts,
+        meta.confidence_bias,
+        meta.mistake_chance,
+    ) = roll_persona(_bot_preset_for(meta))
 
 
-def _bot_preset_for(meta: dict | None = None, room: dict | None = None) -> dict:
-    difficulty = DEFAULT_BOT_DIFFICULTY
-    if meta and meta.get("difficulty"):
-        difficulty = _normalize_bot_difficulty(meta["difficulty"])
-    elif room:
-        difficulty = _normalize_bot_difficulty(room.get("bot_difficulty"))
-    return BOT_DIFFICULTY_PRESETS.get(difficulty, BOT_DIFFICULTY_PRESETS[DEFAULT_BOT_DIFFICULTY])
+def _launch_bots_for_round(room: Room):
+    pool_mask = get_lexicon(room.lang).pool_mask
+    for bot_sid, meta in list(room.bots.items()):
+        if bot_sid not in room.players:
+            continue
+        meta.reset_round(room.lang, room.bot_difficulty, pool_mask, room.bot_round_grace_until)
+        _refresh_bot_persona(meta)
+        meta.cancel_task()
+        _schedule_bot_move(meta, room.code, bot_sid, _bot_move_delay(_bot_preset_for(meta)))
 
 
-def _stop_bot_task(room: dict, bot_sid: str):
-    bots = room.get("bots")
-    if not bots:
-        return
-    meta = bots.get(bot_sid)
-    if not meta:
-        return
-    task = meta.get("task")
-    if task:
-        try:
-            task.kill()
-        except Exception:
-            pass
-        meta["task"] = None
+def _bot_move_delay(preset: dict) -> float:
+    min_delay, max_delay = preset.get("delay_range") or BOT_GUESS_DELAY_RANGE
+    if max_delay < min_delay:
+        min_delay, max_delay = max_delay, min_delay
+    return random.uniform(min_delay, max_delay)
 
 
-def _clear_all_bots(room: dict):
-    bots = room.get("bots")
-    if not bots:
-        return
-    for bot_sid in list(bots.keys()):
-        _stop_bot_task(room, bot_sid)
-        room["players"].pop(bot_sid, None)
-        bots.pop(bot_sid, None)
+def _schedule_bot_move(meta: BotMeta, room_code: str, bot_sid: str, delay: float):
+    meta.task = scheduler.call_later(delay, _room_post, room_code, _bot_move, room_code, bot_sid)
 
 
-def _add_bot_player(room: dict) -> dict:
-    bot_sid = f"{BOT_SID_PREFIX}{uuid4().hex}"
-    player_id = uuid4().hex
-    bot_name = _generate_bot_name(room)
-    player = {
-        "id": player_id,
-        "name": bot_name,
-        "score": 0,
-        "attempts": 0,
-        "joined_at": time.time(),
-        "user_id": None,
-        "is_bot": True,
-    }
-    room["players"][bot_sid] = player
-    room.setdefault("bots", {})[bot_sid] = {
-        "sid": bot_sid,
-        "name": bot_name,
-        "task": None,
-        "candidates": [],
-        "used": set(),
-        "lang": room.get("lang", "pt"),
-        "difficulty": _normalize_bot_difficulty(room.get("bot_difficulty")),
-        "round_grace_until": None,
-        "knowledge": {"banned": set(), "present": set()},
-        "min_confident_attempts": 0,
-        "confidence_bias": 0.0,
-        "mistake_chance": 0.0,
-    }
-    return bot_sid, player
+def _bot_move(room_code: str, bot_sid: str):
+    """One bot turn, posted to the room by the shared scheduler; schedules the next one."""
+    room = multiplayer_rooms.get(room_code)
+    if not room or room.status != "playing" or room.round_complete:
+        return
+    meta = room.bots.get(bot_sid)
+    if not meta or bot_sid not in room.players:
+        return
+    meta.task = None
+    grace_until = max(
+        room.bot_round_grace_until or 0.0,
+        meta.round_grace_until or 0.0,
+    )
+    now = time.time()
+    if grace_until and now < grace_until:
+        _schedule_bot_move(meta, room_code, bot_sid, grace_until - now)
+        return
+    player = room.players[bot_sid]
+    if player.attempts >= room.max_attempts:
+        return
+    decision_request = _bot_decision_request(room, bot_sid)
+    if bot_pool is not None:
+        _submit_bot_decision(meta, room_code, bot_sid, decision_request)
+        return
+    _play_bot_decision(room, bot_sid, decide(decision_request))
+
+
+def _submit_bot_decision(meta: BotMeta, room_code: str, bot_sid: str, decision_request: DecisionRequest):
+    """Hand the decision to a worker process; its result is posted to the room."""
+    future = bot_pool.submit(decision_request)
+    # O scheduler só guarda o prazo: vencido, o bot decide neste processo
+    timer = meta.task = scheduler.call_later(
+        bot_pool.timeout, _room_post, room_code, _bot_decision_timed_out, room_code, bot_sid, decision_request, future
+    )
+    future.add_done_callback(
+        lambda done: _room_post(room_code, _bot_decision_ready, room_code, bot_sid, decision_request, done, timer)
+    )
 
 
-def _refresh_bot_persona(meta: dict, room: dict | None = None) -> None:
-    """Assign per-round constraints so bots feel less robotic."""
-    preset = _bot_preset_for(meta, room)
-    attempts_range = preset.get("min_win_attempts_range") or (3, 4)
-    if isinstance(attempts_range, (tuple, list)) and attempts_range:
-        low = int(attempts_range[0])
-        high = int(attempts_range[-1])
-    else:
-        low = high = 3
-    if high < low:
-        low, high = high, low
-    low = max(0, low)
-    high = max(low, high)
-    meta["min_confident_attempts"] = random.randint(low, high)
-    jitter = float(preset.get("confidence_jitter", 0.0) or 0.0)
-    meta["confidence_bias"] = random.uniform(-jitter, jitter) if jitter else 0.0
-    mistake_chance = float(preset.get("mistake_chance", 0.0) or 0.0)
-    meta["mistake_chance"] = max(0.0, min(1.0, mistake_chance))
+def _bot_decision_ready(room_code: str, bot_sid: str, decision_request: DecisionRequest, future, timer):
+    if future.cancelled():
+        return  # o prazo venceu antes e o bot já decidiu no processo
+    timer.cancel()
+    room = multiplayer_rooms.get(room_code)
+    meta = room.bots.get(bot_sid) if room else None
+    if meta and meta.task is timer:
+        meta.task = None
+    decision = decide(decision_request) if future.exception() is not None else future.result()
+    _play_worker_decision(room, bot_sid, decision_request, decision)
 
 
-def _launch_bots_for_round(room: dict):
-    bots = room.get("bots")
-    if not bots:
+def _bot_decision_timed_out(room_code: str, bot_sid: str, decision_request: DecisionRequest, future):
+    if not future.cancel():
+        return  # a resposta chegou e já está na fila da sala
+    bot_pool.note_timeout()
+    room = multiplayer_rooms.get(room_code)
+    meta = room.bots.get(bot_sid) if room else None
+    if not meta:
         return
-    lang = room.get("lang", "pt")
-    for bot_sid, meta in list(bots.items()):
-        if bot_sid not in room["players"]:
-            continue
-        meta["lang"] = lang
-        meta["candidates"] = _bot_word_pool(lang)
-        meta["used"] = set()
-        meta["difficulty"] = _normalize_bot_difficulty(room.get("bot_difficulty"))
-        meta["round_grace_until"] = room.get("bot_round_grace_until")
-        knowledge = _ensure_bot_knowledge(meta)
-        knowledge["banned"].clear()
-        knowledge["present"].clear()
-        _refresh_bot_persona(meta, room)
-        _stop_bot_task(room, bot_sid)
-        meta["task"] = socketio.start_background_task(_bot_worker, room["code"], bot_sid)
-
-
-def _bot_worker(room_code: str, bot_sid: str):
-    while True:
-        room = multiplayer_rooms.get(room_code)
-        if not room or room.get("status") != "playing" or room.get("round_complete"):
-            return
-        meta = room.get("bots", {}).get(bot_sid)
-        preset = _bot_preset_for(meta, room)
-        delay_range = preset.get("delay_range") or BOT_GUESS_DELAY_RANGE
-        min_delay, max_delay = delay_range
-        if max_delay < min_delay:
-            min_delay, max_delay = max_delay, min_delay
-        eventlet.sleep(random.uniform(min_delay, max_delay))
-        room = multiplayer_rooms.get(room_code)
-        if not room or room.get("status") != "playing" or room.get("round_complete"):
-            return
-        meta = room.get("bots", {}).get(bot_sid)
-        preset = _bot_preset_for(meta, room)
-        if not meta:
-            return
-        grace_until = max(
-            room.get("bot_round_grace_until") or 0.0,
-            meta.get("round_grace_until") or 0.0,
-        )
-        if grace_until:
-            now = time.time()
-            if now < grace_until:
-                eventlet.sleep(grace_until - now)
-                room = multiplayer_rooms.get(room_code)
-                if not room or room.get("status") != "playing" or room.get("round_complete"):
-                    return
-                meta = room.get("bots", {}).get(bot_sid)
-                if not meta:
-                    return
-        if bot_sid not in room["players"]:
-            return
-        player = room["players"][bot_sid]
-        if player["attempts"] >= room.get("max_attempts", ROUND_ATTEMPTS):
-            return
-        guess = _select_bot_guess(room, bot_sid)
-        if not guess:
-            return
-        success, feedback = _execute_guess(room, bot_sid, guess, result_target=None)
-        if not success:
-            return
-        _refine_bot_candidates(room, bot_sid, guess, feedback, preset=preset)
-        if room.get("round_complete"):
-            return
+    meta.task = None
+    _play_worker_decision(room, bot_sid, decision_request, decide(decision_request))
+
+
+def _play_worker_decision(room: Room | None, bot_sid: str, decision_request: DecisionRequest, decision):
+    meta = room.bots.get(bot_sid) if room else None
+    if not meta or room.status != "playing" or room.round_complete:
+        return
+    player = room.players.get(bot_sid)
+    # O estado pode ter mudado enquanto o worker pensava
+    if not player or player.attempts != decision_request.attempts or meta.used != decision_request.used:
+        return
+    _play_bot_decision(room, bot_sid, decision)
+
+
+def _bot_decision_request(room: Room, bot_sid: str) -> DecisionRequest:
+    meta = room.bots[bot_sid]
+    lexicon = get_lexicon(meta.lang)
+    knowledge = meta.knowledge
+    if not meta.candidates:
+        meta.candidates = knowledge["constraints"].mask(lexicon)
+    player = room.players.get(bot_sid)
+    return DecisionRequest(
+        lang=lexicon.lang,
+        difficulty=meta.difficulty,
+        attempts=player.attempts if player else 0,
+        candidates=meta.candidates,
+        used=meta.used,
+        constraints=knowledge["constraints"],
+        min_confident_attempts=meta.min_confident_attempts,
+        confidence_bias=meta.confidence_bias,
+        mistake_chance=meta.mistake_chance,
+        seed=random.getrandbits(64),
+        history=knowledge["history"],
+    )
+
+
+def _play_bot_decision(room: Room, bot_sid: str, decision):
+    meta = room.bots.get(bot_sid)
+    if not meta or decision is None:
+        return
+    meta.used = decision.used
+    lexicon = get_lexicon(meta.lang)
+    guess = lexicon.word(decision.guess_id)
+    success, feedback = _execute_guess(room, bot_sid, guess, result_target=None)
+    if not success:
+        return
+    preset = _bot_preset_for(meta)
+    meta.candidates = refine_candidates(lexicon, meta.candidates, meta.knowledge, guess, feedback, tier_for(preset))
+    if room.round_complete:
+        return
+    _schedule_bot_move(meta, room.code, bot_sid, _bot_move_delay(preset))
 
 
-def _select_bot_guess(room: dict, bot_sid: str) -> str | None:
-    meta = room.get("bots", {}).get(bot_sid)
-    if not meta:
-        return None
-    lang = meta.get("lang") or room.get("lang", "pt")
-    preset = _bot_preset_for(meta, room)
-    knowledge = _ensure_bot_knowledge(meta)
-    strict_candidates = meta.get("candidates")
-    if not strict_candidates:
-        strict_candidates = _apply_knowledge_filter(_bot_word_pool(lang), knowledge)
-        meta["candidates"] = strict_candidates[:]
-    used = meta.setdefault("used", set())
-    player = room["players"].get(bot_sid) if bot_sid in room["players"] else None
-    attempts = player["attempts"] if player else 0
-    smart_pick_chance = preset.get("smart_pick_chance", 1.0)
-    late_focus_step = max(0.0, preset.get("late_focus_step", 0.0))
-    if attempts >= 4 and late_focus_step > 0:
-        smart_pick_chance = min(1.0, smart_pick_chance + (attempts - 3) * late_focus_step)
-    smart_pick_chance = max(0.0, min(1.0, smart_pick_chance))
-    wild_guess_chance = max(0.0, preset.get("wild_guess_chance", 0.0))
-    if attempts >= 4 and late_focus_step > 0:
-        wild_guess_chance = max(0.0, wild_guess_chance - (attempts - 3) * late_focus_step * 0.5)
-    min_confident_attempts = max(0, int(meta.get("min_confident_attempts", 0) or 0))
-    early_phase = attempts < min_confident_attempts
-    base_confidence = float(preset.get("base_confidence", smart_pick_chance))
-    confidence_growth = float(preset.get("confidence_growth", 0.1))
-    confidence_bias = float(meta.get("confidence_bias", 0.0) or 0.0)
-    confidence = base_confidence + attempts * max(0.0, confidence_growth) + confidence_bias
-    confidence = max(0.05, min(0.98, confidence))
-    hesitation_bias = max(0.0, min(1.0, float(preset.get("hesitation_bias", 0.4) or 0.0)))
-    if early_phase:
-        smart_pick_chance *= (1.0 - 0.5 * hesitation_bias)
-        confidence *= 0.5
-        wild_guess_chance = min(0.85, wild_guess_chance + hesitation_bias * 0.35)
-    else:
-        smart_pick_chance = min(1.0, (smart_pick_chance + confidence) / 2)
-    smart_pick_chance = max(0.0, min(1.0, smart_pick_chance))
-    mistake_chance = float(meta.get("mistake_chance", preset.get("mistake_chance", 0.0) or 0.0))
-    if early_phase:
-        mistake_chance = min(1.0, mistake_chance + hesitation_bias * 0.4)
-    strict_pool = [word for word in strict_candidates if word not in used]
-    fallback_pool = _apply_knowledge_filter(_bot_word_pool(lang), knowledge)
-    fallback_pool = [word for word in fallback_pool if word not in used]
-    should_force_fallback = bool(fallback_pool) and (
-        (early_phase and random.random() < hesitation_bias)
-        or (random.random() < mistake_chance)
-    )
-    pool = strict_pool if strict_pool else fallback_pool
-    if should_force_fallback:
-        pool = fallback_pool or strict_pool
-    elif fallback_pool and random.random() > smart_pick_chance:
-        pool = fallback_pool
-    if pool and random.random() < wild_guess_chance:
-        random_pool = [word for word in _bot_word_pool(lang) if word not in used]
-        pool = random_pool or pool
-    if not pool:
-        used.clear()
-        strict_pool = [word for word in meta.get("candidates", []) if word not in used]
-        fallback_pool = _apply_knowledge_filter(_bot_word_pool(lang), knowledge)
-        fallback_pool = [word for word in fallback_pool if word not in used]
-        pool = strict_pool or fallback_pool
-        if not pool:
-            return None
-    guess = random.choice(pool)
-    used.add(guess)
-    return guess
-
-
-def _refine_bot_candidates(
-    room: dict,
-    bot_sid: str,
-    guess: str,
-    feedback: list[dict],
-    *,
-    preset: dict | None = None,
-):
-    meta = room.get("bots", {}).get(bot_sid)
-    if not meta:
-        return
-    lang = room.get("lang", "pt")
-    candidates = meta.get("candidates") or _bot_word_pool(lang)
-    knowledge = _ensure_bot_knowledge(meta)
-    _update_bot_knowledge(knowledge, feedback)
-    filtered = _filter_candidates_by_feedback(candidates, guess, feedback)
-    filtered = _apply_knowledge_filter(filtered, knowledge)
-    if not filtered:
-        filtered = _apply_knowledge_filter(_bot_word_pool(lang), knowledge)
-    if not filtered:
-        filtered = candidates
-    meta["candidates"] = filtered
-
-
-def _filter_candidates_by_feedback(candidates: list[str], guess: str, feedback: list[dict]) -> list[str]:
-    filtered = []
-    guess_lower = guess.lower()
-    target_statuses = [item["status"] for item in feedback]
-    for word in candidates:
-        statuses = _check_guess_statuses_for_word(word, guess_lower)
-        if all(statuses[i]["status"] == target_statuses[i] for i in range(5)):
-            filtered.append(word)
-    return filtered or candidates
-
-
-def _room_payload(room: dict) -> dict:
+def _room_payload(room: Room) -> dict:
     return {
-        "code": room["code"],
-        "status": room["status"],
-        "roundNumber": room.get("round_index", 0),
-        "roundsTarget": room.get("rounds_target"),
-        "roundsCompleted": room.get("standard_rounds_completed", 0),
-        "tiebreakerActive": room.get("tiebreaker_active", False),
+        "code": room.code,
+        "status": room.status,
+        "roundNumber": room.round_index,
+        "roundsTarget": room.rounds_target,
+        "roundsCompleted": room.standard_rounds_completed,
+        "tiebreakerActive": room.tiebreaker_active,
         "players": _scoreboard_snapshot(room),
-        "maxAttempts": room.get("max_attempts", ROUND_ATTEMPTS),
-        "canStart": room["status"] == "lobby" and len(room["players"]) >= MIN_PLAYERS_PER_ROOM,
-        "canPlayAgain": room["status"] == "finished",
-        "hostId": room.get("host_player_id"),
-        "language": room.get("lang", "pt"),
-        "botDifficulty": room.get("bot_difficulty", DEFAULT_BOT_DIFFICULTY),
+        "maxAttempts": room.max_attempts,
+        "canStart": room.status == "lobby" and len(room.players) >= MIN_PLAYERS_PER_ROOM,
+        "canPlayAgain": room.status == "finished",
+        "hostId": room.host_player_id,
+        "language": room.lang,
+        "botDifficulty": room.bot_difficulty,
+        "roundTimeLimit": room.round_time_limit,
+        "roundEndsAt": room.round_ends_at,
     }
 
 
-def _broadcast_room_state(room: dict):
-    socketio.emit("room_update", _room_payload(room), to=room["code"])
+def _client_protocol(sid: str | None) -> int:
+    return client_protocols.get(sid, PROTOCOL_LEGACY)
+
+
+def _room_channels(code: str, sid: str) -> list:
+    channels = [code]
+    if _client_protocol(sid) >= PROTOCOL_COMPACT:
+        channels.append(compact_room(code))
+    if _client_protocol(sid) >= PROTOCOL_DELTA:
+        channels.append(delta_room(code))
+    return channels
 
 
-def _touch_room(room: dict):
+# Chamados fora do contexto do handler (no ator da sala): sid e namespace explícitos
+def _join_room_channels(code: str, sid: str):
+    for channel in _room_channels(code, sid):
+        socketio.server.enter_room(sid, channel, namespace="/")
+
+
+def _leave_room_channels(code: str, sid: str):
+    for channel in _room_channels(code, sid):
+        socketio.server.leave_room(sid, channel, namespace="/")
+
+
+def _channel_members(target: str):
+    """Human sids behind a Socket.IO target (room code, protocol channel or sid)."""
+    code, _, version = target.partition("#v")
+    room = multiplayer_rooms.get(code)
+    if room is not None:
+        minimum = int(version) if version.isdigit() else PROTOCOL_LEGACY
+        return [
+            sid
+            for sid, player in room.players.items()
+            if not player.is_bot and _client_protocol(sid) >= minimum
+        ]
+    if code == target:
+        return [target]  # sid de um único cliente
+    return None
+
+
+def _emit(event: str, payload=None, *, to: str, skip_sid=None):
+    """``socketio.emit`` that queues the copies of batching clients (see emit_batcher.py)."""
+    if not emit_batcher:
+        socketio.emit(event, payload, to=to, skip_sid=skip_sid)
+        return
+    members = _channel_members(to)
+    skipped = set([skip_sid] if isinstance(skip_sid, str) else skip_sid or ())
+    batched = [sid for sid in members or () if sid not in skipped and emit_batcher.wants(sid)]
+    for sid in batched:
+        emit_batcher.send(sid, event, payload)
+    if batched and len(batched) == len(members) - len(skipped.intersection(members)):
+        return
+    skip = list(skipped) + batched
+    socketio.emit(event, payload, to=to, skip_sid=skip or None)
+
+
+def _emit_to_room(room: Room, event: str, payload: dict, compact_factory, *, skip_sid: str | None = None):
+    """Emit ``payload`` to legacy members and ``compact_factory()`` to compact ones."""
+    code = room.code
+    compact_sids = []
+    legacy_members = 0
+    for sid, player in room.players.items():
+        if player.is_bot or sid == skip_sid:
+            continue
+        if _client_protocol(sid) >= PROTOCOL_COMPACT:
+            compact_sids.append(sid)
+        else:
+            legacy_members += 1
+    if not compact_sids:
+        _emit(event, payload, to=code, skip_sid=skip_sid)
+        return
+    if legacy_members:
+        skip = compact_sids + ([skip_sid] if skip_sid else [])
+        _emit(event, payload, to=code, skip_sid=skip)
+    _emit(event, compact_factory(), to=compact_room(code), skip_sid=skip_sid)
+
+
+def _broadcast_room_state(room: Room):
+    """Send the room state to its members if it changed since the last broadcast.
+
+    Each change bumps ``room.state_seq``. Legacy and compact members get
+    the full state; delta members (protocol 3) get a full ``room_update``
+    once and ``room_delta`` events with only the changed fields afterwards.
+    """
+    payload = _room_payload(room)
+    state = compact_room_payload(payload)
+    previous = room.state_snapshot
+    delta = room_delta(previous, state) if previous is not None else None
+    if previous is not None and not delta:
+        return
+    base_seq = room.state_seq
+    seq = room.state_seq = base_seq + 1
+    room.state_snapshot = state
+    code = room.code
+    legacy_members = 0
+    compact_sids = []
+    delta_sids = []
+    for sid, player in room.players.items():
+        if player.is_bot:
+            continue
+        protocol = _client_protocol(sid)
+        if protocol >= PROTOCOL_DELTA:
+            delta_sids.append(sid)
+        elif protocol >= PROTOCOL_COMPACT:
+            compact_sids.append(sid)
+        else:
+            legacy_members += 1
+    if legacy_members:
+        _emit("room_update", payload, to=code, skip_sid=(compact_sids + delta_sids) or None)
+    if compact_sids:
+        _emit("room_update", state, to=compact_room(code), skip_sid=delta_sids or None)
+    if not delta_sids:
+        room.state_synced = set()
+        return
+    synced = room.state_synced
+    fresh = [sid for sid in delta_sids if sid not in synced or delta is None]
+    if len(fresh) < len(delta_sids):
+        _emit(
+            "room_delta",
+            {"c": code, "q": seq, "f": base_seq, **delta},
+            to=delta_room(code),
+            skip_sid=fresh or None,
+        )
+    for sid in fresh:
+        _emit("room_update", {**state, "q": seq}, to=sid)
+    room.state_synced = set(delta_sids)
+
+
+def _send_room_state(room: Room, sid: str):
+    """Full room state for one member (resync), in that member's protocol."""
+    protocol = _client_protocol(sid)
+    if protocol < PROTOCOL_COMPACT:
+        _emit("room_update", _room_payload(room), to=sid)
+        return
+    state = room.state_snapshot or compact_room_payload(_room_payload(room))
+    if protocol >= PROTOCOL_DELTA:
+        state = {**state, "q": room.state_seq}
+        room.state_synced.add(sid)
+    _emit("room_update", state, to=sid)
+
+
+def _touch_room(room: Room):
     if not room:
         return
-    room["last_activity"] = time.time()
+    room.last_activity = time.time()
+    # O prazo mais curto de qualquer política; _expire_room reavalia ao vencer
+    room_expiry.schedule(room.code, room.last_activity + ROOM_IDLE_TIMEOUT)
 
 
-def _ensure_host(room: dict):
-    if not room["players"]:
-        room["host_sid"] = None
-        room["host_player_id"] = None
+def _ensure_host(room: Room):
+    if not room.players:
+        room.set_host(None, None)
         return
-    current_host_sid = room.get("host_sid")
-    if current_host_sid in room["players"] and not room["players"][current_host_sid].get("is_bot"):
+    current_host_sid = room.host_sid
+    if current_host_sid in room.players and not room.players[current_host_sid].is_bot:
         return
     sorted_players = sorted(
-        room["players"].items(),
-        key=lambda item: item[1].get("joined_at", time.time())
+        room.players.items(),
+        key=lambda item: item[1].joined_at
     )
     chosen_sid = None
     chosen_player = None
     for candidate_sid, candidate in sorted_players:
-        if not candidate.get("is_bot"):
+        if not candidate.is_bot:
             chosen_sid = candidate_sid
             chosen_player = candidate
             break
     if not chosen_player and sorted_players:
         chosen_sid, chosen_player = sorted_players[0]
     if not chosen_player:
-        room["host_sid"] = None
-        room["host_player_id"] = None
+        room.set_host(None, None)
         return
-    if room.get("host_sid") == chosen_sid:
+    if room.host_sid == chosen_sid:
         return
-    room["host_sid"] = chosen_sid
-    room["host_player_id"] = chosen_player["id"]
-    socketio.emit("host_change", {"playerId": chosen_player["id"]}, to=room["code"])
+    room.set_host(chosen_sid, chosen_player)
+    _emit("host_change", {"playerId": chosen_player.id}, to=room.code)
 
 
-def _determine_leaders(room: dict) -> list:
-    if not room["players"]:
+def _determine_leaders(room: Room) -> list:
+    if not room.players:
         return []
-    max_score = max(player["score"] for player in room["players"].values())
-    return [player for player in room["players"].values() if player["score"] == max_score]
+    max_score = max(player.score for player in room.players.values())
+    return [player for player in room.players.values() if player.score == max_score]
 
 
-def _all_attempts_spent(room: dict) -> bool:
-    if not room["players"]:
+def _all_attempts_spent(room: Room) -> bool:
+    if not room.players:
         return False
-    return all(player["attempts"] >= room["max_attempts"] for player in room["players"].values())
+    return all(player.attempts >= room.max_attempts for player in room.players.values())
 
 
-def _execute_guess(room: dict, sid: str, guess: str, *, result_target: str | None = None):
-    player = room["players"].get(sid)
+def _execute_guess(room: Room, sid: str, guess: str, *, result_target: str | None = None):
+    player = room.players.get(sid)
     if not player:
         return False, "Jogador inválido."
-    if player["attempts"] >= room["max_attempts"]:
+    if player.attempts >= room.max_attempts:
         return False, "Você já usou todas as tentativas."
     guess_lc = guess.lower()
-    player["attempts"] += 1
-    feedback = _check_guess_statuses_for_word(room["current_word"], guess_lc)
-    result_payload = {
-        "playerId": player["id"],
-        "guess": guess.upper(),
-        "feedback": feedback,
-        "attempt": player["attempts"],
-        "maxAttempts": room["max_attempts"],
-        "roundNumber": room.get("round_index", 0),
-    }
+    player.attempts += 1
+    code = feedback_code(guess_lc, room.current_word, room.lang)
+    feedback = feedback_items(guess_lc, code)
+    round_number = room.round_index
     if result_target:
-        socketio.emit("guess_result", result_payload, to=result_target)
+        if _client_protocol(result_target) >= PROTOCOL_COMPACT:
+            result_payload = compact_guess_result(
+                player.id, code, player.attempts, room.max_attempts, round_number
+            )
+        else:
+            result_payload = {
+                "playerId": player.id,
+                "guess": guess.upper(),
+                "feedback": feedback,
+                "attempt": player.attempts,
+                "maxAttempts": room.max_attempts,
+                "roundNumber": round_number,
+            }
+        _emit("guess_result", result_payload, to=result_target)
     peer_payload = {
-        "playerId": player["id"],
-        "attempt": player["attempts"],
+        "playerId": player.id,
+        "attempt": player.attempts,
         "feedback": [item["status"] for item in feedback],
-        "roundNumber": room.get("round_index", 0),
+        "roundNumber": round_number,
     }
-    emit_kwargs = {"to": room["code"]}
-    if result_target:
-        emit_kwargs["skip_sid"] = result_target
-    socketio.emit("peer_guess", peer_payload, **emit_kwargs)
-    if all(item["status"] == "green" for item in feedback):
-        room["round_winner_sid"] = sid
-        player["score"] += 1
+    _emit_to_room(
+        room,
+        "peer_guess",
+        peer_payload,
+        lambda: compact_peer_guess(player.id, code, player.attempts, round_number),
+        skip_sid=result_target,
+    )
+    if code == ALL_GREEN:
+        room.round_winner_sid = sid
+        player.score += 1
         _broadcast_room_state(room)
         _finalize_round(room, winner_sid=sid, was_draw=False)
         return True, feedback
@@ -761,32 +749,93 @@ def _execute_guess(room: dict, sid: str, guess: str, *, result_target: str | Non
     return True, feedback
 
 
-def _queue_round_transition(code: str, action: str, delay: float = 3.0):
-    def _runner():
-        socketio.sleep(delay)
-        room = multiplayer_rooms.get(code)
-        if not room or room["status"] != "playing":
-            return
-        if action == "standard":
-            _start_new_round(room, is_tiebreaker=False)
-        elif action == "tiebreaker":
-            _start_new_round(room, is_tiebreaker=True)
+def _queue_round_transition(room: Room, action: str, delay: float = ROUND_TRANSITION_DELAY):
+    if room.transition_timer:
+        room.transition_timer.cancel()
+    room.transition_timer = scheduler.call_later(
+        delay, _room_post, room.code, _run_round_transition, room.code, action, room.round_index
+    )
 
-    socketio.start_background_task(_runner)
+
+def _run_round_transition(code: str, action: str, round_index: int):
+    room = multiplayer_rooms.get(code)
+    # Um timer já disparado não é cancelável: confere se ainda é a mesma rodada
+    if not room or room.status != "playing" or room.round_index != round_index or not room.round_complete:
+        return
+    room.transition_timer = None
+    if action == "standard":
+        _start_new_round(room, is_tiebreaker=False)
+    elif action == "tiebreaker":
+        _start_new_round(room, is_tiebreaker=True)
+
+
+def _human_connected(code: str, sid: str) -> bool:
+    if socketio.server.manager.is_connected(sid, "/"):
+        return True
+    # Conectado a outro nó: vale o índice compartilhado, que a desconexão limpa
+    return room_registry.shared and player_room_index.get(sid) == code
+
+
+def _room_expiry_policy(room: Room) -> tuple:
+    """``(policy, idle timeout)``; policy ``None`` means the room is kept."""
+    if not room.players:
+        return "empty", ROOM_IDLE_TIMEOUT
+    human_sids = room.human_sids()
+    if not human_sids:
+        return "botOnly", ROOM_IDLE_TIMEOUT
+    if room.status == "finished":
+        return "finished", ROOM_FINISHED_IDLE_TIMEOUT
+    # Humanos cuja desconexão se perdeu (nó caiu, evento não chegou)
+    if not any(_human_connected(room.code, sid) for sid in human_sids):
+        return "disconnected", ROOM_IDLE_TIMEOUT
+    # Lobby ou partida com alguém conectado fica, mesmo que ninguém jogue
+    return None, ROOM_IDLE_TIMEOUT
+
+
+def _expire_room(code: str):
+    # Reavaliado dentro do ator: alguém pode ter agido desde que o prazo venceu
+    room = multiplayer_rooms.get(code)
+    if not room:
+        return
+    policy, timeout = _room_expiry_policy(room)
+    deadline = room.last_activity + timeout
+    if policy is None or time.time() < deadline:
+        room_expiry.schedule(code, deadline)
+        return
+    _evict_room(room, policy)
+
+
+def _evict_room(room: Room, policy: str, *, reason: str = "idle"):
+    code = room.code
+    room.cancel_timers()
+    _clear_all_bots(room)
+    # Por sid, não para o canal: com posse perdida o canal já é da sala do outro nó
+    for sid in room.human_sids():
+        _emit("left_room", {"code": code, "reason": reason}, to=sid)
+        player_room_index.pop(sid, None)
+        _leave_room_channels(code, sid)
+    multiplayer_rooms.pop(code, None)
+    room_actors.discard(code)
+    room_registry.release(code)
+    room_expiry.discard(code)
+    room_evictions[policy] += 1
+
+
+def _drop_lost_room(code: str):
+    room = multiplayer_rooms.get(code)
+    if room:
+        _evict_room(room, "claimLost", reason="lost")
 
 
 def _room_gc_worker():
     while True:
         socketio.sleep(ROOM_SWEEP_INTERVAL)
-        now = time.time()
-        for code, room in list(multiplayer_rooms.items()):
-            if not room:
-                continue
-            if room.get("players"):
-                continue
-            last_activity = room.get("last_activity") or now
-            if now - last_activity >= ROOM_IDLE_TIMEOUT:
-                multiplayer_rooms.pop(code, None)
+        for code in room_expiry.pop_expired(time.time()):
+            _room_post(code, _expire_room, code)
+        # Outro nó assumiu o código (posse expirada): a cópia local sai de cena
+        for code in room_registry.refresh(multiplayer_rooms):
+            _room_post(code, _drop_lost_room, code)
+        games.sweep()
 
 
 if not _room_gc_started:
@@ -794,167 +843,179 @@ if not _room_gc_started:
     socketio.start_background_task(_room_gc_worker)
 
 
-def _start_new_round(room: dict, *, is_tiebreaker: bool = False):
-    if room["status"] != "playing":
+def _start_new_round(room: Room, *, is_tiebreaker: bool = False):
+    if room.status != "playing":
         return
-    if len(room["players"]) < MIN_PLAYERS_PER_ROOM:
+    if len(room.players) < MIN_PLAYERS_PER_ROOM:
         _finish_match(room, cancelled=True)
         return
     _touch_room(room)
-    room["round_index"] = room.get("round_index", 0) + 1
-    room["current_round_tiebreaker"] = is_tiebreaker
-    room["round_complete"] = False
-    room["round_draw"] = False
-    room["round_winner_sid"] = None
-    room["current_word"] = get_random_word(room.get("lang", "pt"))
-    room["round_started_at"] = time.time()
-    room["bot_round_grace_until"] = room["round_started_at"] + BOT_ROUND_START_GRACE_SECONDS
-    for player in room["players"].values():
-        player["attempts"] = 0
-    socketio.emit(
+    room.round_index += 1
+    room.current_round_tiebreaker = is_tiebreaker
+    room.round_complete = False
+    room.round_draw = False
+    room.round_winner_sid = None
+    room.current_word = get_lexicon(room.lang).random_answer()
+    room.round_started_at = time.time()
+    room.bot_round_grace_until = room.round_started_at + BOT_ROUND_START_GRACE_SECONDS
+    room.stop_round_timer()
+    if room.round_time_limit:
+        room.round_ends_at = room.round_started_at + room.round_time_limit
+        room.round_timer = scheduler.call_later(
+            room.round_time_limit, _room_post, room.code, _round_timed_out, room.code, room.round_index
+        )
+    for player in room.players.values():
+        player.attempts = 0
+    _emit(
         "round_started",
         {
-            "roundNumber": room["round_index"],
+            "roundNumber": room.round_index,
             "isTiebreaker": is_tiebreaker,
-            "maxAttempts": room["max_attempts"],
+            "maxAttempts": room.max_attempts,
             "scoreboard": _scoreboard_snapshot(room),
-            "roundsTarget": room["rounds_target"],
-            "standardRoundsCompleted": room.get("standard_rounds_completed", 0),
+            "roundsTarget": room.rounds_target,
+            "standardRoundsCompleted": room.standard_rounds_completed,
+            "timeLimit": room.round_time_limit,
+            "endsAt": room.round_ends_at,
         },
-        to=room["code"],
+        to=room.code,
     )
     _broadcast_room_state(room)
     _launch_bots_for_round(room)
 
 
-def _finish_match(room: dict, *, winner_ids=None, cancelled: bool = False):
+def _finish_match(room: Room, *, winner_ids=None, cancelled: bool = False):
     if winner_ids is None:
         winner_ids = []
     _touch_room(room)
-    room["status"] = "finished"
-    room["current_word"] = None
-    room["round_winner_sid"] = None
-    room["round_draw"] = False
-    room["round_complete"] = True
-    room["tiebreaker_active"] = False
-    room["current_round_tiebreaker"] = False
-    room["bot_round_grace_until"] = None
+    room.status = "finished"
+    room.end_round()
     winners_payload = []
     if winner_ids:
         allowed = set(winner_ids)
-        for player in room["players"].values():
-            if player["id"] in allowed:
+        for player in room.players.values():
+            if player.id in allowed:
                 winners_payload.append(
                     {
-                        "playerId": player["id"],
-                        "name": player["name"],
-                        "score": player["score"],
+                        "playerId": player.id,
+                        "name": player.name,
+                        "score": player.score,
                     }
                 )
     scoreboard_snapshot = _scoreboard_snapshot(room)
-    socketio.emit(
+    _emit(
         "match_over",
         {
             "scoreboard": scoreboard_snapshot,
             "winners": winners_payload,
             "cancelled": cancelled,
         },
-        to=room["code"],
+        to=room.code,
     )
-    if not cancelled and not room.get("stats_recorded"):
+    if not cancelled and not room.stats_recorded:
         winner_set = set(winner_ids or [])
         participants = []
-        for player in room.get("players", {}).values():
-            user_id = player.get("user_id")
+        for player in room.players.values():
+            user_id = player.user_id
             if not user_id:
                 continue
-            participants.append((int(user_id), player["id"] in winner_set))
+            participants.append((int(user_id), player.id in winner_set))
         if participants:
             record_multiplayer_match(participants)
-            room["stats_recorded"] = True
+            room.stats_recorded = True
     _clear_all_bots(room)
     _broadcast_room_state(room)
 
 
-def _finalize_round(room: dict, *, winner_sid=None, was_draw: bool = False):
-    if room.get("round_complete"):
+def _round_timed_out(code: str, round_index: int):
+    room = multiplayer_rooms.get(code)
+    if not room or room.status != "playing" or room.round_complete or room.round_index != round_index:
+        return
+    room.round_timer = None
+    _finalize_round(room, winner_sid=None, was_draw=True, timed_out=True)
+
+
+def _finalize_round(room: Room, *, winner_sid=None, was_draw: bool = False, timed_out: bool = False):
+    if room.round_complete:
         return
     _touch_room(room)
-    room["round_complete"] = True
-    room["rounds_completed"] = room.get("rounds_completed", 0) + 1
-    is_tiebreaker = room.get("current_round_tiebreaker", False)
+    room.stop_round_timer()
+    room.round_complete = True
+    room.rounds_completed += 1
+    is_tiebreaker = room.current_round_tiebreaker
     if not is_tiebreaker:
-        room["standard_rounds_completed"] = room.get("standard_rounds_completed", 0) + 1
+        room.standard_rounds_completed += 1
     winner_payload = None
-    if winner_sid and winner_sid in room["players"]:
-        player = room["players"][winner_sid]
+    if winner_sid and winner_sid in room.players:
+        player = room.players[winner_sid]
         winner_payload = {
-            "playerId": player["id"],
-            "name": player["name"],
-            "score": player["score"],
+            "playerId": player.id,
+            "name": player.name,
+            "score": player.score,
         }
-    room.setdefault("match_history", []).append(
+    room.match_history.append(
         {
-            "round": room.get("round_index", 0),
+            "round": room.round_index,
             "winner": winner_payload["playerId"] if winner_payload else None,
             "draw": was_draw,
             "isTiebreaker": is_tiebreaker,
         }
     )
-    socketio.emit(
+    _emit(
         "round_result",
         {
-            "roundNumber": room.get("round_index", 0),
+            "roundNumber": room.round_index,
             "winner": winner_payload,
             "draw": was_draw,
+            "timedOut": timed_out,
             "isTiebreaker": is_tiebreaker,
             "scoreboard": _scoreboard_snapshot(room),
         },
-        to=room["code"],
+        to=room.code,
     )
     leaders = _determine_leaders(room)
-    if room.get("tiebreaker_active"):
+    if room.tiebreaker_active:
         if len(leaders) == 1:
-            _finish_match(room, winner_ids=[leaders[0]["id"]])
+            _finish_match(room, winner_ids=[leaders[0].id])
         else:
-            socketio.emit(
+            _emit(
                 "tiebreaker_pending",
                 {
                     "leaders": [
                         {
-                            "playerId": player["id"],
-                            "name": player["name"],
-                            "score": player["score"],
+                            "playerId": player.id,
+                            "name": player.name,
+                            "score": player.score,
                         }
                         for player in leaders
                     ]
                 },
-                to=room["code"],
+                to=room.code,
             )
-            _queue_round_transition(room["code"], action="tiebreaker")
+            _queue_round_transition(room, action="tiebreaker")
         return
-    if room.get("standard_rounds_completed", 0) >= room.get("rounds_target", 0):
+    if room.standard_rounds_completed >= room.rounds_target:
         if len(leaders) == 1:
-            _finish_match(room, winner_ids=[leaders[0]["id"]])
+            _finish_match(room, winner_ids=[leaders[0].id])
             return
-        room["tiebreaker_active"] = True
-        socketio.emit(
+        room.tiebreaker_active = True
+        _emit(
             "tiebreaker_start",
             {
                 "leaders": [
                     {
-                        "playerId": player["id"],
-                        "name": player["name"],
-                        "score": player["score"],
+                        "playerId": player.id,
+                        "name": player.name,
+                        "score": player.score,
                     }
                     for player in leaders
                 ]
             },
-            to=room["code"],
+            to=room.code,
         )
-        _queue_round_transition(room["code"], action="tiebreaker")
+        _queue_round_transition(room, action="tiebreaker")
         return
-    _queue_round_transition(room["code"], action="standard")
+    _queue_round_transition(room, action="standard")
 
 
 def _remove_player_from_room(code: str, sid: str, *, notify: bool = True):
@@ -962,52 +1023,32 @@ def _remove_player_from_room(code: str, sid: str, *, notify: bool = True):
     player_room_index.pop(sid, None)
     if not room:
         return
-    player = room["players"].pop(sid, None)
+    player = room.players.pop(sid, None)
     if not player:
         return
-    was_bot = bool(player.get("is_bot"))
+    was_bot = player.is_bot
     if was_bot:
         _stop_bot_task(room, sid)
-        room.get("bots", {}).pop(sid, None)
+        room.bots.pop(sid, None)
     else:
-        leave_room(code)
+        _leave_room_channels(code, sid)
     if notify:
-        socketio.emit(
+        _emit(
             "player_left",
-            {"playerId": player["id"], "name": player["name"], "bot": was_bot},
+            {"playerId": player.id, "name": player.name, "bot": was_bot},
             to=code,
         )
     _touch_room(room)
-    if not room["players"]:
-        room["host_sid"] = None
-        room["host_player_id"] = None
-        room["empty_since"] = time.time()
-        room["status"] = "lobby"
-        room["current_word"] = None
-        room["round_complete"] = True
-        room["round_draw"] = False
-        room["round_started_at"] = None
-        room["tiebreaker_active"] = False
-        room["current_round_tiebreaker"] = False
-        room["stats_recorded"] = False
+    if not room.players:
+        room.mark_empty()
         return
-    if not any(not pl.get("is_bot") for pl in room["players"].values()):
+    if not room.human_sids():
         _clear_all_bots(room)
-        room["host_sid"] = None
-        room["host_player_id"] = None
-        room["empty_since"] = time.time()
-        room["status"] = "lobby"
-        room["current_word"] = None
-        room["round_complete"] = True
-        room["round_draw"] = False
-        room["round_started_at"] = None
-        room["tiebreaker_active"] = False
-        room["current_round_tiebreaker"] = False
-        room["stats_recorded"] = False
+        room.mark_empty()
         _broadcast_room_state(room)
         return
     _ensure_host(room)
-    if room["status"] == "playing" and len(room["players"]) < MIN_PLAYERS_PER_ROOM:
+    if room.status == "playing" and len(room.players) < MIN_PLAYERS_PER_ROOM:
         _finish_match(room, cancelled=True)
         return
     _broadcast_room_state(room)
@@ -1030,62 +1071,38 @@ def handle_create_room(data):
     if lang not in {"pt", "en"}:
         lang = "pt"
     code = _generate_room_code()
-    join_room(code)
-    player_id = uuid4().hex
+    player = Player(uuid4().hex, name, user_id=session.get("user_id"))
+    room = Room(code, lang, rounds, ROUND_ATTEMPTS)
+    time_limit = payload.get("roundTimeLimit")
+    if time_limit in ROUND_TIME_LIMIT_OPTIONS:
+        room.round_time_limit = time_limit
+    room.players[sid] = player
+    room.set_host(sid, player)
+    multiplayer_rooms[code] = room
     player_room_index[sid] = code
-    user_id = session.get("user_id")
-    player = {
-        "id": player_id,
-        "name": name,
-        "score": 0,
-        "attempts": 0,
-        "joined_at": time.time(),
-        "user_id": user_id,
-        "is_bot": False,
-    }
-    multiplayer_rooms[code] = {
-        "code": code,
-        "host_sid": sid,
-        "host_player_id": player_id,
-        "status": "lobby",
-        "lang": lang,
-        "initial_rounds": rounds,
-        "rounds_target": rounds,
-        "round_index": 0,
-        "rounds_completed": 0,
-        "standard_rounds_completed": 0,
-        "tiebreaker_active": False,
-        "current_round_tiebreaker": False,
-        "current_word": None,
-        "round_winner_sid": None,
-        "round_draw": False,
-        "round_complete": True,
-        "round_started_at": None,
-        "bot_round_grace_until": None,
-        "players": {sid: player},
-        "max_attempts": ROUND_ATTEMPTS,
-        "match_history": [],
-        "last_activity": time.time(),
-        "empty_since": None,
-        "stats_recorded": False,
-        "bots": {},
-        "bot_counter": 0,
-        "bot_difficulty": DEFAULT_BOT_DIFFICULTY,
-    }
-    _touch_room(multiplayer_rooms[code])
-    emit(
+    _room_call(code, _open_room, code, sid)
+
+
+def _open_room(code: str, sid: str):
+    room = multiplayer_rooms.get(code)
+    if not room or sid not in room.players:
+        return
+    _touch_room(room)
+    _join_room_channels(code, sid)
+    _emit(
         "room_created",
         {
             "code": code,
-            "playerId": player_id,
+            "playerId": room.players[sid].id,
             "host": True,
-            "roundsTarget": rounds,
-            "language": lang,
-            "botDifficulty": DEFAULT_BOT_DIFFICULTY,
+            "roundsTarget": room.rounds_target,
+            "language": room.lang,
+            "botDifficulty": room.bot_difficulty,
+            "roundTimeLimit": room.round_time_limit,
         },
         to=sid,
     )
-    _broadcast_room_state(multiplayer_rooms[code])
+    _broadcast_room_state(room)
 
 
 @socketio.on("join_room")
@@ -1099,49 +1116,42 @@ def handle_join_room_event(data):
     username = session.get("username")
     if username:
         name = username
-    resume_requested = bool(payload.get("resume"))
+    _room_call(code, _join_room, code, sid, name, bool(payload.get("resume")), session.get("user_id"))
+
+
+def _join_room(code: str, sid: str, name: str, resume_requested: bool, user_id):
     if not code or code not in multiplayer_rooms:
-        emit("room_error", {"error": "Sala n�o encontrada."}, to=sid)
+        _emit("room_error", {"error": "Sala n�o encontrada."}, to=sid)
         return
     room = multiplayer_rooms[code]
-    if room["status"] == "playing" and not resume_requested:
-        emit("room_error", {"error": "A partida jǭ come�ou."}, to=sid)
+    if room.status == "playing" and not resume_requested:
+        _emit("room_error", {"error": "A partida jǭ come�ou."}, to=sid)
         return
-    if len(room["players"]) >= MAX_PLAYERS_PER_ROOM:
-        emit("room_error", {"error": "Sala cheia."}, to=sid)
+    if len(room.players) >= MAX_PLAYERS_PER_ROOM:
+        _emit("room_error", {"error": "Sala cheia."}, to=sid)
         return
-    if sid in room["players"]:
-        emit("room_joined", {"code": code, "playerId": room["players"][sid]["id"]}, to=sid)
+    if sid in room.players:
+        _emit("room_joined", {"code": code, "playerId": room.players[sid].id}, to=sid)
         return
-    join_room(code)
+    _join_room_channels(code, sid)
     player_id = uuid4().hex
     player_room_index[sid] = code
-    user_id = session.get("user_id")
-    player = {
-        "id": player_id,
-        "name": name,
-        "score": 0,
-        "attempts": 0,
-        "joined_at": time.time(),
-        "user_id": user_id,
-        "is_bot": False,
-    }
-    room["players"][sid] = player
+    room.players[sid] = Player(player_id, name, user_id=user_id)
     _touch_room(room)
-    room["empty_since"] = None
-    emit(
+    room.empty_since = None
+    _emit(
         "room_joined",
         {
             "code": code,
             "playerId": player_id,
             "host": False,
-            "language": room.get("lang", "pt"),
-            "roundsTarget": room.get("rounds_target"),
-            "botDifficulty": room.get("bot_difficulty", DEFAULT_BOT_DIFFICULTY),
+            "language": room.lang,
+            "roundsTarget": room.rounds_target,
+            "botDifficulty": room.bot_difficulty,
         },
         to=sid,
     )
-    socketio.emit(
+    _emit(
         "player_joined",
         {"playerId": player_id, "name": name, "bot": False},
         to=code,
@@ -1157,42 +1167,50 @@ def handle_update_settings(data):
     if not _require_multiplayer_login(sid):
         return
     code = (payload.get("code") or "").strip().upper()
+    _room_call(code, _update_room_settings, code, sid, payload)
+
+
+def _update_room_settings(code: str, sid: str, payload: dict):
     room = multiplayer_rooms.get(code)
-    if not room or sid != room.get("host_sid"):
-        emit("room_error", {"error": "Apenas o criador pode alterar as configura��es."}, to=sid)
+    if not room or sid != room.host_sid:
+        _emit("room_error", {"error": "Apenas o criador pode alterar as configura��es."}, to=sid)
         return
-    if room["status"] != "lobby":
-        emit("room_error", {"error": "N�o Ǹ poss�vel alterar durante a partida."}, to=sid)
+    if room.status != "lobby":
+        _emit("room_error", {"error": "N�o Ǹ poss�vel alterar durante a partida."}, to=sid)
         return
     updated = False
     rounds = payload.get("rounds")
     if rounds in {1, 3, 5, 10, 15}:
-        room["rounds_target"] = rounds
-        room["initial_rounds"] = rounds
+        room.rounds_target = rounds
+        room.initial_rounds = rounds
         updated = True
     lang = payload.get("lang")
     if isinstance(lang, str):
         lang_code = lang.lower()
         if lang_code in {"pt", "en"}:
-            room["lang"] = lang_code
+            room.lang = lang_code
             updated = True
+    time_limit = payload.get("roundTimeLimit")
+    if time_limit in ROUND_TIME_LIMIT_OPTIONS and time_limit != room.round_time_limit:
+        room.round_time_limit = time_limit
+        updated = True
     difficulty = payload.get("difficulty")
     if isinstance(difficulty, str):
-        normalized = _normalize_bot_difficulty(difficulty)
-        if normalized != room.get("bot_difficulty"):
-            room["bot_difficulty"] = normalized
-            bots = room.get("bots") or {}
-            for meta in bots.values():
-                meta["difficulty"] = normalized
+        normalized = normalize_bot_difficulty(difficulty)
+        if normalized != room.bot_difficulty:
+            room.bot_difficulty = normalized
+            for meta in room.bots.values():
+                meta.difficulty = normalized
             updated = True
     if updated:
         _touch_room(room)
-        emit(
+        _emit(
             "settings_updated",
             {
-                "roundsTarget": room["rounds_target"],
-                "language": room["lang"],
-                "botDifficulty": room["bot_difficulty"],
+                "roundsTarget": room.rounds_target,
+                "language": room.lang,
+                "botDifficulty": room.bot_difficulty,
+                "roundTimeLimit": room.round_time_limit,
             },
             to=sid,
         )
@@ -1206,26 +1224,30 @@ def handle_add_bot(data):
     if not _require_multiplayer_login(sid):
         return
     code = (payload.get("code") or "").strip().upper()
+    _room_call(code, _add_bot, code, sid)
+
+
+def _add_bot(code: str, sid: str):
     room = multiplayer_rooms.get(code)
     if not room:
-        emit("room_error", {"error": "Sala não encontrada."}, to=sid)
+        _emit("room_error", {"error": "Sala não encontrada."}, to=sid)
         return
-    if room["status"] != "lobby":
-        emit("room_error", {"error": "Adicione bots apenas no lobby."}, to=sid)
+    if room.status != "lobby":
+        _emit("room_error", {"error": "Adicione bots apenas no lobby."}, to=sid)
         return
-    if sid != room.get("host_sid"):
-        emit("room_error", {"error": "Apenas o criador pode adicionar bots."}, to=sid)
+    if sid != room.host_sid:
+        _emit("room_error", {"error": "Apenas o criador pode adicionar bots."}, to=sid)
         return
-    if len(room["players"]) >= MAX_PLAYERS_PER_ROOM:
-        emit("room_error", {"error": "Sala cheia."}, to=sid)
+    if len(room.players) >= MAX_PLAYERS_PER_ROOM:
+        _emit("room_error", {"error": "Sala cheia."}, to=sid)
         return
     bot_sid, bot_player = _add_bot_player(room)
-    room["empty_since"] = None
+    room.empty_since = None
     _touch_room(room)
-    socketio.emit(
+    _emit(
         "player_joined",
-        {"playerId": bot_player["id"], "name": bot_player["name"], "bot": True},
-        to=room["code"],
+        {"playerId": bot_player.id, "name": bot_player.name, "bot": True},
+        to=room.code,
     )
     _broadcast_room_state(room)
 
@@ -1237,44 +1259,42 @@ def handle_start_game(data):
     if not _require_multiplayer_login(sid):
         return
     code = (payload.get("code") or "").strip().upper()
+    _room_call(code, _start_game, code, sid, payload)
+
+
+def _start_game(code: str, sid: str, payload: dict):
     room = multiplayer_rooms.get(code)
     if not room:
-        emit("room_error", {"error": "Sala n�o encontrada."}, to=sid)
+        _emit("room_error", {"error": "Sala n�o encontrada."}, to=sid)
         return
-    if sid != room.get("host_sid"):
-        emit("room_error", {"error": "Apenas o criador pode iniciar a partida."}, to=sid)
+    if sid != room.host_sid:
+        _emit("room_error", {"error": "Apenas o criador pode iniciar a partida."}, to=sid)
         return
-    if room["status"] == "playing":
-        emit("room_error", {"error": "A partida jǭ estǭ em andamento."}, to=sid)
+    if room.status == "playing":
+        _emit("room_error", {"error": "A partida jǭ estǭ em andamento."}, to=sid)
         return
-    if len(room["players"]) < MIN_PLAYERS_PER_ROOM:
-        emit("room_error", {"error": "S�o necessǭrios pelo menos dois jogadores."}, to=sid)
+    if len(room.players) < MIN_PLAYERS_PER_ROOM:
+        _emit("room_error", {"error": "S�o necessǭrios pelo menos dois jogadores."}, to=sid)
         return
     rounds = payload.get("rounds")
     if rounds in {1, 3, 5, 10, 15}:
-        room["rounds_target"] = rounds
-        room["initial_rounds"] = rounds
-    lang = (payload.get("lang") or room["lang"]).lower()
+        room.rounds_target = rounds
+        room.initial_rounds = rounds
+    lang = (payload.get("lang") or room.lang).lower()
     if lang in {"pt", "en"}:
-        room["lang"] = lang
-    room["status"] = "playing"
-    room["round_index"] = 0
-    room["rounds_completed"] = 0
-    room["standard_rounds_completed"] = 0
-    room["tiebreaker_active"] = False
-    room["current_round_tiebreaker"] = False
-    room["match_history"] = []
-    room["stats_recorded"] = False
-    for player in room["players"].values():
-        player["score"] = 0
-        player["attempts"] = 0
-    room["empty_since"] = None
+        room.lang = lang
+    time_limit = payload.get("roundTimeLimit")
+    if time_limit in ROUND_TIME_LIMIT_OPTIONS:
+        room.round_time_limit = time_limit
+    room.reset_match()
+    room.status = "playing"
+    room.empty_since = None
     _touch_room(room)
-    socketio.emit(
+    _emit(
         "match_started",
         {
-            "roundsTarget": room["rounds_target"],
-            "language": room["lang"],
+            "roundsTarget": room.rounds_target,
+            "language": room.lang,
         },
         to=code,
     )
@@ -1290,27 +1310,31 @@ def handle_submit_guess(data):
         return
     code = (payload.get('code') or '').strip().upper()
     guess = (payload.get('guess') or '').strip().lower()
+    _room_call(code, _submit_guess, code, sid, guess)
+
+
+def _submit_guess(code: str, sid: str, guess: str):
     room = multiplayer_rooms.get(code)
-    if not room or sid not in room['players']:
-        emit('guess_error', {'error': 'Sala ou jogador inválido.'}, to=sid)
+    if not room or sid not in room.players:
+        _emit('guess_error', {'error': 'Sala ou jogador inválido.'}, to=sid)
         return
-    if room['status'] != 'playing' or not room.get('current_word'):
-        emit('guess_error', {'error': 'A rodada ainda não está ativa.'}, to=sid)
+    if room.status != 'playing' or not room.current_word:
+        _emit('guess_error', {'error': 'A rodada ainda não está ativa.'}, to=sid)
         return
-    if room.get('round_complete'):
-        emit('guess_error', {'error': 'Aguardando próxima rodada.'}, to=sid)
+    if room.round_complete:
+        _emit('guess_error', {'error': 'Aguardando próxima rodada.'}, to=sid)
         return
     if len(guess) != 5 or not guess.isalpha():
-        emit('guess_error', {'error': 'Informe uma palavra de 5 letras.'}, to=sid)
+        _emit('guess_error', {'error': 'Informe uma palavra de 5 letras.'}, to=sid)
         return
-    lang = room.get('lang', 'pt')
+    lang = room.lang
     if not _word_exists_in_lang(guess, lang):
-        emit('guess_error', {'error': 'Palavra não reconhecida na lista selecionada.'}, to=sid)
+        _emit('guess_error', {'error': 'Palavra não reconhecida na lista selecionada.'}, to=sid)
         return
     _touch_room(room)
     success, result = _execute_guess(room, sid, guess, result_target=sid)
     if not success:
-        emit('guess_error', {'error': result}, to=sid)
+        _emit('guess_error', {'error': result}, to=sid)
 
 
 @socketio.on("leave_room")
@@ -1321,8 +1345,23 @@ def handle_leave_room_event(data):
     if not code:
         code = player_room_index.get(request.sid)
     if code:
-        _remove_player_from_room(code, request.sid)
-    emit("left_room", {"code": code}, to=request.sid)
+        _room_call(code, _remove_player_from_room, code, request.sid)
+    _emit("left_room", {"code": code}, to=request.sid)
+
+
+@socketio.on("request_room_state")
+def handle_request_room_state(data=None):
+    sid = request.sid
+    code = player_room_index.get(sid)
+    _room_call(code, _resend_room_state, code, sid)
+
+
+def _resend_room_state(code: str, sid: str):
+    room = multiplayer_rooms.get(code)
+    if not room or sid not in room.players:
+        _emit("room_error", {"error": "Sala não encontrada."}, to=sid)
+        return
+    _send_room_state(room, sid)
 
 
 @socketio.on("play_again")
@@ -1332,61 +1371,114 @@ def handle_play_again(data):
     if not _require_multiplayer_login(sid):
         return
     code = (payload.get("code") or "").strip().upper()
+    _room_call(code, _play_again, code, sid, payload)
+
+
+def _play_again(code: str, sid: str, payload: dict):
     room = multiplayer_rooms.get(code)
     if not room:
-        emit("room_error", {"error": "Sala n�o encontrada."}, to=sid)
+        _emit("room_error", {"error": "Sala n�o encontrada."}, to=sid)
         return
-    if sid != room.get("host_sid"):
-        emit("room_error", {"error": "Apenas o criador pode reiniciar."}, to=sid)
+    if sid != room.host_sid:
+        _emit("room_error", {"error": "Apenas o criador pode reiniciar."}, to=sid)
         return
-    if room["status"] != "finished":
-        emit("room_error", {"error": "A partida ainda n�o terminou."}, to=sid)
+    if room.status != "finished":
+        _emit("room_error", {"error": "A partida ainda n�o terminou."}, to=sid)
         return
     rounds = payload.get("rounds")
     if rounds in {1, 3, 5, 10, 15}:
-        room["rounds_target"] = rounds
-        room["initial_rounds"] = rounds
+        room.rounds_target = rounds
+        room.initial_rounds = rounds
     _touch_room(room)
     _clear_all_bots(room)
-    room["bots"] = room.get("bots") or {}
-    room["empty_since"] = None
-    room["status"] = "lobby"
-    room["round_index"] = 0
-    room["rounds_completed"] = 0
-    room["standard_rounds_completed"] = 0
-    room["tiebreaker_active"] = False
-    room["current_round_tiebreaker"] = False
-    room["current_word"] = None
-    room["round_complete"] = True
-    room["round_draw"] = False
-    room["match_history"] = []
-    room["stats_recorded"] = False
-    for player in room["players"].values():
-        player["score"] = 0
-        player["attempts"] = 0
-    socketio.emit(
+    room.reset_match()
+    room.empty_since = None
+    room.status = "lobby"
+    _emit(
         "match_reset",
         {
-            "roundsTarget": room["rounds_target"],
-            "language": room["lang"],
+            "roundsTarget": room.rounds_target,
+            "language": room.lang,
         },
         to=code,
     )
     _broadcast_room_state(room)
 
 
+# Comandos que um processo encaminha ao dono da sala (ver room_registry.py)
+_ROUTED_COMMANDS = {
+    command.__name__: command
+    for command in (
+        _join_room,
+        _update_room_settings,
+        _add_bot,
+        _start_game,
+        _submit_guess,
+        _remove_player_from_room,
+        _resend_room_state,
+        _play_again,
+    )
+}
+
+
+def _forward_room_command(owner: str, code: str, command, args: tuple):
+    # Todo comando roteado recebe (code, sid, ...); o dono precisa do protocolo do cliente
+    room_registry.forward(
+        owner,
+        {"command": command.__name__, "code": code, "args": list(args), "protocol": _client_protocol(args[1])},
+    )
+
+
+def _handle_forwarded_command(message: dict):
+    command = _ROUTED_COMMANDS.get(message.get("command"))
+    code = message.get("code")
+    if command is None or code not in multiplayer_rooms:
+        return
+    args = message.get("args") or []
+    sid = args[1]
+    protocol = message.get("protocol", PROTOCOL_LEGACY)
+    if protocol != PROTOCOL_LEGACY:
+        client_protocols[sid] = protocol
+    actor = room_actors.get(code)
+    actor.post(command, *args)
+    if command is _remove_player_from_room:
+        actor.post(client_protocols.pop, sid, None)
+
+
+if room_registry.shared:
+    socketio.start_background_task(room_registry.listen, _handle_forwarded_command)
+
+
+@socketio.on("connect")
+def handle_connect(auth=None):
+    requested = auth.get("protocol") if isinstance(auth, dict) else None
+    if requested is None:
+        requested = request.args.get("protocol")
+    protocol = negotiate_protocol(requested)
+    if protocol != PROTOCOL_LEGACY:
+        client_protocols[request.sid] = protocol
+        emit("protocol", {"version": protocol}, to=request.sid)
+    batch = auth.get("batch") if isinstance(auth, dict) else request.args.get("batch")
+    if batch and str(batch).lower() not in {"0", "false", "no"}:
+        emit_batcher.enable(request.sid)
+
+
 @socketio.on("disconnect")
 def handle_disconnect():
     sid = request.sid
     code = player_room_index.get(sid)
     if code:
-        _remove_player_from_room(code, sid, notify=True)
+        _room_call(code, _remove_player_from_room, code, sid)
+    client_protocols.pop(sid, None)
+    emit_batcher.forget(sid)
 
 
 @app.post("/api/new-game")
 def new_game():
     data = request.get_json(silent=True) or {}
     lang = (data.get("lang") or 'pt').lower()
+    if lang not in {"pt", "en"}:
+        return jsonify({"error": "Idioma inválido. Use 'pt' ou 'en'."}), 400
     mode = (data.get("mode") or 'single').lower()
     word_count = int(data.get("wordCount") or (1 if mode == 'single' else 2))
     # default attempts: 6 for single, 7 for multi
@@ -1394,113 +1486,107 @@ def new_game():
     stats_mode = _resolve_stats_mode(mode, word_count)
     user_id = session.get("user_id")
 
-    game_id = uuid4().hex
-
-    if word_count == 1:
-        # Keep existing Termo behavior for backward compatibility
-        word = get_random_word(lang)
-        game = Termo(word)
-        game.max_attempts = max_attempts
-        meta = _game_meta(game)
-        meta.update(
-            {
-                "mode": stats_mode,
-                "user_id": user_id,
-                "stats_recorded": False,
-            }
-        )
-        games[game_id] = game
-        return jsonify({
-            "gameId": game_id,
-            "maxAttempts": game.max_attempts,
-            "lang": lang,
-            "wordCount": 1,
-            "maskedWords": ["-----"],
-        })
-
-    # Multi-word game stored as a dict to avoid changing Termo
-    words = [get_random_word(lang) for _ in range(word_count)]
-    games[game_id] = {
-        "type": "multi",
-        "lang": lang,
-        "words": words,  # list of lowercase strings
-        "attempts": 0,
-        "max_attempts": max_attempts,
-        "won_mask": [False] * word_count,
-        "startedAt": None,
-        "meta": {
-            "mode": stats_mode,
-            "user_id": user_id,
-            "stats_recorded": False,
-        },
-    }
-    return jsonify({
+    stateless = bool(data.get("stateless"))
+    if stateless and game_tokens is None:
+        return jsonify({"error": "Jogos sem estado indisponíveis neste servidor."}), 400
+    game_id = new_token_game_id() if stateless else uuid4().hex
+
+    lexicon = get_lexicon(lang)
+    words = [lexicon.random_answer() for _ in range(word_count)]
+    game = GameRecord(lang, words, max_attempts, mode=stats_mode, user_id=user_id)
+    response = {
         "gameId": game_id,
         "wordCount": word_count,
         "maxAttempts": max_attempts,
         "maskedWords": ["-----" for _ in range(word_count)],
         "lang": lang,
-    })
+    }
+    if stateless:
+        try:
+            response["gameToken"] = game_tokens.encode(game_id, game)
+        except GameTokenError as exc:
+            return jsonify({"error": str(exc)}), 400
+    else:
+        games.add(game_id, game)
+    return jsonify(response)
 
 @app.post("/api/guess")
 def make_guess():
     data = request.get_json(silent=True) or {}
     game_id = data.get("gameId")
     guess = (data.get("guess") or "").strip().lower()
-    if not game_id or game_id not in games:
+    protocol = negotiate_protocol(data.get("protocol") or request.headers.get(PROTOCOL_HEADER))
+    game_token = data.get("gameToken")
+    if game_token and game_tokens is None:
+        return jsonify({"error": "Jogos sem estado indisponíveis neste servidor."}), 400
+    try:
+        if game_token:
+            game_id, game = game_tokens.decode(str(game_token))
+            token_ledger.check(game_id, game)
+        else:
+            game = games.get(game_id) if game_id else None
+    except GameTokenReused:
+        return jsonify({"error": "Token de jogo já utilizado."}), 409
+    except GameTokenError:
+        return jsonify({"error": "Token de jogo inválido."}), 400
+    except GameExpired:
+        return jsonify({"error": "Jogo expirado. Inicie uma nova partida.", "expired": True}), 410
+    if game is None:
         return jsonify({"error": "Jogo não encontrado"}), 404
-    game = games[game_id]
-
-    # Multi-word game path
-    if isinstance(game, dict) and game.get("type") == "multi":
-        if len(guess) != 5 or not guess.isalpha():
-            return jsonify({"error": "Palpite inválido. Informe 5 letras."}), 400
-        if game["attempts"] >= game["max_attempts"]:
-            return jsonify({"error": "Sem tentativas restantes."}), 400
-
-        feedback_list = []
-        won_all = True
-        for idx, word in enumerate(game["words"]):
-            fb = _check_guess_statuses_for_word(word, guess)
-            feedback_list.append(fb)
-            # Determine if this word is solved (all greens)
-            solved = all(item["status"] == 'green' for item in fb)
-            if solved:
-                game["won_mask"][idx] = True
-            if not game["won_mask"][idx]:
-                won_all = False
-
-        game["attempts"] += 1
-        game_over = game["attempts"] >= game["max_attempts"] or won_all
-        response = {
-            "feedback": feedback_list,
-            "attempts": game["attempts"],
-            "maxAttempts": game["max_attempts"],
-            "won": won_all,
-            "gameOver": game_over,
-        }
-        response["gameId"] = game_id
-        if game_over:
-            _record_singleplayer_stats_if_needed(game, won_all)
-        return jsonify(response)
 
-    # Single game path (Termo)
-    if not game.is_valid_guess(guess):
+    if len(guess) != 5 or not guess.isalpha():
         return jsonify({"error": "Palpite inválido. Informe 5 letras."}), 400
-    feedback = game.check_guess_statuses(guess)
-    won = game.is_winner()
-    game_over = game.is_game_over()
-    response = {
-        "feedback": feedback,
-        "attempts": game.attempts,
-        "maxAttempts": game.max_attempts,
-        "won": won,
-        "gameOver": game_over,
-    }
-    response["gameId"] = game_id
-    if game_over:
-        _record_singleplayer_stats_if_needed(game, won)
-    return jsonify(response)
+    if game.attempts >= game.max_attempts:
+        return jsonify({"error": "Sem tentativas restantes."}), 400
+    if game_token:
+        try:
+            token_ledger.consume(game_id, game.attempts)
+        except GameTokenReused:
+            return jsonify({"error": "Token de jogo já utilizado."}), 409
+
+    codes = score_batch(guess, game.words, game.lang)
+    game.register_guess(codes, ALL_GREEN)
+    won = game.won
+    game_over = game.game_over
+    # Um jogo por token só é contabilizado na primeira vez que termina
+    if game_over and (not game_token or token_ledger.finish(game_id)):
+        _record_singleplayer_stats_if_needed(game, stateless=bool(game_token))
+    next_token = game_tokens.encode(game_id, game) if game_token else None
+    if protocol >= PROTOCOL_COMPACT:
+        payload = compact_api_guess(game_id, codes, game.attempts, game.max_attempts, won, game_over)
+        if next_token:
+            payload["t"] = next_token
+        return jsonify(payload)
+    # Jogo de uma palavra mantém o formato antigo (lista simples de letras)
+    if game.word_count == 1:
+        feedback = feedback_items(guess, codes[0])
+    else:
+        feedback = [feedback_items(guess, code) for code in codes]
+    response = {
+        "feedback": feedback,
+        "attempts": game.attempts,
+        "maxAttempts": game.max_attempts,
+        "won": won,
+        "gameOver": game_over,
+    }
+    response["gameId"] = game_id
+    if next_token:
+        response["gameToken"] = next_token
+    return jsonify(response)
+
+@app.get("/api/metrics")
+def metrics():
+    return jsonify({
+        "games": games.metrics(),
+        "gameTokens": token_ledger.metrics(),
+        "scheduler": scheduler.metrics(),
+        "botPool": bot_pool.metrics() if bot_pool is not None else None,
+        "openingBook": get_opening_book().metrics(),
+        "emitBatcher": emit_batcher.metrics(),
+        "roomActors": room_actors.metrics(),
+        "roomRegistry": room_registry.metrics(),
+        "roomGc": {**room_expiry.metrics(), "evicted": dict(room_evictions)},
+    })
 
 @app.get("/api/check-word")
 def check_word():
@@ -1510,16 +1596,31 @@ def check_word():
     if len(word) != 5:
         return jsonify({"exists": False, "error": "Palavra deve ter 5 letras"})
     
-    if lang == "pt":
-        exists = word in portuguese_words
-        return jsonify({"exists": exists})
-    elif lang == "en":
-        exists = word in english_words
+    if lang in {"pt", "en"}:
+        exists = word in get_lexicon(lang)
         return jsonify({"exists": exists})
     else:
         # Para outros idiomas, assumir que todas as palavras de 5 letras são válidas
         return jsonify({"exists": True})
 
+@app.post("/api/check-words")
+def check_words():
+    data = request.get_json(silent=True) or {}
+    words = data.get("words")
+    lang = str(data.get("lang") or "pt").lower()
+    protocol = negotiate_protocol(data.get("protocol") or request.headers.get(PROTOCOL_HEADER))
+    if not isinstance(words, list):
+        return jsonify({"error": "Envie uma lista de palavras em 'words'."}), 400
+    if len(words) > MAX_CHECK_WORDS:
+        return jsonify({"error": f"Máximo de {MAX_CHECK_WORDS} palavras por requisição."}), 400
+    results = []
+    for word in words:
+        normalized = word.strip().lower() if isinstance(word, str) else ""
+        results.append(len(normalized) == 5 and _word_exists_in_lang(normalized, lang))
+    if protocol >= PROTOCOL_COMPACT:
+        return jsonify(compact_word_checks(results))
+    return jsonify({"exists": results})
+
 # Rota para o front-end
 @app.route("/")
 def index():
@@ -1534,6 +1635,30 @@ def index_modes():
     # Serve the same SPA for mode-specific paths so direct navigation works
     return app.send_static_file("index.html")
 
+@app.route("/data/<path:filename>")
+def word_list_file(filename):
+    """Serve client word lists, preferring a precompressed variant."""
+    if not filename.endswith(".json") or safe_join(str(WORD_LIST_DIR), filename) is None:
+        abort(404)
+    served, encoding = filename, None
+    for candidate, suffix in ENCODINGS:
+        if candidate in request.accept_encodings and (WORD_LIST_DIR / f"{filename}{suffix}").is_file():
+            served, encoding = f"{filename}{suffix}", candidate
+            break
+    response = send_from_directory(WORD_LIST_DIR, served, mimetype="application/json")
+    response.vary.add("Accept-Encoding")
+    if encoding:
+        response.content_encoding = encoding
+    if is_hashed_name(filename):
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        # Manifesto e listas antigas: revalidar sempre via ETag
+        response.cache_control.no_cache = True
+    return response
+
 @app.route("/multiplayer")
 def multiplayer_page():
     if not session.get("user_id"):
@@ -0,0 +1,73 @@
+"""Helpers for word-id sets stored as Python ints (bit ``i`` = word id ``i``).
+
+Python ints give arbitrary-width AND/OR/ANDNOT and popcount in C, which
+makes them a compact bitset over a few thousand lexicon ids.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Dict, Iterable, List
+
+_CODE_TABLES: Dict[int, bytes] = {}
+
+
+def full_mask(size: int) -> int:
+    """Bitset with ids ``0 .. size - 1`` set."""
+    return (1 << size) - 1
+
+
+def popcount(mask: int) -> int:
+    return mask.bit_count()
+
+
+def from_ids(ids: Iterable[int]) -> int:
+    buffer = bytearray()
+    for word_id in ids:
+        byte = word_id >> 3
+        if byte >= len(buffer):
+            buffer.extend(bytes(byte + 1 - len(buffer)))
+        buffer[byte] |= 1 << (word_id & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def mask_of_code(codes: bytes, code: int) -> int:
+    """Bitset of the positions of ``codes`` holding ``code``.
+
+    Meant for feedback-matrix rows: ``translate`` maps the row to ASCII
+    '0'/'1' in C and ``int(..., 2)`` parses it, with no per-id Python loop.
+    """
+    table = _CODE_TABLES.get(code)
+    if table is None:
+        table = bytearray(b"0" * 256)
+        table[code] = ord("1")
+        table = _CODE_TABLES[code] = bytes(table)
+    bits = codes.translate(table)[::-1]
+    return int(bits, 2) if bits else 0
+
+
+def ids_of(mask: int) -> List[int]:
+    """Set ids in ascending order."""
+    if not mask:
+        return []
+    bits = format(mask, "b")[::-1]
+    ids = []
+    find = bits.find
+    index = find("1")
+    while index >= 0:
+        ids.append(index)
+        index = find("1", index + 1)
+    return ids
+
+
+def nth_id(mask: int, n: int) -> int:
+    """The ``n``-th set id (0-based) in ascending order."""
+    return ids_of(mask)[n]
+
+
+def random_id(mask: int, rng=random) -> int:
+    """Uniformly chosen set id of a non-empty ``mask``."""
+    return nth_id(mask, rng.randrange(mask.bit_count()))
+
+
+__all__ = ["full_mask", "popcount", "from_ids", "mask_of_code", "ids_of", "nth_id", "random_id"]
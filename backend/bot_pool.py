@@ -0,0 +1,150 @@
+"""Optional worker processes for bot decisions.
+
+Bot guesses are chosen by :func:`bots.decide`, a pure function of a
+:class:`bots.DecisionRequest`. With ``BOT_PROCESS_WORKERS`` > 0 the server
+hands requests to that many ``bot_worker.py`` processes instead of running
+them on the Socket.IO hub, so bot CPU spreads over cores. Requests and
+results are pickled frames over the workers' stdin/stdout; under eventlet
+the pipes are cooperative, and a reader task per worker resolves the
+returned futures. Callers take the result from a done callback, keep
+their own deadline, and fall back to deciding in-process (cancelling the
+future) when a worker is slow or gone.
+"""
+
+from __future__ import annotations
+
+import itertools
+import pickle
+import struct
+import subprocess
+import sys
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+WORKER_SCRIPT = Path(__file__).resolve().parent / "bot_worker.py"
+DEFAULT_TIMEOUT = 0.25  # segundos
+
+_FRAME = struct.Struct("<I")
+
+
+def write_frame(stream, payload) -> None:
+    data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+    stream.write(_FRAME.pack(len(data)) + data)
+    stream.flush()
+
+
+def read_frame(stream):
+    """Next pickled frame from ``stream``; ``None`` at end of stream."""
+    header = stream.read(_FRAME.size)
+    if len(header) < _FRAME.size:
+        return None
+    (size,) = _FRAME.unpack(header)
+    data = stream.read(size)
+    if len(data) < size:
+        return None
+    return pickle.loads(data)
+
+
+class _Worker:
+    __slots__ = ("process", "pending")
+
+    def __init__(self, process: subprocess.Popen):
+        self.process = process
+        self.pending: Dict[int, Future] = {}
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+
+class BotDecisionPool:
+    """Round-robin pool of ``bot_worker.py`` processes."""
+
+    def __init__(self, workers: int, spawn: Callable, timeout: float = DEFAULT_TIMEOUT):
+        self.size = max(1, int(workers))
+        self.timeout = float(timeout)
+        self._spawn = spawn
+        self._workers: List[Optional[_Worker]] = [None] * self.size
+        self._turn = itertools.cycle(range(self.size))
+        self._ids = itertools.count()
+        self._counters = {"submitted": 0, "completed": 0, "timeouts": 0, "errors": 0, "restarts": 0}
+
+    def _start_worker(self, index: int) -> _Worker:
+        process = subprocess.Popen(
+            [sys.executable, str(WORKER_SCRIPT)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        worker = _Worker(process)
+        self._workers[index] = worker
+        self._spawn(self._read_results, worker)
+        return worker
+
+    def start(self) -> None:
+        """Launch every worker now so the lexicon load happens before play."""
+        for index, worker in enumerate(self._workers):
+            if worker is None:
+                self._start_worker(index)
+
+    def _worker(self) -> _Worker:
+        index = next(self._turn)
+        worker = self._workers[index]
+        if worker is None or not worker.alive:
+            if worker is not None:
+                self._counters["restarts"] += 1
+            worker = self._start_worker(index)
+        return worker
+
+    def submit(self, request) -> Future:
+        future: Future = Future()
+        request_id = next(self._ids)
+        self._counters["submitted"] += 1
+        try:
+            worker = self._worker()
+            worker.pending[request_id] = future
+            write_frame(worker.process.stdin, (request_id, request))
+        except (OSError, ValueError) as exc:
+            self._counters["errors"] += 1
+            future.set_exception(exc)
+        return future
+
+    def _read_results(self, worker: _Worker) -> None:
+        stream = worker.process.stdout
+        while True:
+            try:
+                frame = read_frame(stream)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                frame = None
+            if frame is None:
+                break
+            request_id, ok, value = frame
+            future = worker.pending.pop(request_id, None)
+            if future is None or future.done():
+                continue
+            if ok:
+                self._counters["completed"] += 1
+                future.set_result(value)
+            else:
+                self._counters["errors"] += 1
+                future.set_exception(RuntimeError(value))
+        for future in worker.pending.values():
+            if not future.done():
+                future.set_exception(RuntimeError("bot worker encerrado"))
+        worker.pending.clear()
+
+    def note_timeout(self) -> None:
+        self._counters["timeouts"] += 1
+
+    def close(self) -> None:
+        for worker in self._workers:
+            if worker is not None and worker.alive:
+                worker.process.stdin.close()
+                worker.process.terminate()
+
+    def metrics(self) -> dict:
+        alive = sum(1 for worker in self._workers if worker is not None and worker.alive)
+        return {"workers": self.size, "alive": alive, "timeoutSeconds": self.timeout, **self._counters}
+
+
+__all__ = ["BotDecisionPool", "DEFAULT_TIMEOUT", "read_frame", "write_frame"]
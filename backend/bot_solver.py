@@ -0,0 +1,171 @@
+"""Entropy-maximizing guess selection for the "expert" bot tier.
+
+A guess is scored by the expected information (in bits) its feedback gives
+about the remaining candidates: the candidates are bucketed by the pattern
+code the guess would produce against each of them (one row of the feedback
+matrix gathered at the candidate ids, counted in C by ``Counter``) and the
+entropy of the bucket sizes is the score. Candidates get a small bonus since
+they can also win outright.
+
+Scoring every guess is too slow for the opening move, so the best openers of
+each language are precomputed by ``scripts/build_openers.py`` into
+``data/openers.json``; they also serve as strong probe words later on. Each
+decision runs under a time budget so many bots can share the eventlet hub:
+large candidate sets are scored on an evenly spaced sample of at most
+``MAX_SCORED_CANDIDATES`` ids, so one evaluation stays cheap, and the search
+stops before an evaluation would cross the deadline.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import time
+from collections import Counter
+from itertools import chain, zip_longest
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from lexicon import DATA_DIR, Lexicon, get_lexicon
+from scoring import score_batch
+
+OPENERS_FILE = DATA_DIR / "openers.json"
+OPENER_COUNT = 64
+DEFAULT_BUDGET = 0.004  # segundos por decisão
+MIN_EVALUATED = 8
+MAX_SCORED_CANDIDATES = 256
+
+_SOLVERS: Dict[str, "EntropySolver"] = {}
+_MISSING = object()
+
+
+def information_bits(codes: Iterable[int], total: int) -> float:
+    """Entropy of the pattern buckets formed by ``codes`` (``total`` items)."""
+    if total <= 1:
+        return 0.0
+    spread = sum(count * math.log2(count) for count in Counter(codes).values())
+    return math.log2(total) - spread / total
+
+
+def rank_openers(lexicon: Lexicon, count: int = OPENER_COUNT) -> List[Tuple[str, float]]:
+    """Best first guesses by information over the whole pool (needs a matrix)."""
+    if lexicon.matrix is None:
+        raise RuntimeError(f"Matriz de feedback ({lexicon.lang}) indisponível.")
+    pool_size = lexicon.pool_size
+    scored = []
+    for guess_id in range(len(lexicon)):
+        bits = information_bits(lexicon.row(guess_id), pool_size)
+        if guess_id < pool_size:
+            bits += 1.0 / pool_size
+        scored.append((bits, guess_id))
+    scored.sort(reverse=True)
+    return [(lexicon.word(guess_id), round(bits, 4)) for bits, guess_id in scored[:count]]
+
+
+def load_openers(path: Path = OPENERS_FILE) -> Dict[str, List[str]]:
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {lang: [word for word, _bits in entries] for lang, entries in data.items()}
+
+
+class EntropySolver:
+    """Chooses guesses for one language by expected information gain."""
+
+    def __init__(
+        self,
+        lexicon: Lexicon,
+        openers: Sequence[str] = (),
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.lexicon = lexicon
+        ids = (lexicon.id_of(word) for word in openers)
+        self.probes: Tuple[int, ...] = tuple(word_id for word_id in ids if word_id is not None)
+        self._clock = clock
+
+    def _scorer(self, candidate_ids: Sequence[int]) -> Callable[[int], float]:
+        total = len(candidate_ids)
+        lexicon = self.lexicon
+        if lexicon.matrix is not None:
+            row_at = lexicon.matrix.row_at
+            if total == lexicon.pool_size:
+                return lambda guess_id: information_bits(row_at(guess_id), total)
+            gather = itemgetter(*candidate_ids)
+            return lambda guess_id: information_bits(gather(row_at(guess_id)), total)
+        words = [lexicon.word(word_id) for word_id in candidate_ids]
+        return lambda guess_id: information_bits(score_batch(lexicon.word(guess_id), words), total)
+
+    def choose(
+        self,
+        candidate_ids: Sequence[int],
+        *,
+        exclude: Iterable[int] = (),
+        budget: float = DEFAULT_BUDGET,
+        sample_limit: Optional[int] = MAX_SCORED_CANDIDATES,
+    ) -> Optional[int]:
+        """Best guess id for ``candidate_ids`` (pool ids, ascending).
+
+        ``budget`` covers the whole call; ``sample_limit=None`` scores
+        against every candidate (offline precomputation).
+        """
+        deadline = self._clock() + budget
+        excluded = set(exclude)
+        remaining = [word_id for word_id in candidate_ids if word_id not in excluded]
+        if len(candidate_ids) <= 2 or not remaining:
+            return remaining[0] if remaining else None
+        if len(candidate_ids) == self.lexicon.pool_size:
+            for word_id in self.probes:
+                if word_id not in excluded:
+                    return word_id
+        scored_ids = candidate_ids
+        if sample_limit and len(candidate_ids) > sample_limit:
+            stride = -(-len(candidate_ids) // sample_limit)
+            scored_ids = candidate_ids[::stride]
+        score = self._scorer(scored_ids)
+        candidate_set = set(candidate_ids)
+        bonus = 1.0 / len(candidate_ids)
+        best_id, best_score = remaining[0], -1.0
+        evaluated = 0
+        started = self._clock()
+        # Alterna candidatas e palavras-sonda para que ambas sejam avaliadas
+        order = chain.from_iterable(zip_longest(remaining, self.probes, fillvalue=_MISSING))
+        seen = set()
+        for guess_id in order:
+            if guess_id is _MISSING or guess_id in excluded or guess_id in seen:
+                continue
+            seen.add(guess_id)
+            value = score(guess_id)
+            if guess_id in candidate_set:
+                value += bonus
+            if value > best_score:
+                best_id, best_score = guess_id, value
+            evaluated += 1
+            if evaluated >= MIN_EVALUATED:
+                now = self._clock()
+                # Para antes de uma avaliação (custo médio até aqui) que estouraria o prazo
+                if now + (now - started) / evaluated >= deadline:
+                    break
+        return best_id
+
+
+def solver_for(lang: Optional[str]) -> EntropySolver:
+    """Process-wide solver for ``lang`` (built on first use)."""
+    lexicon = get_lexicon(lang)
+    solver = _SOLVERS.get(lexicon.lang)
+    if solver is None:
+        solver = EntropySolver(lexicon, load_openers().get(lexicon.lang, ()))
+        _SOLVERS[lexicon.lang] = solver
+    return solver
+
+
+__all__ = [
+    "EntropySolver",
+    "MAX_SCORED_CANDIDATES",
+    "OPENERS_FILE",
+    "information_bits",
+    "load_openers",
+    "rank_openers",
+    "solver_for",
+]
@@ -0,0 +1,41 @@
+"""Worker process answering bot decision requests (see bot_pool.py).
+
+Reads ``(request_id, DecisionRequest)`` frames from stdin and writes
+``(request_id, ok, Decision | error message)`` frames to stdout. Lexicons,
+matrices and solvers are loaded once at startup; the mmap-ed files are
+shared with the server process through the page cache.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+from bot_pool import read_frame, write_frame
+from bot_solver import solver_for
+from bots import decide
+from lexicon import DICTIONARY_FILES, get_lexicon
+
+
+def main() -> int:
+    # stdout é o canal de respostas; prints de carga vão para stderr
+    out = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    sys.stdout = sys.stderr
+    requests = sys.stdin.buffer
+    for lang in DICTIONARY_FILES:
+        get_lexicon(lang).letter_index
+        solver_for(lang)
+    while True:
+        frame = read_frame(requests)
+        if frame is None:
+            return 0
+        request_id, request = frame
+        try:
+            result = (request_id, True, decide(request))
+        except Exception as exc:  # noqa: BLE001 - o servidor cai no fallback local
+            result = (request_id, False, f"{type(exc).__name__}: {exc}")
+        write_frame(out, result)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
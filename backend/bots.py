@@ -0,0 +1,336 @@
+"""Bot decision logic, free of rooms, sockets and timers.
+
+Everything a bot needs to pick a guess travels in a :class:`DecisionRequest`
+(language, difficulty, attempt number, candidate/used bitsets, letter
+constraints, persona numbers and an RNG seed), and :func:`decide` is a pure
+function of it. The server calls it in-process or ships the request to a
+worker process (see bot_pool.py); the simulation harness calls it directly.
+Candidate and used sets are bitsets over lexicon ids (see bitsets.py).
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import NamedTuple, Optional, Tuple
+
+from bitsets import from_ids, ids_of, mask_of_code, random_id
+from bot_solver import DEFAULT_BUDGET, solver_for
+from constraints import LetterConstraints
+from lexicon import get_lexicon
+from opening_book import HEURISTIC_TIER, History, OpeningBook, get_opening_book
+from scoring import ALL_GREEN, feedback_items, pattern_from_statuses, score_batch
+
+DEFAULT_BOT_DIFFICULTY = "medium"
+DEFAULT_BOOK_DEPTH = 2  # abertura + resposta a cada primeiro feedback
+PRECOMPUTE_BUDGET = 0.25  # segundos por jogada pré-calculada
+# Parte de "decision_budget" reservada ao refine_candidates que segue cada palpite
+REFINE_BUDGET_SHARE = 0.25
+BOT_DIFFICULTY_PRESETS = {
+    "easy": {
+        "delay_range": (3.8, 7.2),
+        "smart_pick_chance": 0.55,
+        "wild_guess_chance": 0.22,
+        "late_focus_step": 0.12,
+        "min_win_attempts_range": (4, 6),
+        "base_confidence": 0.35,
+        "confidence_growth": 0.12,
+        "confidence_jitter": 0.18,
+        "hesitation_bias": 0.7,
+        "mistake_chance": 0.28,
+    },
+    "medium": {
+        "delay_range": (3.4, 5.4),
+        "smart_pick_chance": 0.7,
+        "wild_guess_chance": 0.12,
+        "late_focus_step": 0.18,
+        "min_win_attempts_range": (3, 5),
+        "base_confidence": 0.45,
+        "confidence_growth": 0.15,
+        "confidence_jitter": 0.12,
+        "hesitation_bias": 0.5,
+        "mistake_chance": 0.18,
+    },
+    "hard": {
+        "delay_range": (3.0, 4.4),
+        "smart_pick_chance": 0.9,
+        "wild_guess_chance": 0.05,
+        "late_focus_step": 0.20,
+        "min_win_attempts_range": (2, 4),
+        "base_confidence": 0.55,
+        "confidence_growth": 0.18,
+        "confidence_jitter": 0.08,
+        "hesitation_bias": 0.35,
+        "mistake_chance": 0.10,
+    },
+    # Sem aleatoriedade: maximiza a informação esperada de cada palpite (bot_solver.py)
+    "expert": {
+        "delay_range": (2.6, 4.0),
+        "solver": "entropy",
+        "decision_budget": 0.004,
+        "smart_pick_chance": 1.0,
+        "wild_guess_chance": 0.0,
+        "late_focus_step": 0.0,
+        "min_win_attempts_range": (0, 0),
+        "base_confidence": 0.98,
+        "confidence_growth": 0.0,
+        "confidence_jitter": 0.0,
+        "hesitation_bias": 0.0,
+        "mistake_chance": 0.0,
+    },
+}
+
+
+class DecisionRequest(NamedTuple):
+    """Snapshot of one bot's state, enough to choose its next guess."""
+
+    lang: str
+    difficulty: str
+    attempts: int
+    candidates: int
+    used: int
+    constraints: LetterConstraints
+    min_confident_attempts: int
+    confidence_bias: float
+    mistake_chance: float
+    seed: int
+    history: Optional[History] = ()  # (guess_id, código) da rodada; None se desconhecido
+
+
+class Decision(NamedTuple):
+    guess_id: int
+    used: int  # bitset de usados já incluindo o palpite
+
+
+def normalize_bot_difficulty(value: Optional[str]) -> str:
+    if not value:
+        return DEFAULT_BOT_DIFFICULTY
+    normalized = value.lower()
+    if normalized in BOT_DIFFICULTY_PRESETS:
+        return normalized
+    return DEFAULT_BOT_DIFFICULTY
+
+
+def preset_for(difficulty: Optional[str]) -> dict:
+    return BOT_DIFFICULTY_PRESETS[normalize_bot_difficulty(difficulty)]
+
+
+def tier_for(preset: dict) -> str:
+    """Opening-book tier: the preset's solver, or the shared heuristic tier."""
+    return preset.get("solver") or HEURISTIC_TIER
+
+
+def roll_persona(preset: dict, rng=random) -> Tuple[int, float, float]:
+    """Per-round ``(min_confident_attempts, confidence_bias, mistake_chance)``."""
+    attempts_range = preset.get("min_win_attempts_range") or (3, 4)
+    if isinstance(attempts_range, (tuple, list)) and attempts_range:
+        low = int(attempts_range[0])
+        high = int(attempts_range[-1])
+    else:
+        low = high = 3
+    if high < low:
+        low, high = high, low
+    low = max(0, low)
+    high = max(low, high)
+    min_confident_attempts = rng.randint(low, high)
+    jitter = float(preset.get("confidence_jitter", 0.0) or 0.0)
+    confidence_bias = rng.uniform(-jitter, jitter) if jitter else 0.0
+    mistake_chance = float(preset.get("mistake_chance", 0.0) or 0.0)
+    return min_confident_attempts, confidence_bias, max(0.0, min(1.0, mistake_chance))
+
+
+def new_knowledge() -> dict:
+    """What a bot knows in the current round: letter constraints and history."""
+    return {"constraints": LetterConstraints(), "history": ()}
+
+
+def reset_knowledge(knowledge: dict) -> None:
+    knowledge["constraints"].clear()
+    knowledge["history"] = ()
+
+
+def _extend_history(history: Optional[History], guess_id: Optional[int], code: int) -> Optional[History]:
+    if history is None or guess_id is None:
+        return None
+    return history + ((guess_id, code),)
+
+
+def refine_candidates(
+    lexicon,
+    candidates: int,
+    knowledge: dict,
+    guess: str,
+    feedback: list[dict],
+    tier: str = HEURISTIC_TIER,
+) -> int:
+    """Apply one guess's feedback to the knowledge and the candidate bitset.
+
+    The result depends only on the round's guess/feedback history, so it is
+    shared through the opening book while the history is short.
+    """
+    candidates = candidates or lexicon.pool_mask
+    code = pattern_from_statuses([item["status"] for item in feedback]) if feedback else None
+    if code is None:
+        return candidates
+    guess = guess.lower()
+    guess_id = lexicon.id_of(guess)
+    constraints = knowledge["constraints"]
+    constraints.add_feedback(guess, code)
+    history = knowledge["history"] = _extend_history(knowledge.get("history", ()), guess_id, code)
+    book = get_opening_book()
+    if history is not None and book.covers(history):
+        cached = book.candidates(lexicon.lang, tier, history)
+        if cached is not None:
+            return cached
+    row = lexicon.row(guess_id) if guess_id is not None else None
+    if row is not None:
+        refined = candidates & mask_of_code(row, code)
+    else:
+        refined = constraints.mask(lexicon, candidates)
+    # Com o filtro exato só esvazia se o feedback contradiz o histórico
+    refined = refined or constraints.mask(lexicon) or candidates
+    if history is not None and book.covers(history):
+        book.store_candidates(lexicon.lang, tier, history, refined)
+    return refined
+
+
+def _decide_expert(lexicon, request: DecisionRequest, preset: dict) -> Optional[Decision]:
+    # O orçamento cobre a jogada inteira: livro, busca e o refinamento seguinte
+    deadline = time.perf_counter() + float(preset.get("decision_budget", DEFAULT_BUDGET)) * (1 - REFINE_BUDGET_SHARE)
+    book = get_opening_book()
+    tier = tier_for(preset)
+    guess_id = book.guess(lexicon.lang, tier, request.history) if request.history is not None else None
+    if guess_id is None or request.used >> guess_id & 1:
+        candidate_ids = ids_of(request.candidates or lexicon.pool_mask)
+        guess_id = solver_for(lexicon.lang).choose(
+            candidate_ids,
+            exclude=ids_of(request.used),
+            budget=max(0.0, deadline - time.perf_counter()),
+        )
+        if guess_id is None:
+            return None
+        if request.history is not None:
+            book.store_guess(lexicon.lang, tier, request.history, guess_id)
+    return Decision(guess_id, request.used | 1 << guess_id)
+
+
+def decide(request: DecisionRequest) -> Optional[Decision]:
+    """Choose the next guess for ``request`` (pure apart from the time budget)."""
+    lexicon = get_lexicon(request.lang)
+    preset = preset_for(request.difficulty)
+    rng = random.Random(request.seed)
+    if preset.get("solver") == "entropy":
+        decision = _decide_expert(lexicon, request, preset)
+        if decision:
+            return decision
+    constraints = request.constraints
+    strict_candidates = request.candidates or constraints.mask(lexicon)
+    used = request.used
+    attempts = request.attempts
+    smart_pick_chance = preset.get("smart_pick_chance", 1.0)
+    late_focus_step = max(0.0, preset.get("late_focus_step", 0.0))
+    if attempts >= 4 and late_focus_step > 0:
+        smart_pick_chance = min(1.0, smart_pick_chance + (attempts - 3) * late_focus_step)
+    smart_pick_chance = max(0.0, min(1.0, smart_pick_chance))
+    wild_guess_chance = max(0.0, preset.get("wild_guess_chance", 0.0))
+    if attempts >= 4 and late_focus_step > 0:
+        wild_guess_chance = max(0.0, wild_guess_chance - (attempts - 3) * late_focus_step * 0.5)
+    min_confident_attempts = max(0, int(request.min_confident_attempts or 0))
+    early_phase = attempts < min_confident_attempts
+    base_confidence = float(preset.get("base_confidence", smart_pick_chance))
+    confidence_growth = float(preset.get("confidence_growth", 0.1))
+    confidence = base_confidence + attempts * max(0.0, confidence_growth) + request.confidence_bias
+    confidence = max(0.05, min(0.98, confidence))
+    hesitation_bias = max(0.0, min(1.0, float(preset.get("hesitation_bias", 0.4) or 0.0)))
+    if early_phase:
+        smart_pick_chance *= (1.0 - 0.5 * hesitation_bias)
+        confidence *= 0.5
+        wild_guess_chance = min(0.85, wild_guess_chance + hesitation_bias * 0.35)
+    else:
+        smart_pick_chance = min(1.0, (smart_pick_chance + confidence) / 2)
+    smart_pick_chance = max(0.0, min(1.0, smart_pick_chance))
+    mistake_chance = float(request.mistake_chance)
+    if early_phase:
+        mistake_chance = min(1.0, mistake_chance + hesitation_bias * 0.4)
+    # Pools são bitsets sobre o léxico compartilhado (nenhuma lista por bot)
+    strict_pool = strict_candidates & ~used
+    # Palpites "descuidados" só evitam as letras ausentes
+    fallback_pool = constraints.loose_mask(lexicon) & ~used
+    should_force_fallback = bool(fallback_pool) and (
+        (early_phase and rng.random() < hesitation_bias)
+        or (rng.random() < mistake_chance)
+    )
+    pool = strict_pool if strict_pool else fallback_pool
+    if should_force_fallback:
+        pool = fallback_pool or strict_pool
+    elif fallback_pool and rng.random() > smart_pick_chance:
+        pool = fallback_pool
+    if pool and rng.random() < wild_guess_chance:
+        random_pool = lexicon.pool_mask & ~used
+        pool = random_pool or pool
+    if not pool:
+        used = 0
+        pool = strict_candidates or constraints.loose_mask(lexicon)
+        if not pool:
+            return None
+    guess_id = random_id(pool, rng)
+    return Decision(guess_id, used | 1 << guess_id)
+
+
+def precompute_book(
+    book: OpeningBook,
+    lang: str,
+    difficulty: str = "expert",
+    depth: int = DEFAULT_BOOK_DEPTH,
+    budget: float = PRECOMPUTE_BUDGET,
+) -> int:
+    """Fill ``book`` with the tier's replies for every history shorter than ``depth``.
+
+    Only deterministic (solver) tiers have replies worth precomputing.
+    Returns how many guesses were stored.
+    """
+    lexicon = get_lexicon(lang)
+    preset = preset_for(difficulty)
+    tier = tier_for(preset)
+    if tier == HEURISTIC_TIER:
+        return 0
+    solver = solver_for(lexicon.lang)
+    stored = 0
+    frontier = [((), lexicon.pool_mask, new_knowledge())]
+    for level in range(depth):
+        next_frontier = []
+        for history, candidates, knowledge in frontier:
+            used = from_ids(word_id for word_id, _code in history)
+            guess_id = solver.choose(ids_of(candidates), exclude=ids_of(used), budget=budget, sample_limit=None)
+            if guess_id is None:
+                continue
+            book.store_guess(lexicon.lang, tier, history, guess_id)
+            stored += 1
+            if level + 1 >= depth:
+                continue
+            guess = lexicon.word(guess_id)
+            codes = set(score_batch(guess, [lexicon.word(word_id) for word_id in ids_of(candidates)], lexicon.lang))
+            for code in sorted(codes - {ALL_GREEN}):
+                child = {"constraints": knowledge["constraints"].copy(), "history": knowledge["history"]}
+                feedback = feedback_items(guess, code)
+                refined = refine_candidates(lexicon, candidates, child, guess, feedback, tier)
+                next_frontier.append((child["history"], refined, child))
+        frontier = next_frontier
+    return stored
+
+
+__all__ = [
+    "BOT_DIFFICULTY_PRESETS",
+    "DEFAULT_BOT_DIFFICULTY",
+    "Decision",
+    "DecisionRequest",
+    "decide",
+    "new_knowledge",
+    "normalize_bot_difficulty",
+    "precompute_book",
+    "preset_for",
+    "refine_candidates",
+    "reset_knowledge",
+    "roll_persona",
+    "tier_for",
+]
@@ -0,0 +1,108 @@
+"""Letter constraints learned from guess feedback.
+
+:class:`LetterConstraints` keeps what a player knows about the answer:
+letters fixed at positions, letters forbidden at positions and the
+minimum/maximum number of times each letter occurs. Feedback is folded in
+with repeated letters handled the way the game scores them (a letter marked
+green/yellow ``k`` times and gray at least once occurs exactly ``k``
+times). The constraints compile to a single :meth:`word_index.LetterIndex.query`
+over the lexicon, so filtering is a few bitset operations and exact.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Set
+
+from scoring import GRAY, GREEN, STATUS_CODES, WORD_LENGTH, pattern_statuses
+
+
+class LetterConstraints:
+    """Fixed/forbidden positions and min/max counts per letter."""
+
+    __slots__ = ("fixed", "forbidden", "min_counts", "max_counts")
+
+    def __init__(self):
+        self.fixed: Dict[int, str] = {}
+        self.forbidden: Dict[str, Set[int]] = {}
+        self.min_counts: Dict[str, int] = {}
+        self.max_counts: Dict[str, int] = {}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, LetterConstraints):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return (
+            f"LetterConstraints(fixed={self.fixed!r}, forbidden={self.forbidden!r}, "
+            f"min_counts={self.min_counts!r}, max_counts={self.max_counts!r})"
+        )
+
+    def clear(self) -> None:
+        self.fixed.clear()
+        self.forbidden.clear()
+        self.min_counts.clear()
+        self.max_counts.clear()
+
+    def copy(self) -> "LetterConstraints":
+        clone = LetterConstraints()
+        clone.fixed = dict(self.fixed)
+        clone.forbidden = {letter: set(positions) for letter, positions in self.forbidden.items()}
+        clone.min_counts = dict(self.min_counts)
+        clone.max_counts = dict(self.max_counts)
+        return clone
+
+    @property
+    def absent(self) -> Set[str]:
+        """Letters known not to occur at all."""
+        return {letter for letter, count in self.max_counts.items() if count == 0}
+
+    @property
+    def present(self) -> Set[str]:
+        return {letter for letter, count in self.min_counts.items() if count > 0}
+
+    def add_feedback(self, guess: str, code: int) -> None:
+        """Fold the feedback ``code`` for ``guess`` into the constraints."""
+        guess = guess.lower()
+        statuses = [STATUS_CODES[name] for name in pattern_statuses(code)]
+        marked: Dict[str, int] = {}
+        grayed: Set[str] = set()
+        for position in range(WORD_LENGTH):
+            letter = guess[position]
+            status = statuses[position]
+            if status == GREEN:
+                self.fixed[position] = letter
+                marked[letter] = marked.get(letter, 0) + 1
+            else:
+                self.forbidden.setdefault(letter, set()).add(position)
+                if status == GRAY:
+                    grayed.add(letter)
+                else:
+                    marked[letter] = marked.get(letter, 0) + 1
+        for letter, count in marked.items():
+            if count > self.min_counts.get(letter, 0):
+                self.min_counts[letter] = count
+        for letter in grayed:
+            exact = marked.get(letter, 0)
+            if exact < self.max_counts.get(letter, WORD_LENGTH):
+                self.max_counts[letter] = exact
+
+    def mask(self, lexicon, base: Optional[int] = None) -> int:
+        """Ids (of ``base``, default the pool) consistent with every constraint."""
+        return lexicon.letter_index.query(
+            fixed=self.fixed,
+            forbidden=self.forbidden,
+            min_counts=self.min_counts,
+            max_counts=self.max_counts,
+            base=lexicon.pool_mask if base is None else base,
+        )
+
+    def loose_mask(self, lexicon, base: Optional[int] = None) -> int:
+        """Ids avoiding the absent letters only (what a careless player keeps)."""
+        return lexicon.letter_index.query(
+            max_counts={letter: 0 for letter in self.absent},
+            base=lexicon.pool_mask if base is None else base,
+        )
+
+
+__all__ = ["LetterConstraints"]
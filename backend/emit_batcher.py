@@ -0,0 +1,68 @@
+"""Coalescing of Socket.IO emits for clients that opt in.
+
+One guess can produce ``guess_result``, ``peer_guess``, ``room_update``,
+``round_result`` and ``match_over`` for the same member. Clients that
+connect with ``auth={"batch": true}`` (or ``?batch=1``) get those events
+buffered per recipient and delivered once the current handler or background
+task yields: a single event is sent as is, several go out as one ``batch``
+event whose payload is the ordered list of ``[event, payload]`` pairs.
+Everyone else keeps receiving one emit per event.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Set, Tuple
+
+BATCH_EVENT = "batch"
+
+
+class EmitBatcher:
+    """Per-recipient outbound buffers flushed by one background task per tick."""
+
+    def __init__(self, emit: Callable, spawn: Callable):
+        self._emit = emit
+        self._spawn = spawn
+        self._clients: Set[str] = set()
+        self._pending: Dict[str, List[Tuple[str, object]]] = {}
+        self._flush_queued = False
+        self._counters = {"events": 0, "frames": 0, "flushes": 0}
+
+    def __bool__(self) -> bool:
+        return bool(self._clients)
+
+    def enable(self, sid: str) -> None:
+        self._clients.add(sid)
+
+    def forget(self, sid: str) -> None:
+        self._clients.discard(sid)
+        self._pending.pop(sid, None)
+
+    def wants(self, sid: str) -> bool:
+        return sid in self._clients
+
+    def send(self, sid: str, event: str, payload) -> None:
+        """Queue ``event`` for ``sid``; callers check :meth:`wants` first."""
+        self._pending.setdefault(sid, []).append((event, payload))
+        self._counters["events"] += 1
+        if not self._flush_queued:
+            self._flush_queued = True
+            self._spawn(self.flush)
+
+    def flush(self) -> None:
+        self._flush_queued = False
+        pending, self._pending = self._pending, {}
+        for sid, events in pending.items():
+            if len(events) == 1:
+                event, payload = events[0]
+                self._emit(event, payload, to=sid)
+            else:
+                self._emit(BATCH_EVENT, [[event, payload] for event, payload in events], to=sid)
+            self._counters["frames"] += 1
+        if pending:
+            self._counters["flushes"] += 1
+
+    def metrics(self) -> dict:
+        return {"clients": len(self._clients), "pending": len(self._pending), **self._counters}
+
+
+__all__ = ["BATCH_EVENT", "EmitBatcher"]
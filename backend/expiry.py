@@ -0,0 +1,67 @@
+"""Deadline index for idle-resource collection.
+
+:class:`ExpiryQueue` keeps one deadline per key in a min-heap so a sweep
+only touches the keys that are due. Postponing a deadline (the common case:
+a room sees activity) just records the new value; the old heap entry is
+re-pushed with it when it surfaces. Bringing a deadline forward pushes a new
+entry. A sweep therefore costs O(expired · log n) instead of a scan over
+every key.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class ExpiryQueue:
+    """Keys with a deadline, popped once it has passed."""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, Hashable]] = []
+        self._deadlines: Dict[Hashable, float] = {}
+        self._counters = {"expired": 0, "postponed": 0}
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key) -> bool:
+        return key in self._deadlines
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        current = self._deadlines.get(key)
+        self._deadlines[key] = deadline
+        if current is None or deadline < current:
+            heapq.heappush(self._heap, (deadline, key))
+
+    def discard(self, key: Hashable) -> None:
+        # A entrada no heap é descartada quando chegar ao topo
+        self._deadlines.pop(key, None)
+
+    def next_deadline(self) -> Optional[float]:
+        while self._heap and self._deadlines.get(self._heap[0][1]) is None:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_expired(self, now: float) -> List[Hashable]:
+        """Remove and return the keys whose deadline is ``<= now``."""
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            _, key = heapq.heappop(self._heap)
+            current = self._deadlines.get(key)
+            if current is None:
+                continue
+            if current > now:
+                self._counters["postponed"] += 1
+                heapq.heappush(self._heap, (current, key))
+                continue
+            del self._deadlines[key]
+            expired.append(key)
+        self._counters["expired"] += len(expired)
+        return expired
+
+    def metrics(self) -> dict:
+        return {"tracked": len(self._deadlines), "heap": len(self._heap), **self._counters}
+
+
+__all__ = ["ExpiryQueue"]
@@ -0,0 +1,208 @@
+"""Precomputed guess x answer feedback matrix stored as a memory-mapped file.
+
+Layout (little endian)::
+
+    header   magic "MGFM", version, rows, cols, crc32(words)
+    guesses  rows * 5 ASCII bytes
+    answers  cols * 5 ASCII bytes
+    matrix   rows * cols uint8 pattern codes (row = guess, column = answer)
+
+The file is opened read-only through ``mmap`` so every worker process
+shares the same physical pages and a lookup is a single index operation.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from scoring import compute_pattern
+
+MATRIX_FILENAME = "feedback_{lang}.bin"
+
+MAGIC = b"MGFM"
+VERSION = 1
+WORD_BYTES = 5
+
+_HEADER = struct.Struct("<4sHHIII")
+
+
+class FeedbackMatrixError(ValueError):
+    """Raised when a matrix file is missing pieces or fails validation."""
+
+
+def _pack_words(words: Sequence[str]) -> bytes:
+    packed = "".join(words).encode("ascii")
+    if len(packed) != len(words) * WORD_BYTES:
+        raise FeedbackMatrixError("Todas as palavras precisam ter 5 letras ASCII.")
+    return packed
+
+
+def _unpack_words(raw: bytes) -> Tuple[str, ...]:
+    text = raw.decode("ascii")
+    return tuple(text[i:i + WORD_BYTES] for i in range(0, len(text), WORD_BYTES))
+
+
+def _pattern_rows(guesses: Sequence[str], answers: Sequence[str]) -> Iterator[bytes]:
+    """Pattern codes of each guess against every answer, one row at a time.
+
+    Each per-answer flag vector is a big int with one byte per answer, so a
+    row is a weighted sum of such ints: for a guess letter at position ``i``
+    the answer contributes ``3**i`` if it contains the letter and another
+    ``3**i`` if the letter sits at ``i`` (codes stay below 256, so lanes never
+    carry). That is exact unless the guess repeats a letter the answer holds
+    fewer times: a doubled letter against a single one is corrected with the
+    same vectors, rarer cases are scored column by column.
+    """
+    cols = len(answers)
+    contains: Dict[str, bytearray] = {}
+    single: Dict[str, bytearray] = {}
+    placed: Dict[Tuple[int, str], bytearray] = {}
+    counts: Dict[str, list] = {}
+    for col, answer in enumerate(answers):
+        for pos, letter in enumerate(answer):
+            placed.setdefault((pos, letter), bytearray(cols))[col] = 1
+        for letter in set(answer):
+            contains.setdefault(letter, bytearray(cols))[col] = 1
+            count = answer.count(letter)
+            if count == 1:
+                single.setdefault(letter, bytearray(cols))[col] = 1
+            counts.setdefault(letter, []).append((col, count))
+    contains_int = {letter: int.from_bytes(flags, "little") for letter, flags in contains.items()}
+    single_int = {letter: int.from_bytes(flags, "little") for letter, flags in single.items()}
+    placed_int = {key: int.from_bytes(flags, "little") for key, flags in placed.items()}
+    for guess in guesses:
+        total = 0
+        for pos, letter in enumerate(guess):
+            total += 3 ** pos * (contains_int.get(letter, 0) + placed_int.get((pos, letter), 0))
+        slow_cols = set()
+        for letter in set(guess):
+            positions = [pos for pos, char in enumerate(guess) if char == letter]
+            if len(positions) == 1:
+                continue
+            if len(positions) > 2:
+                slow_cols.update(col for col, count in counts.get(letter, ()) if count < len(positions))
+                continue
+            # Letra dobrada contra uma só: a segunda posição não verde perde o amarelo
+            first, second = positions
+            once = single_int.get(letter, 0)
+            once_second = once & placed_int.get((second, letter), 0)
+            total -= 3 ** second * once - (3 ** second - 3 ** first) * once_second
+        row = total.to_bytes(cols, "little")
+        if slow_cols:
+            row = bytearray(row)
+            for col in slow_cols:
+                row[col] = compute_pattern(guess, answers[col])
+        yield bytes(row)
+
+
+def build_matrix(guesses: Sequence[str], answers: Sequence[str], path: Path) -> Path:
+    """Score every guess against every answer and write the matrix file."""
+    guesses = list(guesses)
+    answers = list(answers)
+    guess_bytes = _pack_words(guesses)
+    answer_bytes = _pack_words(answers)
+    checksum = zlib.crc32(guess_bytes + answer_bytes)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Vários workers podem construir ao mesmo tempo: cada um no seu arquivo
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("wb") as handle:
+            handle.write(_HEADER.pack(MAGIC, VERSION, 0, len(guesses), len(answers), checksum))
+            handle.write(guess_bytes)
+            handle.write(answer_bytes)
+            for row in _pattern_rows(guesses, answers):
+                handle.write(row)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return path
+
+
+class FeedbackMatrix:
+    """Read-only view over a matrix file produced by :func:`build_matrix`.
+
+    Access is by id only (``row_at``/``at``) and touches only the mmap:
+    rows and columns follow the lexicon ids, which resolve words (see
+    ``scoring.feedback_code``).
+    """
+
+    def __init__(self, buffer, rows: int, cols: int, checksum: int):
+        self._buffer = buffer
+        self.rows = rows
+        self.cols = cols
+        self.checksum = checksum
+        self._offset = _HEADER.size + (rows + cols) * WORD_BYTES
+
+    @property
+    def guesses(self) -> Tuple[str, ...]:
+        start = _HEADER.size
+        return _unpack_words(self._buffer[start:start + self.rows * WORD_BYTES])
+
+    @property
+    def answers(self) -> Tuple[str, ...]:
+        start = _HEADER.size + self.rows * WORD_BYTES
+        return _unpack_words(self._buffer[start:start + self.cols * WORD_BYTES])
+
+    @classmethod
+    def open(cls, path: Path) -> "FeedbackMatrix":
+        with Path(path).open("rb") as handle:
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(buffer) < _HEADER.size:
+            raise FeedbackMatrixError("Arquivo de matriz truncado.")
+        magic, version, _reserved, rows, cols, checksum = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise FeedbackMatrixError("Formato de matriz desconhecido.")
+        words_end = _HEADER.size + (rows + cols) * WORD_BYTES
+        if len(buffer) != words_end + rows * cols:
+            raise FeedbackMatrixError("Tamanho da matriz inconsistente.")
+        if zlib.crc32(buffer[_HEADER.size:words_end]) != checksum:
+            raise FeedbackMatrixError("Checksum da matriz inválido.")
+        return cls(buffer, rows, cols, checksum)
+
+    def at(self, row: int, col: int) -> int:
+        return self._buffer[self._offset + row * self.cols + col]
+
+    def row_at(self, row: int) -> bytes:
+        start = self._offset + row * self.cols
+        return self._buffer[start:start + self.cols]
+
+
+def matrix_path(data_dir: Path, lang: str) -> Path:
+    return Path(data_dir) / MATRIX_FILENAME.format(lang=lang)
+
+
+def load_matrix(path: Path) -> Optional[FeedbackMatrix]:
+    """Open ``path`` if it exists; invalid files are reported and ignored."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        return FeedbackMatrix.open(path)
+    except (OSError, ValueError) as exc:
+        print(f"Matriz de feedback ignorada ({path.name}): {exc}")
+        return None
+
+
+def normalize_words(words: Iterable[str]) -> Tuple[str, ...]:
+    """Normalize a word source into a sorted tuple of unique 5-letter words."""
+    cleaned = {word.strip().lower() for word in words}
+    return tuple(sorted(
+        word for word in cleaned
+        if len(word) == WORD_BYTES and word.isascii() and word.isalpha()
+    ))
+
+
+__all__ = [
+    "FeedbackMatrix",
+    "FeedbackMatrixError",
+    "build_matrix",
+    "load_matrix",
+    "matrix_path",
+    "normalize_words",
+]
@@ -0,0 +1,181 @@
+"""Bounded in-memory store for single-player games.
+
+Each game is a small :class:`GameRecord` (answers, attempt counter, solved
+bitmask and stats metadata). The store keeps records in least-recently-used
+order and drops them when they sit idle longer than ``ttl`` seconds or when
+``max_games`` is exceeded, so memory stays flat however many games are
+started. Ids of recently dropped games are remembered to tell "expired"
+apart from "never existed".
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Sequence
+
+DEFAULT_MAX_GAMES = 50_000
+DEFAULT_TTL = 6 * 3600  # seconds
+
+
+class GameExpired(LookupError):
+    """Raised when a game id was evicted from the store."""
+
+
+class GameRecord:
+    """Compact state of one single-player game (one or more answers)."""
+
+    __slots__ = (
+        "lang",
+        "words",
+        "attempts",
+        "max_attempts",
+        "solved_mask",
+        "mode",
+        "user_id",
+        "stats_recorded",
+        "touched_at",
+    )
+
+    def __init__(
+        self,
+        lang: str,
+        words: Sequence[str],
+        max_attempts: int,
+        mode=None,
+        user_id: Optional[int] = None,
+    ):
+        self.lang = lang
+        self.words = tuple(words)
+        self.attempts = 0
+        self.max_attempts = max_attempts
+        self.solved_mask = 0
+        self.mode = mode
+        self.user_id = user_id
+        self.stats_recorded = False
+        self.touched_at = 0.0
+
+    @property
+    def word_count(self) -> int:
+        return len(self.words)
+
+    @property
+    def won(self) -> bool:
+        return self.solved_mask == (1 << len(self.words)) - 1
+
+    @property
+    def game_over(self) -> bool:
+        return self.won or self.attempts >= self.max_attempts
+
+    def is_solved(self, index: int) -> bool:
+        return bool(self.solved_mask >> index & 1)
+
+    def register_guess(self, codes: Sequence[int], solved_code: int) -> None:
+        """Count an attempt given one pattern code per answer."""
+        for index, code in enumerate(codes):
+            if code == solved_code:
+                self.solved_mask |= 1 << index
+        self.attempts += 1
+
+
+class GameStore:
+    """TTL + LRU bounded mapping of game id -> :class:`GameRecord`."""
+
+    def __init__(
+        self,
+        max_games: int = DEFAULT_MAX_GAMES,
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_games = max(1, int(max_games))
+        self.ttl = float(ttl)
+        self._clock = clock
+        self._games: "OrderedDict[str, GameRecord]" = OrderedDict()
+        # Ids descartados recentemente (para responder "expirado")
+        self._evicted: "OrderedDict[str, None]" = OrderedDict()
+        self._counters = {
+            "created": 0,
+            "expired": 0,
+            "evicted": 0,
+            "hits": 0,
+            "misses": 0,
+            "expiredLookups": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._games
+
+    def add(self, game_id: str, record: GameRecord) -> None:
+        now = self._clock()
+        self._purge_expired(now)
+        record.touched_at = now
+        self._games[game_id] = record
+        self._games.move_to_end(game_id)
+        self._counters["created"] += 1
+        while len(self._games) > self.max_games:
+            oldest, _ = self._games.popitem(last=False)
+            self._forget(oldest)
+            self._counters["evicted"] += 1
+
+    def get(self, game_id: str) -> Optional[GameRecord]:
+        """Return the game and refresh its TTL; ``None`` if it never existed.
+
+        Raises :class:`GameExpired` for games dropped by TTL or capacity.
+        """
+        record = self._games.get(game_id)
+        now = self._clock()
+        if record is not None and now - record.touched_at > self.ttl:
+            del self._games[game_id]
+            self._forget(game_id)
+            self._counters["expired"] += 1
+            record = None
+        if record is None:
+            if game_id in self._evicted:
+                self._counters["expiredLookups"] += 1
+                raise GameExpired(game_id)
+            self._counters["misses"] += 1
+            return None
+        record.touched_at = now
+        self._games.move_to_end(game_id)
+        self._counters["hits"] += 1
+        return record
+
+    def discard(self, game_id: str) -> None:
+        self._games.pop(game_id, None)
+
+    def sweep(self) -> int:
+        """Drop every game idle longer than the TTL; return how many."""
+        return self._purge_expired(self._clock())
+
+    def _purge_expired(self, now: float) -> int:
+        purged = 0
+        games = self._games
+        while games:
+            game_id, record = next(iter(games.items()))
+            if now - record.touched_at <= self.ttl:
+                break
+            games.popitem(last=False)
+            self._forget(game_id)
+            purged += 1
+        self._counters["expired"] += purged
+        return purged
+
+    def _forget(self, game_id: str) -> None:
+        self._evicted[game_id] = None
+        self._evicted.move_to_end(game_id)
+        while len(self._evicted) > self.max_games:
+            self._evicted.popitem(last=False)
+
+    def metrics(self) -> Dict[str, float]:
+        return {
+            "size": len(self._games),
+            "maxGames": self.max_games,
+            "ttlSeconds": self.ttl,
+            **self._counters,
+        }
+
+
+__all__ = ["GameStore", "GameRecord", "GameExpired", "DEFAULT_MAX_GAMES", "DEFAULT_TTL"]
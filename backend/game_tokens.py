@@ -0,0 +1,282 @@
+"""Stateless single-player games carried in encrypted, signed tokens.
+
+Instead of living in a worker's :class:`game_store.GameStore`, a game can be
+packed into an opaque token that the client sends back with every guess and
+that is reissued after each one, so any worker can serve any guess.
+
+Plaintext (little endian)::
+
+    game id (8) | lang (2s) | words | attempts | max attempts | flags | mode
+    | solved mask (u32) | user id (u32) | last update (u32, unix)
+    | lexicon checksum (u32) | answer ids (u16 each)
+
+Answers are stored as lexicon ids (the checksum rejects tokens minted
+against a different word list). The plaintext is sealed with AES-256-GCM
+(``cryptography``), the version byte as associated data, under a key
+derived with HKDF-SHA256 from the app ``SECRET_KEY``. The app refuses
+stateless games while that key is the development default.
+
+Tokens are bearer state, so a ledger remembers the token states already
+served and the finished games: a token is accepted once, and a game's result
+is recorded once.
+
+- :class:`RedisTokenLedger` keeps them as expiring keys on the Redis server
+  shared by every worker (``TOKEN_LEDGER_URL``, by default the
+  ``ROOM_REGISTRY_URL``), so a token replayed on another worker is refused
+  too. Multi-worker deploys need it.
+- :class:`TokenLedger` keeps them in process, which only covers a single
+  worker. It is bounded; when it has to drop an entry before the entry's
+  token expired, every token issued up to that point is treated as expired
+  instead of becoming replayable again.
+"""
+
+from __future__ import annotations
+
+import base64
+import math
+import os
+import struct
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from game_store import GameExpired, GameRecord
+from lexicon import get_lexicon
+from models import GameMode
+from room_registry import KEY_PREFIX
+
+TOKEN_VERSION = 2
+NONCE_BYTES = 12
+TAG_BYTES = 16
+MAX_TOKEN_WORDS = 32
+MAX_TOKEN_ATTEMPTS = 255
+
+_STATE = struct.Struct("<8s2sBBBBBIIII")
+_MODES = tuple(GameMode)
+_FLAG_STATS_RECORDED = 0x01
+
+
+class GameTokenError(ValueError):
+    """Raised for tokens that are malformed, tampered with or unusable."""
+
+
+class GameTokenReused(GameTokenError):
+    """Raised for a token whose state was already played (replay)."""
+
+
+def _derive_key(secret: bytes) -> bytes:
+    return HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=b"muskiguess/game-token").derive(secret)
+
+
+class GameTokenCodec:
+    """Encode/decode :class:`GameRecord` objects as opaque tokens."""
+
+    def __init__(self, secret: str, ttl: float, clock: Callable[[], float] = time.time):
+        self._aead = AESGCM(_derive_key(secret.encode("utf-8")))
+        self.ttl = float(ttl)
+        self._clock = clock
+
+    def encode(self, game_id: str, record: GameRecord) -> str:
+        if record.word_count > MAX_TOKEN_WORDS or record.max_attempts > MAX_TOKEN_ATTEMPTS:
+            raise GameTokenError("Jogo grande demais para um token.")
+        lexicon = get_lexicon(record.lang)
+        ids = [lexicon.id_of(word) for word in record.words]
+        if None in ids:
+            raise GameTokenError("Resposta fora do léxico.")
+        flags = _FLAG_STATS_RECORDED if record.stats_recorded else 0
+        mode = _MODES.index(record.mode) + 1 if record.mode in _MODES else 0
+        plaintext = _STATE.pack(
+            bytes.fromhex(game_id)[:8].ljust(8, b"\0"),
+            lexicon.lang.encode("ascii"),
+            record.word_count,
+            record.attempts,
+            record.max_attempts,
+            flags,
+            mode,
+            record.solved_mask,
+            record.user_id or 0,
+            int(self._clock()),
+            lexicon.checksum,
+        ) + struct.pack(f"<{len(ids)}H", *ids)
+        header = bytes([TOKEN_VERSION])
+        nonce = os.urandom(NONCE_BYTES)
+        sealed = self._aead.encrypt(nonce, plaintext, header)
+        return base64.urlsafe_b64encode(header + nonce + sealed).rstrip(b"=").decode("ascii")
+
+    def decode(self, token: str) -> Tuple[str, GameRecord]:
+        """Return ``(game_id, record)``; raises GameTokenError or GameExpired."""
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        except (TypeError, ValueError) as exc:
+            raise GameTokenError("Token inválido.") from exc
+        if len(raw) < 1 + NONCE_BYTES + _STATE.size + TAG_BYTES or raw[0] != TOKEN_VERSION:
+            raise GameTokenError("Token inválido.")
+        header, nonce, sealed = raw[:1], raw[1:1 + NONCE_BYTES], raw[1 + NONCE_BYTES:]
+        try:
+            plaintext = self._aead.decrypt(nonce, sealed, header)
+        except InvalidTag as exc:
+            raise GameTokenError("Token inválido.") from exc
+        (
+            game_id,
+            lang,
+            word_count,
+            attempts,
+            max_attempts,
+            flags,
+            mode,
+            solved_mask,
+            user_id,
+            updated_at,
+            checksum,
+        ) = _STATE.unpack_from(plaintext, 0)
+        if len(plaintext) != _STATE.size + 2 * word_count:
+            raise GameTokenError("Token inválido.")
+        if self._clock() - updated_at > self.ttl:
+            raise GameExpired(game_id.hex())
+        lexicon = get_lexicon(lang.decode("ascii", "replace"))
+        if lexicon.checksum != checksum:
+            raise GameExpired(game_id.hex())
+        ids = struct.unpack_from(f"<{word_count}H", plaintext, _STATE.size)
+        if any(word_id >= len(lexicon) for word_id in ids):
+            raise GameTokenError("Token inválido.")
+        record = GameRecord(
+            lexicon.lang,
+            [lexicon.word(word_id) for word_id in ids],
+            max_attempts,
+            mode=_MODES[mode - 1] if 0 < mode <= len(_MODES) else None,
+            user_id=user_id or None,
+        )
+        record.attempts = attempts
+        record.solved_mask = solved_mask
+        record.stats_recorded = bool(flags & _FLAG_STATS_RECORDED)
+        record.touched_at = float(updated_at)  # emissão do token (ver TokenLedger)
+        return game_id.hex(), record
+
+
+class TokenLedger:
+    """Bounded memory of consumed ``(game id, attempts)`` states and finished games."""
+
+    def __init__(self, max_entries: int, ttl: float, clock: Callable[[], float] = time.time):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = float(ttl)
+        self._clock = clock
+        # (game_id, attempts) consumido, ou (game_id, None) para jogo encerrado -> quando
+        self._seen: "OrderedDict[Tuple[str, Optional[int]], float]" = OrderedDict()
+        self._horizon = 0.0  # tokens emitidos até aqui valem como expirados
+        self._counters = {"consumed": 0, "finished": 0, "replays": 0, "dropped": 0}
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def check(self, game_id: str, record: GameRecord) -> None:
+        """Raise GameTokenReused/GameExpired unless the token state is fresh."""
+        if record.touched_at <= self._horizon:
+            raise GameExpired(game_id)
+        if (game_id, None) in self._seen or (game_id, record.attempts) in self._seen:
+            self._counters["replays"] += 1
+            raise GameTokenReused("Token de jogo já utilizado.")
+
+    def consume(self, game_id: str, attempts: int) -> None:
+        """Mark the token state as played; GameTokenReused if it already was."""
+        if (game_id, attempts) in self._seen:
+            self._counters["replays"] += 1
+            raise GameTokenReused("Token de jogo já utilizado.")
+        self._remember((game_id, attempts))
+        self._counters["consumed"] += 1
+
+    def finish(self, game_id: str) -> bool:
+        """Mark the game finished; ``False`` if it already was."""
+        if (game_id, None) in self._seen:
+            return False
+        self._remember((game_id, None))
+        self._counters["finished"] += 1
+        return True
+
+    def _remember(self, key) -> None:
+        now = self._clock()
+        seen = self._seen
+        # Entradas mais velhas que o TTL só cobrem tokens já expirados
+        while seen:
+            oldest_at = next(iter(seen.values()))
+            if now - oldest_at <= self.ttl:
+                break
+            seen.popitem(last=False)
+        seen[key] = now
+        seen.move_to_end(key)
+        while len(seen) > self.max_entries:
+            _, dropped_at = seen.popitem(last=False)
+            self._horizon = max(self._horizon, dropped_at)
+            self._counters["dropped"] += 1
+
+    def metrics(self) -> dict:
+        return {"backend": "memory", "size": len(self._seen), "maxEntries": self.max_entries, **self._counters}
+
+
+class RedisTokenLedger:
+    """Consumed token states and finished games as expiring keys on a shared Redis."""
+
+    def __init__(self, client, ttl: float, *, prefix: str = KEY_PREFIX):
+        self._client = client
+        self._prefix = prefix
+        # Depois do TTL o próprio token já expirou: a chave pode sumir
+        self._ttl = max(1, math.ceil(ttl))
+        self._counters = {"consumed": 0, "finished": 0, "replays": 0}
+
+    def _key(self, game_id: str, suffix) -> str:
+        return f"{self._prefix}:token:{game_id}:{suffix}"
+
+    def check(self, game_id: str, record: GameRecord) -> None:
+        """Raise GameTokenReused unless the token state is fresh."""
+        if self._client.exists(self._key(game_id, "done"), self._key(game_id, record.attempts)):
+            self._counters["replays"] += 1
+            raise GameTokenReused("Token de jogo já utilizado.")
+
+    def consume(self, game_id: str, attempts: int) -> None:
+        """Mark the token state as played; GameTokenReused if any worker already did."""
+        if not self._client.set(self._key(game_id, attempts), 1, nx=True, ex=self._ttl):
+            self._counters["replays"] += 1
+            raise GameTokenReused("Token de jogo já utilizado.")
+        self._counters["consumed"] += 1
+
+    def finish(self, game_id: str) -> bool:
+        """Mark the game finished; ``False`` if it already was (on any worker)."""
+        if not self._client.set(self._key(game_id, "done"), 1, nx=True, ex=self._ttl):
+            return False
+        self._counters["finished"] += 1
+        return True
+
+    def metrics(self) -> dict:
+        return {"backend": "redis", **self._counters}
+
+
+def token_ledger_from_url(url: Optional[str], max_entries: int, ttl: float):
+    """``memory://`` (or nothing) for a per-process ledger, ``redis://...`` for a shared one."""
+    if not url or url.startswith("memory:"):
+        return TokenLedger(max_entries, ttl)
+    try:
+        import redis
+    except ImportError as exc:
+        raise RuntimeError("TOKEN_LEDGER_URL requer o pacote redis (pip install redis)") from exc
+    return RedisTokenLedger(redis.Redis.from_url(url), ttl)
+
+
+def new_token_game_id() -> str:
+    """Game ids for token games fit the 8 bytes reserved in the token."""
+    return os.urandom(8).hex()
+
+
+__all__ = [
+    "GameTokenCodec",
+    "GameTokenError",
+    "GameTokenReused",
+    "MAX_TOKEN_WORDS",
+    "RedisTokenLedger",
+    "TokenLedger",
+    "new_token_game_id",
+    "token_ledger_from_url",
+]
@@ -0,0 +1,309 @@
+"""Shared per-language word data (valid guesses, answers and word ids).
+
+Each language is loaded once per process into an immutable :class:`Lexicon`
+that validation, random word selection, scoring and the bots all share.
+Word ids are positions in the lexicon, laid out as::
+
+    [answers (sorted)] [every other valid guess (sorted)]
+
+The first ``pool_size`` ids are the words treated as possible answers by
+candidate filtering (the whole dictionary for pt, the answer list for en).
+They double as the column ids of the feedback matrix, so a guess id and a
+pool id index the matrix directly.
+
+The lexicon is compiled to ``data/lexicon_<lang>.bin``: a header followed by
+packed 5-byte ASCII records in id order. The file is opened through ``mmap``
+so every worker shares the same pages; membership and id lookups are binary
+searches over the two sorted segments instead of per-process word sets. The
+file is recompiled automatically whenever the word sources change, and so is
+the feedback matrix (``data/feedback_<lang>.bin``) when it is missing or no
+longer follows the lexicon layout.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import random
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+from bitsets import full_mask
+from feedback_matrix import WORD_BYTES, build_matrix, load_matrix, matrix_path, normalize_words
+from scoring import install_lexicon
+from word_index import LetterIndex
+from words import get_word_list
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+DICTIONARY_FILES = {
+    "pt": DATA_DIR / "palavras_5letras.txt",
+    "en": DATA_DIR / "words_5letters.txt",
+}
+DEFAULT_LANG = "pt"
+LEXICON_FILENAME = "lexicon_{lang}.bin"
+
+# Idiomas em que todo o dicionário conta como resposta possível para os bots
+FULL_POOL_LANGS = frozenset({"pt"})
+
+LEXICON_MAGIC = b"MGLX"
+LEXICON_VERSION = 1
+# magic, version, reserved, words, answers, pool, crc32(records), crc32(sources)
+_HEADER = struct.Struct("<4sHHIIIII")
+
+_LEXICONS: Dict[str, "Lexicon"] = {}
+
+
+class LexiconError(ValueError):
+    """Raised when a compiled lexicon file fails validation."""
+
+
+def normalize_lang(lang: Optional[str]) -> str:
+    normalized = (lang or "").lower()
+    return normalized if normalized in DICTIONARY_FILES else DEFAULT_LANG
+
+
+def lexicon_path(data_dir: Path, lang: str) -> Path:
+    return Path(data_dir) / LEXICON_FILENAME.format(lang=lang)
+
+
+def compile_lexicon(
+    dictionary: Sequence[str],
+    answers: Sequence[str],
+    full_pool: bool,
+    source_checksum: int = 0,
+) -> bytes:
+    """Pack the word sources into the binary lexicon layout."""
+    answer_words = normalize_words(answers)
+    answer_set = set(answer_words)
+    others = tuple(word for word in normalize_words(dictionary) if word not in answer_set)
+    records = "".join(answer_words + others).encode("ascii")
+    count = len(answer_words) + len(others)
+    header = _HEADER.pack(
+        LEXICON_MAGIC,
+        LEXICON_VERSION,
+        0,
+        count,
+        len(answer_words),
+        count if full_pool else len(answer_words),
+        zlib.crc32(records),
+        source_checksum,
+    )
+    return header + records
+
+
+class Lexicon:
+    """Immutable, buffer-backed word list of one language."""
+
+    __slots__ = (
+        "lang",
+        "answer_count",
+        "pool_size",
+        "checksum",
+        "source_checksum",
+        "matrix",
+        "_buffer",
+        "_size",
+        "_words",
+        "_letter_index",
+    )
+
+    def __init__(self, lang: str, buffer):
+        if len(buffer) < _HEADER.size:
+            raise LexiconError("Léxico truncado.")
+        magic, version, _reserved, count, answers, pool, checksum, source_checksum = (
+            _HEADER.unpack_from(buffer, 0)
+        )
+        if magic != LEXICON_MAGIC or version != LEXICON_VERSION:
+            raise LexiconError("Formato de léxico desconhecido.")
+        if len(buffer) != _HEADER.size + count * WORD_BYTES or not answers <= pool <= count:
+            raise LexiconError("Tamanho do léxico inconsistente.")
+        if zlib.crc32(buffer[_HEADER.size:]) != checksum:
+            raise LexiconError("Checksum do léxico inválido.")
+        self.lang = lang
+        self.answer_count = answers
+        self.pool_size = pool
+        self.checksum = checksum
+        self.source_checksum = source_checksum
+        self.matrix = None
+        self._buffer = buffer
+        self._size = count
+        self._words: Optional[Tuple[str, ...]] = None
+        self._letter_index: Optional[LetterIndex] = None
+
+    @classmethod
+    def from_sources(cls, lang: str) -> "Lexicon":
+        """Compile the lexicon in memory from the dictionary file and answer list."""
+        return cls(lang, _compile_sources(lang))
+
+    @classmethod
+    def open(cls, lang: str, path: Path) -> "Lexicon":
+        with Path(path).open("rb") as handle:
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(lang, buffer)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, word: str) -> bool:
+        return self.id_of(word) is not None
+
+    def _search(self, key: bytes, lo: int, hi: int) -> int:
+        buffer = self._buffer
+        base = _HEADER.size
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            start = base + mid * WORD_BYTES
+            probe = buffer[start:start + WORD_BYTES]
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def id_of(self, word: str) -> Optional[int]:
+        if len(word) != WORD_BYTES or not word.isascii():
+            return None
+        key = word.encode("ascii")
+        found = self._search(key, 0, self.answer_count)
+        if found < 0:
+            found = self._search(key, self.answer_count, self._size)
+        return found if found >= 0 else None
+
+    def word(self, word_id: int) -> str:
+        start = _HEADER.size + word_id * WORD_BYTES
+        return self._buffer[start:start + WORD_BYTES].decode("ascii")
+
+    @property
+    def words(self) -> Tuple[str, ...]:
+        """Every word in id order (decoded on first access)."""
+        if self._words is None:
+            text = self._buffer[_HEADER.size:].decode("ascii")
+            self._words = tuple(text[i:i + WORD_BYTES] for i in range(0, len(text), WORD_BYTES))
+        return self._words
+
+    @property
+    def answers(self) -> Tuple[str, ...]:
+        return self.words[:self.answer_count]
+
+    @property
+    def pool(self) -> Tuple[str, ...]:
+        return self.words[:self.pool_size]
+
+    @property
+    def pool_mask(self) -> int:
+        """Bitset of the pool ids (see bitsets.py)."""
+        return full_mask(self.pool_size)
+
+    @property
+    def letter_index(self) -> LetterIndex:
+        """Letter/position bitsets over every word id (built on first access)."""
+        if self._letter_index is None:
+            self._letter_index = LetterIndex(self.words)
+        return self._letter_index
+
+    def random_answer(self, rng: random.Random | None = None) -> str:
+        return self.word((rng or random).randrange(self.answer_count))
+
+    def attach_matrix(self, matrix) -> bool:
+        """Use ``matrix`` if its rows/columns follow this lexicon's id layout."""
+        pool_records = self._buffer[_HEADER.size:_HEADER.size + self.pool_size * WORD_BYTES]
+        expected = zlib.crc32(pool_records, self.checksum)
+        if (matrix.rows, matrix.cols, matrix.checksum) != (self._size, self.pool_size, expected):
+            return False
+        self.matrix = matrix
+        return True
+
+    def row(self, guess_id: int) -> Optional[bytes]:
+        """Pattern codes of a guess id against every pool id (needs a matrix)."""
+        if self.matrix is None:
+            return None
+        return self.matrix.row_at(guess_id)
+
+
+def _read_sources(lang: str) -> Tuple[bytes, Sequence[str]]:
+    try:
+        raw = DICTIONARY_FILES[lang].read_bytes()
+    except FileNotFoundError:
+        print(f"Arquivo {DICTIONARY_FILES[lang]} não encontrado")
+        raw = b""
+    return raw, get_word_list(lang)
+
+
+def _sources_checksum(raw: bytes, answers: Sequence[str]) -> int:
+    return zlib.crc32("\n".join(answers).encode("utf-8"), zlib.crc32(raw))
+
+
+def _compile_sources(lang: str) -> bytes:
+    raw, answers = _read_sources(lang)
+    dictionary = raw.decode("utf-8").splitlines() or list(answers)
+    return compile_lexicon(dictionary, answers, lang in FULL_POOL_LANGS, _sources_checksum(raw, answers))
+
+
+def _open_compiled(lang: str) -> Lexicon:
+    """mmap the compiled lexicon, recompiling it first if the sources changed."""
+    path = lexicon_path(DATA_DIR, lang)
+    raw, answers = _read_sources(lang)
+    try:
+        lexicon = Lexicon.open(lang, path)
+        if lexicon.source_checksum == _sources_checksum(raw, answers):
+            return lexicon
+    except (OSError, ValueError):
+        pass
+    payload = _compile_sources(lang)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+        return Lexicon.open(lang, path)
+    except OSError as exc:
+        print(f"Não foi possível gravar {path.name} ({exc}); usando léxico em memória")
+        return Lexicon(lang, payload)
+
+
+def _attach_compiled_matrix(lexicon: Lexicon) -> None:
+    """mmap the feedback matrix, rebuilding it first if missing or out of layout."""
+    path = matrix_path(DATA_DIR, lexicon.lang)
+    matrix = load_matrix(path)
+    if matrix is None or not lexicon.attach_matrix(matrix):
+        try:
+            build_matrix(lexicon.words, lexicon.pool, path)
+            matrix = load_matrix(path)
+        except OSError as exc:
+            print(f"Não foi possível gravar {path.name} ({exc})")
+            matrix = None
+        if matrix is None or not lexicon.attach_matrix(matrix):
+            print(f"Matriz de feedback {lexicon.lang} indisponível; pontuação calculada em Python")
+            return
+    install_lexicon(lexicon)
+
+
+def _load_lexicon(lang: str) -> Lexicon:
+    lexicon = _open_compiled(lang)
+    _attach_compiled_matrix(lexicon)
+    return lexicon
+
+
+def get_lexicon(lang: Optional[str]) -> Lexicon:
+    """Return the process-wide lexicon for ``lang`` (loaded on first use)."""
+    lang = normalize_lang(lang)
+    lexicon = _LEXICONS.get(lang)
+    if lexicon is None:
+        lexicon = _load_lexicon(lang)
+        _LEXICONS[lang] = lexicon
+    return lexicon
+
+
+__all__ = [
+    "Lexicon",
+    "LexiconError",
+    "DICTIONARY_FILES",
+    "FULL_POOL_LANGS",
+    "compile_lexicon",
+    "get_lexicon",
+    "lexicon_path",
+    "normalize_lang",
+]
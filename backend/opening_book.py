@@ -0,0 +1,177 @@
+"""Shared opening book for the bots.
+
+Early bot moves repeat across rooms: every expert bot opens with the same
+word, and the first feedback patterns recur constantly. The book memoizes,
+per ``(language, tier, history)``, the candidate bitset left after that
+guess/feedback history and the guess the tier recommends next. ``history``
+is a tuple of ``(guess_id, pattern_code)`` pairs and ``tier`` is the
+preset's solver (``"entropy"``) or ``"heuristic"`` for the randomized
+presets, which share candidates but never a recommended guess.
+
+Entries are filled lazily, kept in least-recently-used order and only for
+histories up to ``max_depth`` moves. The expert replies to every first
+feedback can be precomputed (``scripts/build_opening_book.py``) into
+``data/opening_book.json``, which is loaded on first use.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from lexicon import DATA_DIR, Lexicon, get_lexicon
+
+BOOK_FILE = DATA_DIR / "opening_book.json"
+BOOK_VERSION = 1
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_MAX_DEPTH = 2  # jogadas no histórico
+HEURISTIC_TIER = "heuristic"
+
+History = Tuple[Tuple[int, int], ...]
+
+
+class BookEntry:
+    """Memoized state after one history; either field may still be unknown."""
+
+    __slots__ = ("candidates", "guess_id")
+
+    def __init__(self, candidates: Optional[int] = None, guess_id: Optional[int] = None):
+        self.candidates = candidates
+        self.guess_id = guess_id
+
+
+class OpeningBook:
+    """Bounded LRU of :class:`BookEntry` keyed by ``(lang, tier, history)``."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_depth: int = DEFAULT_MAX_DEPTH):
+        self.max_entries = max(1, int(max_entries))
+        self.max_depth = max(0, int(max_depth))
+        self._entries: "OrderedDict[tuple, BookEntry]" = OrderedDict()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "evicted": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def covers(self, history: History) -> bool:
+        return len(history) <= self.max_depth
+
+    def _entry(self, key: tuple, create: bool) -> Optional[BookEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        elif create:
+            entry = self._entries[key] = BookEntry()
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evicted"] += 1
+        return entry
+
+    def _lookup(self, key: tuple, field: str) -> Optional[int]:
+        entry = self._entry(key, create=False) if self.covers(key[2]) else None
+        value = getattr(entry, field) if entry is not None else None
+        self._counters["hits" if value is not None else "misses"] += 1
+        return value
+
+    def _store(self, key: tuple, field: str, value: int) -> None:
+        if self.covers(key[2]):
+            setattr(self._entry(key, create=True), field, value)
+            self._counters["stores"] += 1
+
+    def candidates(self, lang: str, tier: str, history: History) -> Optional[int]:
+        return self._lookup((lang, tier, history), "candidates")
+
+    def store_candidates(self, lang: str, tier: str, history: History, candidates: int) -> None:
+        self._store((lang, tier, history), "candidates", candidates)
+
+    def guess(self, lang: str, tier: str, history: History) -> Optional[int]:
+        return self._lookup((lang, tier, history), "guess_id")
+
+    def store_guess(self, lang: str, tier: str, history: History, guess_id: int) -> None:
+        self._store((lang, tier, history), "guess_id", guess_id)
+
+    def guesses(self, lang: str, tier: str) -> Dict[History, int]:
+        return {
+            key[2]: entry.guess_id
+            for key, entry in self._entries.items()
+            if key[0] == lang and key[1] == tier and entry.guess_id is not None
+        }
+
+    def load(self, path: Path = BOOK_FILE) -> int:
+        """Add the recommended guesses persisted in ``path``; return how many."""
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return 0
+        if data.get("version") != BOOK_VERSION:
+            return 0
+        loaded = 0
+        for lang, tiers in (data.get("books") or {}).items():
+            lexicon = get_lexicon(lang)
+            for tier, rows in tiers.items():
+                for moves, guess in rows:
+                    history = _history_from_words(lexicon, moves)
+                    guess_id = lexicon.id_of(guess)
+                    if history is None or guess_id is None:
+                        continue
+                    self.store_guess(lexicon.lang, tier, history, guess_id)
+                    loaded += 1
+        return loaded
+
+    def metrics(self) -> dict:
+        return {"entries": len(self), "maxEntries": self.max_entries, "maxDepth": self.max_depth, **self._counters}
+
+
+def _history_from_words(lexicon: Lexicon, moves) -> Optional[History]:
+    history = []
+    for word, code in moves:
+        word_id = lexicon.id_of(word)
+        if word_id is None:
+            return None
+        history.append((word_id, int(code)))
+    return tuple(history)
+
+
+def format_book(books: Dict[str, Dict[str, Dict[History, int]]]) -> str:
+    """JSON for ``BOOK_FILE`` with one ``[moves, guess]`` row per line."""
+    blocks = []
+    for lang in sorted(books):
+        lexicon = get_lexicon(lang)
+        tiers = []
+        for tier in sorted(books[lang]):
+            rows = []
+            for history, guess_id in sorted(books[lang][tier].items()):
+                moves = [[lexicon.word(word_id), code] for word_id, code in history]
+                rows.append(f"        {json.dumps([moves, lexicon.word(guess_id)])}")
+            tiers.append(f'      "{tier}": [\n' + ",\n".join(rows) + "\n      ]")
+        blocks.append(f'    "{lang}": {{\n' + ",\n".join(tiers) + "\n    }")
+    return f'{{\n  "version": {BOOK_VERSION},\n  "books": {{\n' + ",\n".join(blocks) + "\n  }\n}\n"
+
+
+_BOOK: Optional[OpeningBook] = None
+
+
+def get_opening_book() -> OpeningBook:
+    """Process-wide book, sized from the environment and preloaded from disk."""
+    global _BOOK
+    if _BOOK is None:
+        book = OpeningBook(
+            int(os.environ.get("OPENING_BOOK_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            int(os.environ.get("OPENING_BOOK_MAX_DEPTH", DEFAULT_MAX_DEPTH)),
+        )
+        book.load(Path(os.environ.get("OPENING_BOOK_FILE") or BOOK_FILE))
+        _BOOK = book
+    return _BOOK
+
+
+__all__ = [
+    "BOOK_FILE",
+    "BookEntry",
+    "HEURISTIC_TIER",
+    "History",
+    "OpeningBook",
+    "format_book",
+    "get_opening_book",
+]
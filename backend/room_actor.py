@@ -0,0 +1,140 @@
+"""Serialized command execution per multiplayer room.
+
+Every room owns a :class:`RoomActor`: a FIFO mailbox drained by a single
+background task. Socket.IO handlers, bot timers and round transitions post
+commands (plain callables with their arguments) instead of mutating the room
+themselves, so the commands of one room never interleave even when one of
+them yields (DB writes, emits) while other rooms keep running. Handlers use
+:meth:`RoomActor.call` to wait for the reply; timers use :meth:`RoomActor.post`
+and move on. The drain task only exists while the mailbox has work.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import threading
+from collections import deque
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Reply:
+    """Result of a posted command, resolved by the actor."""
+
+    __slots__ = ("_event", "value", "error")
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+    def done(self) -> bool:
+        return self._event.is_set()
+
+    def resolve(self, value=None, error: Optional[BaseException] = None) -> None:
+        self.value = value
+        self.error = error
+        self._event.set()
+
+    def wait(self, timeout: Optional[float] = None):
+        if not self._event.wait(timeout):
+            raise TimeoutError("Comando da sala não respondeu a tempo")
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class RoomActor:
+    """Mailbox of one room, processed in order by one background task."""
+
+    __slots__ = ("key", "_spawn", "_context", "_queue", "_running", "_owner", "processed", "errors")
+
+    def __init__(self, key: str, spawn: Callable, context: Optional[Callable] = None):
+        self.key = key
+        self._spawn = spawn
+        self._context = context or contextlib.nullcontext
+        self._queue: deque = deque()
+        self._running = False
+        self._owner = None
+        self.processed = 0
+        self.errors = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def post(self, fn: Callable, *args) -> Reply:
+        """Queue ``fn(*args)``; the returned :class:`Reply` resolves when it ran."""
+        reply = Reply()
+        self._queue.append((fn, args, reply))
+        if not self._running:
+            self._running = True
+            self._spawn(self._drain)
+        return reply
+
+    def call(self, fn: Callable, *args, timeout: Optional[float] = None):
+        """Run ``fn(*args)`` on the actor and wait for its result."""
+        if self._owner == threading.get_ident():
+            # Já estamos dentro de um comando desta sala: executa direto
+            return fn(*args)
+        return self.post(fn, *args).wait(timeout)
+
+    def _drain(self) -> None:
+        self._owner = threading.get_ident()
+        try:
+            with self._context():
+                while self._queue:
+                    fn, args, reply = self._queue.popleft()
+                    try:
+                        value = fn(*args)
+                    except Exception as exc:
+                        self.errors += 1
+                        logger.exception("Room %s command %r failed", self.key, fn)
+                        reply.resolve(error=exc)
+                    else:
+                        reply.resolve(value)
+                    self.processed += 1
+        finally:
+            self._owner = None
+            self._running = False
+            if self._queue:
+                self._running = True
+                self._spawn(self._drain)
+
+
+class RoomActors:
+    """Actors by room code, created on first use and dropped with the room."""
+
+    def __init__(self, spawn: Callable, context: Optional[Callable] = None):
+        self._spawn = spawn
+        self._context = context
+        self._actors: Dict[str, RoomActor] = {}
+        self._retired = {"processed": 0, "errors": 0}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._actors
+
+    def get(self, key: str) -> RoomActor:
+        actor = self._actors.get(key)
+        if actor is None:
+            actor = self._actors[key] = RoomActor(key, self._spawn, self._context)
+        return actor
+
+    def discard(self, key: str) -> None:
+        actor = self._actors.pop(key, None)
+        if actor is not None:
+            self._retired["processed"] += actor.processed
+            self._retired["errors"] += actor.errors
+
+    def metrics(self) -> dict:
+        actors = self._actors.values()
+        return {
+            "actors": len(self._actors),
+            "queued": sum(len(actor) for actor in actors),
+            "processed": self._retired["processed"] + sum(actor.processed for actor in actors),
+            "errors": self._retired["errors"] + sum(actor.errors for actor in actors),
+        }
+
+
+__all__ = ["Reply", "RoomActor", "RoomActors"]
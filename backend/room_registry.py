@@ -0,0 +1,212 @@
+"""Room ownership and player routing across server processes.
+
+A room lives (with its actor, bots and timers) in the process that created
+it. The registry records which node owns each room code and which room each
+connected client is in, so a node that receives an event for a room it does
+not own can forward the command to the owner; the owner answers the client
+through the Socket.IO message queue (``SOCKETIO_MESSAGE_QUEUE``).
+
+- :class:`LocalRoomRegistry` keeps everything in process (single worker,
+  the default);
+- :class:`RedisRoomRegistry` uses any Redis-protocol client (``redis``,
+  or ``fakeredis.FakeRedis`` for local runs, see
+  ``scripts/smoke_room_registry.py``): claims are keys with a TTL that the
+  owner renews and deletes only while it still holds them (compare-and-set
+  Lua scripts), forwarded commands are JSON messages on a per-node pub/sub
+  channel.
+
+A shared registry needs the Socket.IO message queue as well, otherwise the
+owner's replies never reach clients connected to other nodes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+from typing import Callable, Iterable, List, Optional
+
+ROOM_CLAIM_TTL = 120  # segundos; o dono renova a cada varredura das salas
+PLAYER_INDEX_TTL = 24 * 3600
+KEY_PREFIX = "muskiguess"
+
+# Renova a posse só se ainda for deste nó; recria a chave se ela sumiu
+_RENEW_CLAIM = """
+local owner = redis.call('GET', KEYS[1])
+if owner == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+if not owner then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+    return 1
+end
+return 0
+"""
+_RELEASE_CLAIM = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def default_node_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class LocalRoomRegistry:
+    """Every room belongs to this process."""
+
+    shared = False
+
+    def __init__(self, node_id: Optional[str] = None):
+        self.node_id = node_id or default_node_id()
+        self.player_rooms: dict = {}
+        self._rooms: set = set()
+
+    def claim(self, code: str) -> bool:
+        if code in self._rooms:
+            return False
+        self._rooms.add(code)
+        return True
+
+    def release(self, code: str) -> None:
+        self._rooms.discard(code)
+
+    def owner(self, code: str) -> Optional[str]:
+        return self.node_id if code in self._rooms else None
+
+    def refresh(self, codes: Iterable[str]) -> List[str]:
+        return []
+
+    def forward(self, node_id: str, message: dict) -> None:
+        raise RuntimeError("Registro local não encaminha comandos")
+
+    def listen(self, handler: Callable[[dict], None]) -> None:
+        pass
+
+    def metrics(self) -> dict:
+        return {"backend": "memory", "node": self.node_id, "rooms": len(self._rooms), "players": len(self.player_rooms)}
+
+
+class RedisPlayerIndex:
+    """``sid -> room code`` mapping stored as expiring Redis keys."""
+
+    def __init__(self, client, prefix: str, ttl: int = PLAYER_INDEX_TTL):
+        self._client = client
+        self._prefix = prefix
+        self._ttl = ttl
+
+    def _key(self, sid: str) -> str:
+        return f"{self._prefix}:player:{sid}"
+
+    def get(self, sid, default=None):
+        if not sid:
+            return default
+        value = self._client.get(self._key(sid))
+        return _text(value) if value is not None else default
+
+    def __setitem__(self, sid: str, code: str) -> None:
+        self._client.set(self._key(sid), code, ex=self._ttl)
+
+    def pop(self, sid, default=None):
+        value = self.get(sid)
+        if value is None:
+            return default
+        self._client.delete(self._key(sid))
+        return value
+
+
+class RedisRoomRegistry:
+    """Room claims, player index and command routing on a Redis server."""
+
+    shared = True
+
+    def __init__(self, client, node_id: Optional[str] = None, *, prefix: str = KEY_PREFIX, ttl: int = ROOM_CLAIM_TTL):
+        self.node_id = node_id or default_node_id()
+        self._client = client
+        self._prefix = prefix
+        self._ttl = ttl
+        self.player_rooms = RedisPlayerIndex(client, prefix)
+        self._owned: set = set()
+        self._counters = {"forwarded": 0, "received": 0, "rejectedClaims": 0, "lostClaims": 0}
+        self._renew = client.register_script(_RENEW_CLAIM)
+        self._release = client.register_script(_RELEASE_CLAIM)
+
+    def _room_key(self, code: str) -> str:
+        return f"{self._prefix}:room:{code}"
+
+    def _channel(self, node_id: str) -> str:
+        return f"{self._prefix}:node:{node_id}"
+
+    def claim(self, code: str) -> bool:
+        if not self._client.set(self._room_key(code), self.node_id, nx=True, ex=self._ttl):
+            self._counters["rejectedClaims"] += 1
+            return False
+        self._owned.add(code)
+        return True
+
+    def release(self, code: str) -> None:
+        self._owned.discard(code)
+        self._release(keys=[self._room_key(code)], args=[self.node_id])
+
+    def owner(self, code: str) -> Optional[str]:
+        value = self._client.get(self._room_key(code))
+        return _text(value) if value is not None else None
+
+    def refresh(self, codes: Iterable[str]) -> List[str]:
+        """Renew the claims on ``codes``; return the ones another node took over."""
+        codes = list(codes)
+        if not codes:
+            return []
+        pipeline = self._client.pipeline()
+        for code in codes:
+            self._renew(keys=[self._room_key(code)], args=[self.node_id, self._ttl], client=pipeline)
+        lost = [code for code, renewed in zip(codes, pipeline.execute()) if not renewed]
+        for code in lost:
+            self._owned.discard(code)
+        self._counters["lostClaims"] += len(lost)
+        return lost
+
+    def forward(self, node_id: str, message: dict) -> None:
+        self._client.publish(self._channel(node_id), json.dumps(message))
+        self._counters["forwarded"] += 1
+
+    def listen(self, handler: Callable[[dict], None]) -> None:
+        """Block delivering the commands forwarded to this node to ``handler``."""
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self._channel(self.node_id))
+        for item in pubsub.listen():
+            if item.get("type") != "message":
+                continue
+            self._counters["received"] += 1
+            handler(json.loads(_text(item["data"])))
+
+    def metrics(self) -> dict:
+        return {"backend": "redis", "node": self.node_id, "rooms": len(self._owned), **self._counters}
+
+
+def _text(value) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def registry_from_url(url: Optional[str], node_id: Optional[str] = None):
+    """``memory://`` (or nothing) for a local registry, ``redis://...`` for a shared one."""
+    if not url or url.startswith("memory:"):
+        return LocalRoomRegistry(node_id)
+    try:
+        import redis
+    except ImportError as exc:
+        raise RuntimeError("ROOM_REGISTRY_URL requer o pacote redis (pip install redis)") from exc
+    return RedisRoomRegistry(redis.Redis.from_url(url), node_id)
+
+
+__all__ = [
+    "LocalRoomRegistry",
+    "PLAYER_INDEX_TTL",
+    "ROOM_CLAIM_TTL",
+    "RedisPlayerIndex",
+    "RedisRoomRegistry",
+    "default_node_id",
+    "registry_from_url",
+]
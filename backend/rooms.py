@@ -0,0 +1,200 @@
+"""State records of the multiplayer room engine.
+
+Rooms, players and bot metadata are ``__slots__`` classes with explicit
+fields instead of string-keyed dicts: every attribute the engine touches is
+declared here, lookups are plain attribute reads and each record is a
+fraction of the size of the equivalent dict. The reset methods group the
+field changes that the engine applies together (end of round, new match,
+room left empty).
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Optional
+
+from bots import DEFAULT_BOT_DIFFICULTY, new_knowledge, normalize_bot_difficulty, reset_knowledge
+
+
+class Player:
+    """A room member, human or bot."""
+
+    __slots__ = ("id", "name", "score", "attempts", "joined_at", "user_id", "is_bot")
+
+    def __init__(self, player_id: str, name: str, *, user_id=None, is_bot: bool = False, joined_at: float = None):
+        self.id = player_id
+        self.name = name
+        self.score = 0
+        self.attempts = 0
+        self.joined_at = time.time() if joined_at is None else joined_at
+        self.user_id = user_id
+        self.is_bot = is_bot
+
+    def reset_match(self) -> None:
+        self.score = 0
+        self.attempts = 0
+
+
+class BotMeta:
+    """Per-bot reasoning state and its pending scheduler timer."""
+
+    __slots__ = (
+        "sid",
+        "name",
+        "task",
+        "candidates",  # bitset de ids do léxico (ver bitsets.py)
+        "used",  # bitset dos ids já jogados na rodada
+        "lang",
+        "difficulty",
+        "round_grace_until",
+        "knowledge",
+        "min_confident_attempts",
+        "confidence_bias",
+        "mistake_chance",
+    )
+
+    def __init__(self, sid: str, name: str, lang: str, difficulty: Optional[str]):
+        self.sid = sid
+        self.name = name
+        self.task = None
+        self.candidates = 0
+        self.used = 0
+        self.lang = lang
+        self.difficulty = normalize_bot_difficulty(difficulty)
+        self.round_grace_until: Optional[float] = None
+        self.knowledge = new_knowledge()
+        self.min_confident_attempts = 0
+        self.confidence_bias = 0.0
+        self.mistake_chance = 0.0
+
+    def cancel_task(self) -> None:
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    def reset_round(self, lang: str, difficulty: Optional[str], pool_mask: int, grace_until: Optional[float]) -> None:
+        self.lang = lang
+        self.candidates = pool_mask
+        self.used = 0
+        self.difficulty = normalize_bot_difficulty(difficulty)
+        self.round_grace_until = grace_until
+        reset_knowledge(self.knowledge)
+
+
+class Room:
+    """One multiplayer room: settings, match progress, members and bots."""
+
+    __slots__ = (
+        "code",
+        "host_sid",
+        "host_player_id",
+        "status",
+        "lang",
+        "initial_rounds",
+        "rounds_target",
+        "round_index",
+        "rounds_completed",
+        "standard_rounds_completed",
+        "tiebreaker_active",
+        "current_round_tiebreaker",
+        "current_word",
+        "round_winner_sid",
+        "round_draw",
+        "round_complete",
+        "round_started_at",
+        "bot_round_grace_until",
+        "players",
+        "max_attempts",
+        "match_history",
+        "last_activity",
+        "empty_since",
+        "stats_recorded",
+        "bots",
+        "bot_counter",
+        "bot_difficulty",
+        "state_seq",  # versão do estado enviado (ver wire.room_delta)
+        "state_snapshot",
+        "state_synced",
+        "round_time_limit",  # segundos; 0 = sem limite
+        "round_ends_at",
+        "round_timer",  # TimerHandle do limite de tempo (ver scheduler.py)
+        "transition_timer",  # TimerHandle da próxima rodada
+    )
+
+    def __init__(self, code: str, lang: str, rounds: int, max_attempts: int):
+        self.code = code
+        self.host_sid: Optional[str] = None
+        self.host_player_id: Optional[str] = None
+        self.status = "lobby"
+        self.lang = lang
+        self.initial_rounds = rounds
+        self.rounds_target = rounds
+        self.players: Dict[str, Player] = {}
+        self.max_attempts = max_attempts
+        self.last_activity = time.time()
+        self.empty_since: Optional[float] = None
+        self.bots: Dict[str, BotMeta] = {}
+        self.bot_counter = 0
+        self.bot_difficulty = DEFAULT_BOT_DIFFICULTY
+        self.state_seq = 0
+        self.state_snapshot: Optional[dict] = None
+        self.state_synced: set = set()
+        self.round_time_limit = 0
+        self.round_ends_at: Optional[float] = None
+        self.round_timer = None
+        self.transition_timer = None
+        self.reset_match()
+
+    def set_host(self, sid: Optional[str], player: Optional[Player]) -> None:
+        self.host_sid = sid
+        self.host_player_id = player.id if player else None
+
+    def stop_round_timer(self) -> None:
+        if self.round_timer:
+            self.round_timer.cancel()
+            self.round_timer = None
+        self.round_ends_at = None
+
+    def cancel_timers(self) -> None:
+        """Drop the pending round deadline and round transition."""
+        self.stop_round_timer()
+        if self.transition_timer:
+            self.transition_timer.cancel()
+            self.transition_timer = None
+
+    def end_round(self) -> None:
+        """No round in progress (between matches or with nobody left)."""
+        self.cancel_timers()
+        self.current_word = None
+        self.round_winner_sid = None
+        self.round_draw = False
+        self.round_complete = True
+        self.round_started_at = None
+        self.tiebreaker_active = False
+        self.current_round_tiebreaker = False
+        self.bot_round_grace_until = None
+
+    def reset_match(self) -> None:
+        """Back to round zero with empty scores, keeping members and settings."""
+        self.end_round()
+        self.round_index = 0
+        self.rounds_completed = 0
+        self.standard_rounds_completed = 0
+        self.match_history: List[dict] = []
+        self.stats_recorded = False
+        for player in self.players.values():
+            player.reset_match()
+
+    def mark_empty(self) -> None:
+        """No human left: drop the host and fall back to an idle lobby."""
+        self.set_host(None, None)
+        self.empty_since = time.time()
+        self.status = "lobby"
+        self.end_round()
+        self.stats_recorded = False
+
+    def human_sids(self) -> List[str]:
+        return [sid for sid, player in self.players.items() if not player.is_bot]
+
+
+__all__ = ["BotMeta", "Player", "Room"]
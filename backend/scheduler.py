@@ -0,0 +1,142 @@
+"""Single-loop timer scheduler for background game events.
+
+Instead of one sleeping greenlet per bot (or per delayed room transition),
+callers schedule callbacks on a shared :class:`Scheduler`. One background
+loop keeps the pending timers in a heap, runs every due callback in batches
+and waits until the next deadline, or indefinitely while nothing is
+scheduled; a timer that becomes the earliest one wakes it up. Timers are cancelled through their
+:class:`TimerHandle` (lazily: cancelled entries are skipped when popped and
+the heap is compacted when they pile up).
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH = 256
+
+
+class TimerHandle:
+    """A scheduled callback; ``cancel()`` prevents it from running."""
+
+    __slots__ = ("deadline", "seq", "callback", "args", "cancelled", "_scheduler")
+
+    def __init__(self, deadline: float, seq: int, callback: Callable, args: tuple, scheduler):
+        self.deadline = deadline
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+        self._scheduler = scheduler
+
+    def __lt__(self, other: "TimerHandle") -> bool:
+        return (self.deadline, self.seq) < (other.deadline, other.seq)
+
+    def cancel(self) -> None:
+        if not self.cancelled:
+            self.cancelled = True
+            if self._scheduler is not None:
+                self._scheduler._cancelled += 1
+                self._scheduler = None
+
+
+class Scheduler:
+    """Timer heap driven by a single background loop."""
+
+    def __init__(
+        self,
+        spawn: Callable,
+        sleep: Callable[[float], None],
+        clock: Callable[[], float] = time.monotonic,
+        batch_size: int = DEFAULT_BATCH,
+        event: Callable = threading.Event,
+    ):
+        self._spawn = spawn
+        self._sleep = sleep
+        self._clock = clock
+        self.batch_size = batch_size
+        self._heap: List[TimerHandle] = []
+        self._seq = itertools.count()
+        self._cancelled = 0
+        self._started = False
+        self._wakeup = event()
+        self._counters = {"scheduled": 0, "fired": 0, "cancelled": 0, "errors": 0, "batches": 0}
+        self._max_lag = 0.0
+
+    def __len__(self) -> int:
+        return len(self._heap) - self._cancelled
+
+    def call_at(self, deadline: float, callback: Callable, *args) -> TimerHandle:
+        handle = TimerHandle(deadline, next(self._seq), callback, args, self)
+        heapq.heappush(self._heap, handle)
+        self._counters["scheduled"] += 1
+        if self._heap[0] is handle:
+            self._wakeup.set()  # novo prazo mais cedo: o loop recalcula a espera
+        if not self._started:
+            self.start()
+        return handle
+
+    def call_later(self, delay: float, callback: Callable, *args) -> TimerHandle:
+        return self.call_at(self._clock() + max(0.0, delay), callback, *args)
+
+    def start(self) -> None:
+        if not self._started:
+            self._started = True
+            self._spawn(self._run)
+
+    def run_due(self, now: Optional[float] = None) -> int:
+        """Run one batch of due callbacks; return how many ran."""
+        now = self._clock() if now is None else now
+        heap = self._heap
+        due = []
+        while heap and len(due) < self.batch_size and heap[0].deadline <= now:
+            handle = heapq.heappop(heap)
+            if handle.cancelled:
+                self._cancelled -= 1
+                self._counters["cancelled"] += 1
+                continue
+            handle._scheduler = None
+            due.append(handle)
+        for handle in due:
+            self._max_lag = max(self._max_lag, now - handle.deadline)
+            try:
+                handle.callback(*handle.args)
+            except Exception:  # noqa: BLE001 - um timer com erro não derruba o loop
+                self._counters["errors"] += 1
+                logger.exception("Scheduled callback %r failed", handle.callback)
+        if due:
+            self._counters["fired"] += len(due)
+            self._counters["batches"] += 1
+        if self._cancelled > len(heap) // 2 and self._cancelled > 64:
+            self._compact()
+        return len(due)
+
+    def _compact(self) -> None:
+        cancelled = sum(1 for handle in self._heap if handle.cancelled)
+        self._heap = [handle for handle in self._heap if not handle.cancelled]
+        heapq.heapify(self._heap)
+        self._counters["cancelled"] += cancelled
+        self._cancelled = 0
+
+    def _run(self) -> None:
+        while True:
+            ran = self.run_due()
+            if ran >= self.batch_size:
+                self._sleep(0)  # cede o hub entre lotes grandes
+                continue
+            self._wakeup.clear()
+            delay = max(0.0, self._heap[0].deadline - self._clock()) if self._heap else None
+            self._wakeup.wait(delay)
+
+    def metrics(self) -> dict:
+        return {"pending": len(self), "maxLagSeconds": round(self._max_lag, 4), **self._counters}
+
+
+__all__ = ["Scheduler", "TimerHandle"]
@@ -0,0 +1,156 @@
+"""Wordle feedback scoring shared by every game mode.
+
+Feedback for a guess is encoded as a single base-3 integer (0-242): the
+status of position ``i`` contributes ``status * 3 ** i`` with gray=0,
+yellow=1 and green=2. Lookups for a language whose lexicon has a feedback
+matrix resolve both words to lexicon ids and index the matrix; anything else
+(no matrix, words outside the lexicon) computes the pattern by hand.
+"""
+
+from __future__ import annotations
+
+from operator import itemgetter
+from typing import Dict, List, Optional, Sequence
+
+GRAY = 0
+YELLOW = 1
+GREEN = 2
+
+STATUS_NAMES = ("gray", "yellow", "green")
+STATUS_CODES = {name: value for value, name in enumerate(STATUS_NAMES)}
+
+WORD_LENGTH = 5
+PATTERN_COUNT = 3 ** WORD_LENGTH
+ALL_GREEN = PATTERN_COUNT - 1
+
+_POWERS = tuple(3 ** i for i in range(WORD_LENGTH))
+_STATUS_TABLE = tuple(
+    tuple(STATUS_NAMES[(code // power) % 3] for power in _POWERS)
+    for code in range(PATTERN_COUNT)
+)
+
+# Léxicos com matriz de feedback, por idioma (ver lexicon.py)
+_LEXICONS: Dict[str, object] = {}
+
+
+def compute_pattern(guess: str, answer: str) -> int:
+    """Score ``guess`` against ``answer`` without any precomputed data."""
+    statuses = [GRAY] * WORD_LENGTH
+    pending: Dict[str, int] = {}
+    # Primeiro: verdes; letras restantes da resposta ficam disponíveis
+    for i in range(WORD_LENGTH):
+        if guess[i] == answer[i]:
+            statuses[i] = GREEN
+        else:
+            letter = answer[i]
+            pending[letter] = pending.get(letter, 0) + 1
+    # Segundo: amarelos consomem as letras restantes da esquerda para a direita
+    for i in range(WORD_LENGTH):
+        if statuses[i] == GRAY:
+            letter = guess[i]
+            if pending.get(letter):
+                statuses[i] = YELLOW
+                pending[letter] -= 1
+    return (
+        statuses[0]
+        + statuses[1] * 3
+        + statuses[2] * 9
+        + statuses[3] * 27
+        + statuses[4] * 81
+    )
+
+
+def install_lexicon(lexicon) -> None:
+    """Register a lexicon with an attached matrix so lookups in its language use it."""
+    _LEXICONS[lexicon.lang] = lexicon
+
+
+def matrix_for(lang: str):
+    lexicon = _LEXICONS.get(lang)
+    return lexicon.matrix if lexicon is not None else None
+
+
+def feedback_code(guess: str, answer: str, lang: Optional[str] = None) -> int:
+    """Return the pattern code for ``guess`` against ``answer`` in ``lang``."""
+    lexicon = _LEXICONS.get(lang)
+    if lexicon is not None:
+        guess_id = lexicon.id_of(guess)
+        answer_id = lexicon.id_of(answer)
+        if guess_id is not None and answer_id is not None and answer_id < lexicon.pool_size:
+            return lexicon.matrix.at(guess_id, answer_id)
+    return compute_pattern(guess, answer)
+
+
+def score_batch(guess: str, answers: Sequence[str], lang: Optional[str] = None) -> bytes:
+    """Score one guess against many answers; ``result[i]`` is the code of ``answers[i]``.
+
+    When the ``lang`` matrix covers the guess and every answer this is a
+    single gather over the guess row, otherwise patterns are computed.
+    """
+    if not answers:
+        return b""
+    lexicon = _LEXICONS.get(lang)
+    if lexicon is not None:
+        guess_id = lexicon.id_of(guess)
+        answer_ids = [lexicon.id_of(answer) for answer in answers]
+        pool_size = lexicon.pool_size
+        if guess_id is not None and all(
+            answer_id is not None and answer_id < pool_size for answer_id in answer_ids
+        ):
+            return gather_codes(lexicon.matrix.row_at(guess_id), answer_ids)
+    return bytes([compute_pattern(guess, answer) for answer in answers])
+
+
+def gather_codes(row: bytes, ids: Sequence[int]) -> bytes:
+    """Pick ``row[i]`` for every id in ``ids`` in one C-level call."""
+    if not ids:
+        return b""
+    if len(ids) == 1:
+        return bytes((row[ids[0]],))
+    return bytes(itemgetter(*ids)(row))
+
+
+def pattern_statuses(code: int) -> Sequence[str]:
+    """Decode a pattern code into per-position status names."""
+    return _STATUS_TABLE[code]
+
+
+def pattern_from_statuses(statuses: Sequence[str]) -> Optional[int]:
+    """Encode status names back into a pattern code (None if malformed)."""
+    if len(statuses) != WORD_LENGTH:
+        return None
+    code = 0
+    for power, status in zip(_POWERS, statuses):
+        value = STATUS_CODES.get(status)
+        if value is None:
+            return None
+        code += value * power
+    return code
+
+
+def feedback_items(guess: str, code: int) -> List[Dict[str, str]]:
+    """Expand a pattern code into the ``{letter, status}`` list used by the UI."""
+    statuses = _STATUS_TABLE[code]
+    return [
+        {"letter": guess[i].upper(), "status": statuses[i]}
+        for i in range(WORD_LENGTH)
+    ]
+
+
+__all__ = [
+    "GRAY",
+    "YELLOW",
+    "GREEN",
+    "STATUS_NAMES",
+    "PATTERN_COUNT",
+    "ALL_GREEN",
+    "compute_pattern",
+    "install_lexicon",
+    "matrix_for",
+    "feedback_code",
+    "score_batch",
+    "gather_codes",
+    "pattern_statuses",
+    "pattern_from_statuses",
+    "feedback_items",
+]
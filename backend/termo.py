@@ -1,5 +1,13 @@
 from colorama import Fore, Style
 
+from scoring import ALL_GREEN, feedback_code, feedback_items, pattern_statuses
+
+_CLI_COLORS = {
+    "green": Fore.GREEN,
+    "yellow": Fore.YELLOW,
+    "gray": Fore.LIGHTBLACK_EX,
+}
+
 class Termo:
     def __init__(self, word):
         self.word = word
@@ -12,68 +20,28 @@ class Termo:
 
     def check_guess(self, guess):
         self.attempts += 1
-        feedback = []
-        word_chars = list(self.word)
-        guess_chars = list(guess)
-        word_used = [False] * 5
-        guess_used = [False] * 5
-
-        # Primeiro: verde (letra e posição correta)
-        for i in range(5):
-            if guess_chars[i] == word_chars[i]:
-                feedback.append(Fore.GREEN + guess_chars[i].upper() + Style.RESET_ALL)
-                word_used[i] = True
-                guess_used[i] = True
-            else:
-                feedback.append(None)
-
-        # Segundo: amarelo (letra correta, posição errada)
-        for i in range(5):
-            if feedback[i] is None:
-                found = False
-                for j in range(5):
-                    if not word_used[j] and guess_chars[i] == word_chars[j]:
-                        found = True
-                        word_used[j] = True
-                        break
-                if found:
-                    feedback[i] = Fore.YELLOW + guess_chars[i].upper() + Style.RESET_ALL
-                else:
-                    feedback[i] = Fore.LIGHTBLACK_EX + guess_chars[i].upper() + Style.RESET_ALL
+        code = feedback_code(guess, self.word)
+        if code == ALL_GREEN:
+            self.won = True
+        return "".join(
+            _CLI_COLORS[status] + letter.upper() + Style.RESET_ALL
+            for letter, status in zip(guess, pattern_statuses(code))
+        )
 
-        if guess == self.word:
+    def check_guess_code(self, guess):
+        """Registra a tentativa e retorna o código de padrão (0-242)."""
+        self.attempts += 1
+        code = feedback_code(guess, self.word)
+        if code == ALL_GREEN:
             self.won = True
-        return "".join(feedback)
+        return code
 
     def check_guess_statuses(self, guess):
         """Retorna uma lista de dicionários com letra (maiúscula) e status
         para cada posição do palpite: 'green' | 'yellow' | 'gray'.
         Não inclui códigos de cor e é adequada para UI web.
         """
-        self.attempts += 1
-        statuses = [None] * 5
-        letters = [c.upper() for c in guess]
-        word_chars = list(self.word)
-        guess_chars = list(guess)
-        word_used = [False] * 5
-        # Primeiro: verdes
-        for i in range(5):
-            if guess_chars[i] == word_chars[i]:
-                statuses[i] = 'green'
-                word_used[i] = True
-        # Segundo: amarelos e cinzas
-        for i in range(5):
-            if statuses[i] is None:
-                found = False
-                for j in range(5):
-                    if not word_used[j] and guess_chars[i] == word_chars[j]:
-                        found = True
-                        word_used[j] = True
-                        break
-                statuses[i] = 'yellow' if found else 'gray'
-        if guess == self.word:
-            self.won = True
-        return [{"letter": letters[i], "status": statuses[i]} for i in range(5)]
+        return feedback_items(guess, self.check_guess_code(guess))
 
     def is_game_over(self):
         return self.attempts >= self.max_attempts or self.won
@@ -1,3 +1,6 @@
+from scoring import feedback_code, pattern_statuses
+
+
 def format_letter(letter, status):
     from colorama import Fore
 
@@ -11,12 +14,6 @@ def format_letter(letter, status):
         return letter
 
 def display_feedback(guess, correct_word):
-    feedback = []
-    for i, letter in enumerate(guess):
-        if letter == correct_word[i]:
-            feedback.append(format_letter(letter, 'green'))
-        elif letter in correct_word:
-            feedback.append(format_letter(letter, 'yellow'))
-        else:
-            feedback.append(format_letter(letter, 'gray'))
+    statuses = pattern_statuses(feedback_code(guess, correct_word))
+    feedback = [format_letter(letter, status) for letter, status in zip(guess, statuses)]
     return ' '.join(feedback)
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""Compact wire format for guess feedback (protocol version 2).
+
+Clients opt in per Socket.IO connection (``auth={"protocol": 2}`` or
+``?protocol=2``) or per REST request (``"protocol": 2`` in the body or the
+``X-MuskiGuess-Protocol`` header). Compact payloads use short keys, send
+feedback as one pattern code per board (see scoring.py) and never repeat
+the guessed letters, which the client already knows.
+
+Protocol 3 adds versioned room state on top of the compact payloads: every
+room state carries a sequence number ``q`` and, once a client holds a full
+``room_update``, later changes arrive as ``room_delta`` events with only
+the changed fields (see :func:`room_delta`). A client that sees a delta
+whose base ``f`` is not its current ``q`` asks for a full state with the
+``request_room_state`` event.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Sequence
+
+PROTOCOL_LEGACY = 1
+PROTOCOL_COMPACT = 2
+PROTOCOL_DELTA = 3
+SUPPORTED_PROTOCOLS = (PROTOCOL_LEGACY, PROTOCOL_COMPACT, PROTOCOL_DELTA)
+PROTOCOL_HEADER = "X-MuskiGuess-Protocol"
+
+
+def negotiate_protocol(value) -> int:
+    """Return the protocol to use for a client-provided version value."""
+    try:
+        requested = int(value)
+    except (TypeError, ValueError):
+        return PROTOCOL_LEGACY
+    if requested in SUPPORTED_PROTOCOLS:
+        return requested
+    return SUPPORTED_PROTOCOLS[-1] if requested > SUPPORTED_PROTOCOLS[-1] else PROTOCOL_LEGACY
+
+
+def compact_room(code: str) -> str:
+    """Socket.IO room holding the compact-protocol members of ``code``."""
+    return f"{code}#v{PROTOCOL_COMPACT}"
+
+
+def delta_room(code: str) -> str:
+    """Socket.IO room holding the delta-protocol members of ``code``."""
+    return f"{code}#v{PROTOCOL_DELTA}"
+
+
+def compact_api_guess(
+    game_id: str,
+    codes: Sequence[int],
+    attempts: int,
+    max_attempts: int,
+    won: bool,
+    game_over: bool,
+) -> Dict:
+    return {
+        "g": game_id,
+        "p": list(codes),
+        "a": attempts,
+        "m": max_attempts,
+        "w": won,
+        "o": game_over,
+    }
+
+
+def compact_guess_result(player_id: str, code: int, attempt: int, max_attempts: int, round_number: int) -> Dict:
+    return {"i": player_id, "p": code, "a": attempt, "m": max_attempts, "r": round_number}
+
+
+def compact_peer_guess(player_id: str, code: int, attempt: int, round_number: int) -> Dict:
+    return {"i": player_id, "p": code, "a": attempt, "r": round_number}
+
+
+def compact_word_checks(flags: Sequence[bool]) -> Dict:
+    """Validation results as a hex bitmap (bit ``i`` set = word ``i`` exists)."""
+    mask = 0
+    for index, exists in enumerate(flags):
+        if exists:
+            mask |= 1 << index
+    return {"v": format(mask, "x"), "n": len(flags)}
+
+
+def compact_room_payload(payload: Dict) -> Dict:
+    """Shorten a full ``room_update`` payload; players become positional rows."""
+    players: List[list] = [
+        [item["playerId"], item["name"], item["score"], int(item["isHost"]), int(item["isBot"])]
+        for item in payload["players"]
+    ]
+    return {
+        "c": payload["code"],
+        "s": payload["status"],
+        "r": payload["roundNumber"],
+        "t": payload["roundsTarget"],
+        "d": payload["roundsCompleted"],
+        "k": int(payload["tiebreakerActive"]),
+        "pl": players,
+        "m": payload["maxAttempts"],
+        "cs": int(payload["canStart"]),
+        "ca": int(payload["canPlayAgain"]),
+        "h": payload["hostId"],
+        "l": payload["language"],
+        "b": payload["botDifficulty"],
+        "tl": payload.get("roundTimeLimit", 0),
+        "te": payload.get("roundEndsAt"),
+    }
+
+
+def room_delta(previous: Dict, current: Dict) -> Dict:
+    """Fields of the compact room state ``current`` that differ from ``previous``.
+
+    Players are diffed by id: new or changed rows go in ``pu`` and the ids
+    of players who left in ``px``. Clients keep the rows sorted themselves
+    (score descending, then name).
+    """
+    delta = {key: value for key, value in current.items() if key != "pl" and previous.get(key) != value}
+    before = {row[0]: row for row in previous.get("pl", ())}
+    after = {row[0]: row for row in current["pl"]}
+    upserts = [row for player_id, row in after.items() if before.get(player_id) != row]
+    removed = [player_id for player_id in before if player_id not in after]
+    if upserts:
+        delta["pu"] = upserts
+    if removed:
+        delta["px"] = removed
+    return delta
+
+
+__all__ = [
+    "PROTOCOL_LEGACY",
+    "PROTOCOL_COMPACT",
+    "PROTOCOL_DELTA",
+    "SUPPORTED_PROTOCOLS",
+    "PROTOCOL_HEADER",
+    "negotiate_protocol",
+    "compact_room",
+    "delta_room",
+    "compact_api_guess",
+    "compact_guess_result",
+    "compact_peer_guess",
+    "compact_word_checks",
+    "compact_room_payload",
+    "room_delta",
+]
@@ -0,0 +1,88 @@
+"""Letter/position bitset index over a lexicon.
+
+For every position and letter the index keeps the set of word ids with that
+letter there, and for every letter the ids containing it at least ``k``
+times. Constraint questions ("A at position 2, R somewhere but not at 4, no
+E") become a handful of AND/ANDNOT operations on bitsets (see bitsets.py)
+instead of scanning the word list.
+"""
+
+from __future__ import annotations
+
+import string
+from typing import Iterable, List, Mapping, Optional, Sequence
+
+from bitsets import from_ids, full_mask
+
+WORD_LENGTH = 5
+LETTERS = string.ascii_lowercase
+_LETTER_INDEX = {letter: i for i, letter in enumerate(LETTERS)}
+
+
+class LetterIndex:
+    """Immutable position and letter-count bitsets over word ids."""
+
+    __slots__ = ("size", "all_mask", "_at", "_at_least")
+
+    def __init__(self, words: Sequence[str]):
+        at: List[List[List[int]]] = [[[] for _ in LETTERS] for _ in range(WORD_LENGTH)]
+        at_least: List[List[List[int]]] = [[[] for _ in range(WORD_LENGTH)] for _ in LETTERS]
+        for word_id, word in enumerate(words):
+            counts = {}
+            for position, letter in enumerate(word):
+                letter_index = _LETTER_INDEX[letter]
+                at[position][letter_index].append(word_id)
+                counts[letter_index] = counts.get(letter_index, 0) + 1
+            for letter_index, count in counts.items():
+                for k in range(count):
+                    at_least[letter_index][k].append(word_id)
+        self.size = len(words)
+        self.all_mask = full_mask(self.size)
+        self._at = tuple(tuple(from_ids(ids) for ids in row) for row in at)
+        self._at_least = tuple(tuple(from_ids(ids) for ids in row) for row in at_least)
+
+    def with_letter_at(self, letter: str, position: int) -> int:
+        return self._at[position][_LETTER_INDEX[letter]]
+
+    def with_at_least(self, letter: str, count: int) -> int:
+        """Ids containing ``letter`` at least ``count`` times."""
+        if count <= 0:
+            return self.all_mask
+        if count > WORD_LENGTH:
+            return 0
+        return self._at_least[_LETTER_INDEX[letter]][count - 1]
+
+    def containing(self, letter: str) -> int:
+        return self._at_least[_LETTER_INDEX[letter]][0]
+
+    def query(
+        self,
+        *,
+        fixed: Optional[Mapping[int, str]] = None,
+        forbidden: Optional[Mapping[str, Iterable[int]]] = None,
+        min_counts: Optional[Mapping[str, int]] = None,
+        max_counts: Optional[Mapping[str, int]] = None,
+        base: Optional[int] = None,
+    ) -> int:
+        """Ids satisfying every constraint, optionally restricted to ``base``.
+
+        ``fixed`` maps positions to letters, ``forbidden`` maps letters to the
+        positions they cannot take, and ``min_counts``/``max_counts`` bound how
+        many times a letter appears (``max_counts[x] == 0`` bans ``x``).
+        """
+        mask = self.all_mask if base is None else base
+        for position, letter in (fixed or {}).items():
+            mask &= self._at[position][_LETTER_INDEX[letter]]
+        for letter, positions in (forbidden or {}).items():
+            row = _LETTER_INDEX[letter]
+            for position in positions:
+                mask &= ~self._at[position][row]
+        for letter, count in (min_counts or {}).items():
+            mask &= self.with_at_least(letter, count)
+        for letter, count in (max_counts or {}).items():
+            if count < WORD_LENGTH:
+                mask &= ~self.with_at_least(letter, count + 1)
+        return mask
+
+
+__all__ = ["LetterIndex", "LETTERS"]
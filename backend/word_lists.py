@@ -0,0 +1,118 @@
+"""Client word lists generated from the lexicon.
+
+The browser validates guesses locally (static/wordService.js) from a packed
+list per language: a small JSON object whose ``words`` field is every word
+concatenated in lexicon id order (5 letters each). Files are named after a
+hash of their content, so they can be cached forever, and ship with
+precompressed ``.gz`` (and ``.br`` when the brotli module is installed)
+variants. ``words-manifest.json`` maps each language to its current file.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:  # opcional: só gera .br se o módulo estiver instalado
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+MANIFEST_NAME = "words-manifest.json"
+LIST_PREFIX = "words_"
+FORMAT_VERSION = 1
+HASH_LENGTH = 12
+
+# Variantes pré-comprimidas, na ordem de preferência ao servir
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def pack_word_list(lexicon) -> bytes:
+    payload = {
+        "version": FORMAT_VERSION,
+        "lang": lexicon.lang,
+        "count": len(lexicon),
+        "words": "".join(lexicon.words),
+    }
+    return json.dumps(payload, separators=(",", ":")).encode("ascii")
+
+
+def hashed_name(lang: str, payload: bytes) -> str:
+    digest = hashlib.sha256(payload).hexdigest()[:HASH_LENGTH]
+    return f"{LIST_PREFIX}{lang}.{digest}.json"
+
+
+def is_hashed_name(filename: str) -> bool:
+    """True for content-addressed list files (safe to cache forever)."""
+    parts = filename.split(".")
+    return (
+        filename.startswith(LIST_PREFIX)
+        and len(parts) == 3
+        and parts[2] == "json"
+        and len(parts[1]) == HASH_LENGTH
+    )
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _remove_stale(out_dir: Path, lang: str, keep: str) -> List[str]:
+    removed = []
+    for path in out_dir.glob(f"{LIST_PREFIX}{lang}.*.json*"):
+        base = path.name
+        for _encoding, suffix in ENCODINGS:
+            base = base.removesuffix(suffix)
+        if is_hashed_name(base) and base != keep:
+            path.unlink()
+            removed.append(path.name)
+    return removed
+
+
+def write_word_list(lexicon, out_dir: Path) -> Dict:
+    """Write the hashed list and its compressed variants; return its manifest entry."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    payload = pack_word_list(lexicon)
+    name = hashed_name(lexicon.lang, payload)
+    _write_atomic(out_dir / name, payload)
+    _write_atomic(out_dir / f"{name}.gz", gzip.compress(payload, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write_atomic(out_dir / f"{name}.br", brotli.compress(payload, quality=11))
+    _remove_stale(out_dir, lexicon.lang, name)
+    return {"file": name, "count": len(lexicon), "bytes": len(payload)}
+
+
+def write_manifest(out_dir: Path, entries: Dict[str, Dict]) -> Path:
+    path = Path(out_dir) / MANIFEST_NAME
+    manifest = load_manifest(out_dir) or {}
+    lists = dict(manifest.get("lists") or {})
+    lists.update(entries)
+    body = {"version": FORMAT_VERSION, "lists": dict(sorted(lists.items()))}
+    _write_atomic(path, (json.dumps(body, indent=2) + "\n").encode("ascii"))
+    return path
+
+
+def load_manifest(out_dir: Path) -> Optional[Dict]:
+    try:
+        return json.loads((Path(out_dir) / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+__all__ = [
+    "MANIFEST_NAME",
+    "ENCODINGS",
+    "pack_word_list",
+    "hashed_name",
+    "is_hashed_name",
+    "write_word_list",
+    "write_manifest",
+    "load_manifest",
+]
@@ -0,0 +1,52 @@
+"""
+Build the precomputed guess x answer feedback matrices.
+
+Usage:
+    python scripts/build_feedback_matrix.py          # pt e en
+    python scripts/build_feedback_matrix.py pt
+
+Rows follow the lexicon word ids (every valid guess) and columns the
+lexicon answer pool (the full dictionary for pt, the answer list for en),
+so ids index the matrix directly. The output goes to
+backend/data/feedback_<lang>.bin and is loaded with mmap by the server,
+which also builds a missing or outdated matrix on first start; this script
+does it ahead of time (e.g. in a deploy step).
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from feedback_matrix import build_matrix, matrix_path  # noqa: E402
+from lexicon import DATA_DIR, DICTIONARY_FILES, Lexicon  # noqa: E402
+
+
+def build_language(lang: str) -> None:
+    lexicon = Lexicon.from_sources(lang)
+    started = time.perf_counter()
+    path = build_matrix(lexicon.words, lexicon.pool, matrix_path(DATA_DIR, lang))
+    elapsed = time.perf_counter() - started
+    size_mb = path.stat().st_size / (1024 * 1024)
+    print(
+        f"[OK] {lang}: {len(lexicon.words)} x {lexicon.pool_size} -> {path.name} "
+        f"({size_mb:.1f} MB em {elapsed:.1f}s)"
+    )
+
+
+def main(argv: list[str]) -> int:
+    langs = argv or list(DICTIONARY_FILES)
+    for lang in langs:
+        if lang not in DICTIONARY_FILES:
+            print(f"[ERRO] Idioma desconhecido: {lang}", file=sys.stderr)
+            return 1
+        build_language(lang)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,63 @@
+"""
+Precompute the best opening guesses of each language for the expert bots.
+
+Usage:
+    python scripts/build_openers.py          # pt e en
+    python scripts/build_openers.py pt
+
+Ranks every valid guess by the expected information of its feedback over
+the whole answer pool (see backend/bot_solver.py) and writes the top words
+to backend/data/openers.json. Needs the feedback matrices
+(scripts/build_feedback_matrix.py).
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from bot_solver import OPENERS_FILE, rank_openers  # noqa: E402
+from lexicon import DICTIONARY_FILES, get_lexicon  # noqa: E402
+
+
+def _format_openers(openers: dict) -> str:
+    """JSON with one ``[word, bits]`` pair per line (readable diffs)."""
+    blocks = []
+    for lang in sorted(openers):
+        rows = ",\n".join(f"    {json.dumps(entry)}" for entry in openers[lang])
+        blocks.append(f'  "{lang}": [\n{rows}\n  ]')
+    return "{\n" + ",\n".join(blocks) + "\n}\n"
+
+
+def main(argv: list[str]) -> int:
+    langs = argv or list(DICTIONARY_FILES)
+    try:
+        openers = json.loads(OPENERS_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        openers = {}
+    for lang in langs:
+        if lang not in DICTIONARY_FILES:
+            print(f"[ERRO] Idioma desconhecido: {lang}", file=sys.stderr)
+            return 1
+        started = time.perf_counter()
+        try:
+            ranked = rank_openers(get_lexicon(lang))
+        except RuntimeError as exc:
+            print(f"[ERRO] {exc} Rode scripts/build_feedback_matrix.py {lang}", file=sys.stderr)
+            return 1
+        openers[lang] = ranked
+        best, bits = ranked[0]
+        elapsed = time.perf_counter() - started
+        print(f"[OK] {lang}: melhor abertura {best!r} ({bits:.3f} bits) em {elapsed:.1f}s")
+    OPENERS_FILE.write_text(_format_openers(openers), encoding="utf-8")
+    print(f"[OK] {OPENERS_FILE.name} atualizado")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,57 @@
+"""
+Precompute the expert bots' opening book.
+
+Usage:
+    python scripts/build_opening_book.py          # pt e en, profundidade 2
+    python scripts/build_opening_book.py pt --depth 2 --budget 0.5
+
+For every language, stores the expert opener and its reply to each possible
+first feedback (see backend/opening_book.py) in backend/data/opening_book.json.
+The server loads the file on first use, so those moves become cache hits.
+Needs the feedback matrices and openers (scripts/build_feedback_matrix.py,
+scripts/build_openers.py).
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from bots import DEFAULT_BOOK_DEPTH, PRECOMPUTE_BUDGET, precompute_book, preset_for, tier_for  # noqa: E402
+from lexicon import DICTIONARY_FILES  # noqa: E402
+from opening_book import BOOK_FILE, OpeningBook, format_book  # noqa: E402
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Pré-calcula o livro de aberturas dos bots.")
+    parser.add_argument("langs", nargs="*", default=list(DICTIONARY_FILES))
+    parser.add_argument("--depth", type=int, default=DEFAULT_BOOK_DEPTH)
+    parser.add_argument("--budget", type=float, default=PRECOMPUTE_BUDGET, help="segundos por jogada")
+    args = parser.parse_args(argv)
+
+    tier = tier_for(preset_for("expert"))
+    book = OpeningBook(max_entries=1_000_000, max_depth=max(0, args.depth - 1))
+    book.load(BOOK_FILE)
+    books = {lang: {tier: book.guesses(lang, tier)} for lang in DICTIONARY_FILES}
+    for lang in args.langs:
+        if lang not in DICTIONARY_FILES:
+            print(f"[ERRO] Idioma desconhecido: {lang}", file=sys.stderr)
+            return 1
+        started = time.perf_counter()
+        fresh = OpeningBook(max_entries=1_000_000, max_depth=max(0, args.depth - 1))
+        stored = precompute_book(fresh, lang, "expert", args.depth, args.budget)
+        books[lang] = {tier: fresh.guesses(lang, tier)}
+        elapsed = time.perf_counter() - started
+        print(f"[OK] {lang}: {stored} jogadas em {elapsed:.1f}s")
+    BOOK_FILE.write_text(format_book(books), encoding="utf-8")
+    print(f"[OK] {BOOK_FILE.name} atualizado")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
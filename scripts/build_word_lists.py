@@ -0,0 +1,46 @@
+"""
+Generate the client word lists used by static/wordService.js.
+
+Usage:
+    python scripts/build_word_lists.py          # pt e en
+    python scripts/build_word_lists.py pt
+
+Writes static/data/words_<lang>.<hash>.json (+ .gz, + .br if the brotli
+module is installed) from the backend word files and updates
+static/data/words-manifest.json. Run it again whenever the word lists change.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+BACKEND_DIR = ROOT_DIR / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from lexicon import DICTIONARY_FILES, Lexicon  # noqa: E402
+from word_lists import brotli, write_manifest, write_word_list  # noqa: E402
+
+OUT_DIR = ROOT_DIR / "static" / "data"
+
+
+def main(argv: list[str]) -> int:
+    langs = argv or list(DICTIONARY_FILES)
+    entries = {}
+    for lang in langs:
+        if lang not in DICTIONARY_FILES:
+            print(f"[ERRO] Idioma desconhecido: {lang}", file=sys.stderr)
+            return 1
+        entry = write_word_list(Lexicon.from_sources(lang), OUT_DIR)
+        entries[lang] = entry
+        print(f"[OK] {lang}: {entry['count']} palavras -> {entry['file']} ({entry['bytes']} bytes)")
+    manifest = write_manifest(OUT_DIR, entries)
+    if brotli is None:
+        print("[AVISO] módulo brotli ausente; apenas variantes .gz foram geradas")
+    print(f"[OK] manifesto: {manifest.relative_to(ROOT_DIR)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,210 @@
+"""
+Headless calibration of the multiplayer bots.
+
+Usage:
+    python scripts/simulate_bots.py                        # todos os níveis, pt e en
+    python scripts/simulate_bots.py --lang pt --difficulty hard expert
+    python scripts/simulate_bots.py --limit 500 --seed 7 --workers 4 --json out.json
+    python scripts/simulate_bots.py --difficulty expert --cold-book   # pior caso, sem livro
+
+Plays one bot game against every answer of each language (backend/words.py),
+exactly as a room would drive it (bots.decide + bots.refine_candidates) but
+with seeded RNG, no delays and no sockets, split across processes. Reports
+per preset and language the win rate, the attempt distribution and the
+per-turn latency percentiles: a turn is the decision plus the
+refine_candidates call that applies its feedback, which is what a room runs
+on the hub. Workers are capped at the CPU count so the latencies measure the
+bots, not the OS scheduler; ``--cold-book`` disables the opening book.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from bot_solver import solver_for  # noqa: E402
+from bots import (  # noqa: E402
+    BOT_DIFFICULTY_PRESETS,
+    DecisionRequest,
+    decide,
+    new_knowledge,
+    preset_for,
+    refine_candidates,
+    roll_persona,
+    tier_for,
+)
+from lexicon import DICTIONARY_FILES, get_lexicon  # noqa: E402
+from scoring import ALL_GREEN, feedback_code, feedback_items  # noqa: E402
+
+MAX_ATTEMPTS = 6  # igual a ROUND_ATTEMPTS em app.py
+CHUNK_SIZE = 64
+
+
+def play_game(lang: str, difficulty: str, answer_id: int, seed: int):
+    """One bot game; returns ``(attempts or None, [decision seconds, ...])``."""
+    lexicon = get_lexicon(lang)
+    rng = random.Random(seed * 1_000_003 + answer_id)
+    preset = preset_for(difficulty)
+    min_confident, bias, mistake = roll_persona(preset, rng)
+    answer = lexicon.word(answer_id)
+    knowledge = new_knowledge()
+    candidates = lexicon.pool_mask
+    used = 0
+    latencies = []
+    for attempts in range(MAX_ATTEMPTS):
+        started = time.perf_counter()
+        if not candidates:
+            candidates = knowledge["constraints"].mask(lexicon)
+        decision = decide(DecisionRequest(
+            lang=lang,
+            difficulty=difficulty,
+            attempts=attempts,
+            candidates=candidates,
+            used=used,
+            constraints=knowledge["constraints"],
+            min_confident_attempts=min_confident,
+            confidence_bias=bias,
+            mistake_chance=mistake,
+            seed=rng.getrandbits(64),
+            history=knowledge["history"],
+        ))
+        if decision is None:
+            latencies.append(time.perf_counter() - started)
+            return None, latencies
+        used = decision.used
+        guess = lexicon.word(decision.guess_id)
+        code = feedback_code(guess, answer, lexicon.lang)
+        feedback = feedback_items(guess, code)
+        candidates = refine_candidates(lexicon, candidates, knowledge, guess, feedback, tier_for(preset))
+        latencies.append(time.perf_counter() - started)
+        if code == ALL_GREEN:
+            return attempts + 1, latencies
+    return None, latencies
+
+
+def _play_chunk(job):
+    lang, difficulty, answer_ids, seed = job
+    return [play_game(lang, difficulty, answer_id, seed) for answer_id in answer_ids]
+
+
+def _warm_up(langs) -> None:
+    for lang in langs:
+        get_lexicon(lang).letter_index
+        solver_for(lang)
+
+
+def _percentile(ordered: list, fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(results) -> dict:
+    outcomes = Counter()
+    latencies = []
+    for attempts, game_latencies in results:
+        outcomes[attempts] += 1
+        latencies.extend(game_latencies)
+    games = sum(outcomes.values())
+    wins = games - outcomes[None]
+    latencies.sort()
+    return {
+        "games": games,
+        "winRate": round(wins / games, 4) if games else 0.0,
+        "meanAttempts": round(
+            sum(attempts * count for attempts, count in outcomes.items() if attempts) / wins, 3
+        ) if wins else None,
+        "distribution": {str(n): outcomes[n] for n in range(1, MAX_ATTEMPTS + 1)} | {"X": outcomes[None]},
+        "decisions": len(latencies),
+        "latencyMs": {
+            label: round(_percentile(latencies, fraction) * 1000, 3)
+            for label, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))
+        },
+    }
+
+
+def _format_row(lang: str, difficulty: str, summary: dict) -> str:
+    distribution = " ".join(f"{key}:{value}" for key, value in summary["distribution"].items())
+    latency = summary["latencyMs"]
+    mean = summary["meanAttempts"]
+    return (
+        f"{lang:<3} {difficulty:<7} {summary['games']:>6} "
+        f"{summary['winRate'] * 100:>6.1f}% {mean if mean is not None else '-':>6} "
+        f"p50 {latency['p50']:.2f}ms p99 {latency['p99']:.2f}ms max {latency['max']:.2f}ms  "
+        f"[{distribution}]"
+    )
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Simula bots contra todas as respostas.")
+    parser.add_argument("--lang", nargs="+", default=list(DICTIONARY_FILES))
+    parser.add_argument("--difficulty", nargs="+", default=list(BOT_DIFFICULTY_PRESETS))
+    parser.add_argument("--limit", type=int, default=0, help="máximo de respostas por idioma (0 = todas)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--json", type=Path, help="grava o resumo em JSON")
+    parser.add_argument("--cold-book", action="store_true", help="sem livro de aberturas (latência de pior caso)")
+    args = parser.parse_args(argv)
+    if args.cold_book:
+        # Lido por get_opening_book() no primeiro uso, também nos processos filhos
+        os.environ["OPENING_BOOK_MAX_DEPTH"] = "0"
+        os.environ["OPENING_BOOK_FILE"] = os.devnull
+
+    for lang in args.lang:
+        if lang not in DICTIONARY_FILES:
+            print(f"[ERRO] Idioma desconhecido: {lang}", file=sys.stderr)
+            return 1
+    for difficulty in args.difficulty:
+        if difficulty not in BOT_DIFFICULTY_PRESETS:
+            print(f"[ERRO] Nível desconhecido: {difficulty}", file=sys.stderr)
+            return 1
+
+    jobs = []
+    for lang in args.lang:
+        answers = range(get_lexicon(lang).answer_count)
+        if args.limit:
+            answers = sorted(random.Random(args.seed).sample(answers, min(args.limit, len(answers))))
+        for difficulty in args.difficulty:
+            for start in range(0, len(answers), CHUNK_SIZE):
+                jobs.append((lang, difficulty, list(answers[start:start + CHUNK_SIZE]), args.seed))
+
+    started = time.perf_counter()
+    results: dict = {}
+    # Mais processos que CPUs mediria a preempção do sistema, não os bots
+    workers = max(1, min(args.workers, os.cpu_count() or 1))
+    if workers == 1:
+        _warm_up(args.lang)
+        chunks = map(_play_chunk, jobs)
+    else:
+        pool = multiprocessing.Pool(workers, initializer=_warm_up, initargs=(args.lang,))
+        chunks = pool.imap(_play_chunk, jobs)
+    for job, chunk in zip(jobs, chunks):
+        results.setdefault((job[0], job[1]), []).extend(chunk)
+    if workers > 1:
+        pool.close()
+        pool.join()
+
+    summary = {}
+    for (lang, difficulty), games in results.items():
+        summary.setdefault(lang, {})[difficulty] = summarize(games)
+        print(_format_row(lang, difficulty, summary[lang][difficulty]))
+    print(f"[OK] {len(jobs)} lotes em {time.perf_counter() - started:.1f}s com {workers} processo(s)")
+    if args.json:
+        args.json.write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
+        print(f"[OK] Resumo gravado em {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
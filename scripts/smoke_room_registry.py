@@ -0,0 +1,113 @@
+"""
+Smoke test of the shared room registry (backend/room_registry.py).
+
+Usage:
+    python scripts/smoke_room_registry.py                        # fakeredis em processo
+    python scripts/smoke_room_registry.py --url redis://localhost:6379/0
+
+Runs two registry nodes against the same Redis-protocol server and checks
+room claims, claim renewal and loss (another node taking over an expired
+code), compare-and-delete release, the shared player index and command
+forwarding over pub/sub. Without --url it uses fakeredis (``pip install
+"fakeredis[lua]"``); with a real server the keys live under a throwaway
+prefix and are removed at the end.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import queue
+import sys
+import threading
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from room_registry import RedisRoomRegistry  # noqa: E402
+
+
+class SmokeFailure(RuntimeError):
+    pass
+
+
+def check(condition: bool, message: str) -> None:
+    if not condition:
+        raise SmokeFailure(message)
+    print(f"[ok] {message}")
+
+
+def connect(url: str | None):
+    if url:
+        import redis
+
+        return redis.Redis.from_url(url)
+    try:
+        import fakeredis
+    except ImportError as exc:
+        raise SmokeFailure('Instale fakeredis com Lua: pip install "fakeredis[lua]"') from exc
+    return fakeredis.FakeRedis()
+
+
+def run(client) -> None:
+    prefix = f"muskiguess-smoke-{os.getpid()}"
+    node_a = RedisRoomRegistry(client, "node-a", prefix=prefix, ttl=60)
+    node_b = RedisRoomRegistry(client, "node-b", prefix=prefix, ttl=60)
+    try:
+        check(node_a.claim("ABCDE"), "node-a reivindica ABCDE")
+        check(not node_b.claim("ABCDE"), "node-b não consegue o mesmo código")
+        check(node_b.owner("ABCDE") == "node-a", "node-b enxerga node-a como dono")
+        check(node_a.refresh(["ABCDE"]) == [], "node-a renova a própria posse")
+
+        client.delete(f"{prefix}:room:ABCDE")
+        check(node_a.refresh(["ABCDE"]) == [] and node_a.owner("ABCDE") == "node-a", "posse expirada é recriada pelo dono")
+
+        client.delete(f"{prefix}:room:ABCDE")  # como se o TTL tivesse vencido
+        check(node_b.claim("ABCDE"), "node-b assume o código expirado")
+        ttl_before = client.ttl(f"{prefix}:room:ABCDE")
+        client.expire(f"{prefix}:room:ABCDE", 5)
+        check(node_a.refresh(["ABCDE"]) == ["ABCDE"], "node-a descobre que perdeu a posse")
+        check(client.ttl(f"{prefix}:room:ABCDE") <= 5 < ttl_before, "a renovação de node-a não estende a chave de node-b")
+        node_a.release("ABCDE")
+        check(node_a.owner("ABCDE") == "node-b", "release de node-a não apaga a posse de node-b")
+        node_b.release("ABCDE")
+        check(node_a.owner("ABCDE") is None, "release do dono apaga a posse")
+
+        node_a.player_rooms["sid-1"] = "ABCDE"
+        check(node_b.player_rooms.get("sid-1") == "ABCDE", "índice de jogadores é compartilhado")
+        check(node_b.player_rooms.pop("sid-1") == "ABCDE" and node_a.player_rooms.get("sid-1") is None, "pop remove a entrada")
+
+        received: "queue.Queue[dict]" = queue.Queue()
+        threading.Thread(target=node_b.listen, args=(received.put,), daemon=True).start()
+        message = {"command": "_join_room", "code": "ABCDE", "args": ["ABCDE", "sid-2"], "protocol": 1}
+        for _ in range(50):  # espera a inscrição do listener
+            node_a.forward("node-b", message)
+            try:
+                got = received.get(timeout=0.1)
+                break
+            except queue.Empty:
+                continue
+        else:
+            raise SmokeFailure("node-b não recebeu o comando encaminhado")
+        check(got == message, "comando encaminhado chega ao dono")
+    finally:
+        for key in client.scan_iter(f"{prefix}:*"):
+            client.delete(key)
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Smoke test do registro de salas compartilhado.")
+    parser.add_argument("--url", help="servidor Redis (padrão: fakeredis em processo)")
+    args = parser.parse_args(argv)
+    try:
+        run(connect(args.url))
+    except SmokeFailure as exc:
+        print(f"[ERRO] {exc}", file=sys.stderr)
+        return 1
+    print("[OK] Registro de salas funcionando")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
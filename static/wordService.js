@@ -8,9 +8,13 @@
     pt: 'data/words_pt.json',
     en: 'data/words_en.json',
   };
+  // Gerado por scripts/build_word_lists.py (arquivos com hash, cache longo)
+  const MANIFEST_URL = 'data/words-manifest.json';
+  const WORD_LENGTH = 5;
 
   const cache = {};
   const pending = {};
+  let manifestPromise = null;
 
   function sanitizeLang(lang) {
     const normalized = (lang || 'pt').toLowerCase();
@@ -26,24 +30,52 @@
       .replace(/[^a-z]/g, '');
   }
 
+  function loadManifest() {
+    if (!manifestPromise) {
+      manifestPromise = fetch(MANIFEST_URL, { cache: 'no-cache' })
+        .then((response) => (response.ok ? response.json() : null))
+        .catch(() => null);
+    }
+    return manifestPromise;
+  }
+
+  async function resolveWordListUrl(lang) {
+    const manifest = await loadManifest();
+    const entry = manifest && manifest.lists && manifest.lists[lang];
+    if (entry && entry.file) {
+      return { url: `data/${entry.file}`, cacheMode: 'force-cache' };
+    }
+    return { url: WORD_FILES[lang], cacheMode: 'no-cache' };
+  }
+
+  function unpackWords(raw) {
+    // Formato compacto: { words: "aaraoabaco..." } com 5 letras por palavra
+    if (raw && typeof raw.words === 'string') {
+      const list = [];
+      for (let i = 0; i + WORD_LENGTH <= raw.words.length; i += WORD_LENGTH) {
+        list.push(raw.words.slice(i, i + WORD_LENGTH));
+      }
+      return list;
+    }
+    return Array.isArray(raw) ? raw : [];
+  }
+
   async function loadDictionary(lang) {
     const safeLang = sanitizeLang(lang);
     if (cache[safeLang]) return cache[safeLang];
     if (!pending[safeLang]) {
-      const url = WORD_FILES[safeLang];
-      pending[safeLang] = fetch(url, { cache: 'force-cache' })
+      pending[safeLang] = resolveWordListUrl(safeLang)
+        .then(({ url, cacheMode }) => fetch(url, { cache: cacheMode }))
         .then((response) => {
           if (!response.ok) {
             throw new Error(`Falha ao carregar lista de palavras (${safeLang})`);
           }
           return response.json();
         })
-        .then((rawList) => {
-          const normalized = Array.isArray(rawList)
-            ? rawList
-                .map((word) => normalizeWord(word))
-                .filter((word) => word.length === 5)
-            : [];
+        .then((raw) => {
+          const normalized = unpackWords(raw)
+            .map((word) => normalizeWord(word))
+            .filter((word) => word.length === WORD_LENGTH);
           const deduped = Array.from(new Set(normalized));
           const payload = {
             lang: safeLang,